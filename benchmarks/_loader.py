@@ -0,0 +1,17 @@
+"""Import the integration's Home Assistant-free modules without Home Assistant.
+
+``custom_components/tovala/__init__.py`` imports Home Assistant, so the
+package is registered here as a bare namespace (``tovala``) and only the
+plain-Python modules (api, policy, schedule, meal_cache, const) are loaded.
+"""
+from __future__ import annotations
+from pathlib import Path
+import sys
+import types
+
+INTEGRATION_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "tovala"
+
+if "tovala" not in sys.modules:
+    package = types.ModuleType("tovala")
+    package.__path__ = [str(INTEGRATION_DIR)]
+    sys.modules["tovala"] = package
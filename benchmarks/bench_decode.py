@@ -0,0 +1,119 @@
+"""Per-request CPU and allocation cost of the response decode path.
+
+Compares the old pipeline (``await r.text()`` for a debug snippet, then
+``await r.json()``, i.e. two UTF-8 decodes and a stdlib parse) with the
+current one (``await r.read()`` once, parsed with the JSON backend the
+client picked), both in-process on canned bodies and over HTTP against
+the fake API.
+
+    python -m benchmarks.bench_decode --requests 2000
+"""
+from __future__ import annotations
+from typing import Callable, Dict, List, Tuple
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from aiohttp import ClientSession
+
+from . import _loader  # noqa: F401  registers the "tovala" package
+from .fake_tovala import FakeTovala
+from tovala import api
+
+
+def _bodies(history_entries: int) -> Dict[str, bytes]:
+    history = [
+        {
+            "barcode": f"133A254|{index}|5E34BF80",
+            "meal_id": index,
+            "start_time": "2025-11-07T01:23:48.000003163Z",
+            "end_time": "2025-11-07T01:43:48.000003163Z",
+            "status": "complete",
+        }
+        for index in range(history_entries)
+    ]
+    return {
+        "status (idle)": json.dumps({"state": "idle", "remote_control_enabled": True}).encode(),
+        "status (cooking)": json.dumps({
+            "state": "cooking",
+            "barcode": "133A254|463|5E34BF80",
+            "estimated_start_time": "2025-11-07T01:23:48.000003163Z",
+            "estimated_end_time": "2025-11-07T01:43:48.000003163Z",
+            "remote_control_enabled": True,
+        }).encode(),
+        f"history ({history_entries})": json.dumps(history).encode(),
+    }
+
+
+def _old(body: bytes):
+    txt = body.decode("utf-8")  # r.text()
+    txt[:200]  # debug snippet built unconditionally
+    return json.loads(body.decode("utf-8"))  # r.json() decodes again
+
+
+def _new(body: bytes):
+    return api._json_loads(body)
+
+
+def _measure(func: Callable[[bytes], object], body: bytes, rounds: int) -> Tuple[float, float]:
+    """Return (microseconds per call, peak KiB allocated by one call)."""
+    started = time.process_time()
+    for _ in range(rounds):
+        func(body)
+    cpu = (time.process_time() - started) / rounds * 1e6
+
+    tracemalloc.start()
+    func(body)
+    peak = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return cpu, peak
+
+
+async def _over_http(requests: int) -> List[Tuple[str, float]]:
+    server = FakeTovala(ovens=1, history_size=200, etags=False)
+    url = await server.start()
+    path = f"{url}/v0/users/1/ovens/{server.oven_ids[0]}/cook/history"
+    results = []
+    try:
+        async with ClientSession() as session:
+            for name in ("old", "new"):
+                started = time.process_time()
+                for _ in range(requests):
+                    async with session.get(path) as r:
+                        if name == "old":
+                            txt = await r.text()
+                            txt[:200]
+                            await r.json()
+                        else:
+                            body = await r.read()
+                            api._json_loads(body)
+                results.append((name, (time.process_time() - started) / requests * 1e6))
+    finally:
+        await server.stop()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20000, help="in-process iterations per body")
+    parser.add_argument("--requests", type=int, default=1000, help="HTTP requests per pipeline")
+    parser.add_argument("--history", type=int, default=200, help="entries in the history body")
+    args = parser.parse_args()
+
+    print(f"JSON backend: {api._json_loads.__module__}.{api._json_loads.__name__}")
+    print(f"{'payload':<18} {'bytes':>7} {'old µs':>8} {'new µs':>8} {'old KiB':>8} {'new KiB':>8}")
+    for name, body in _bodies(args.history).items():
+        rounds = max(1, args.rounds // max(1, len(body) // 200))
+        old_cpu, old_peak = _measure(_old, body, rounds)
+        new_cpu, new_peak = _measure(_new, body, rounds)
+        print(f"{name:<18} {len(body):>7} {old_cpu:>8.2f} {new_cpu:>8.2f} {old_peak:>8.1f} {new_peak:>8.1f}")
+
+    print(f"\nOver HTTP ({args.requests} x history with 200 entries, client CPU per request):")
+    for name, cpu in asyncio.run(_over_http(args.requests)):
+        print(f"  {name}: {cpu:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
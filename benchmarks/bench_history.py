@@ -0,0 +1,131 @@
+"""Latency and peak client memory of reading a long cooking history.
+
+The fake API runs in a child process, so only the client's allocations are
+traced, with --history past cooks (one every 6 hours). It is run once
+honouring ?limit=&offset= and once ignoring them. For each, the old path
+(read the whole body, decode it, then build and slice entries) is compared
+with the streaming iterator on three reads: the latest N entries, the
+entries of the last D days, and the whole history.
+
+    python -m benchmarks.bench_history --history 12000 --latest 50 --days 30
+"""
+from __future__ import annotations
+from contextlib import aclosing
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+
+from aiohttp import ClientSession
+
+from . import _loader  # noqa: F401  registers the "tovala" package
+from tovala.api import TovalaClient
+from tovala.models import HistoryEntry
+from tovala.policy import TokenBucket
+
+_ROOT = Path(__file__).resolve().parent.parent
+
+
+async def _start_server(history: int, paging: bool) -> Tuple[asyncio.subprocess.Process, str]:
+    command = [sys.executable, "-m", "benchmarks.fake_tovala", "--port", "0", "--history", str(history)]
+    if not paging:
+        command.append("--no-paging")
+    process = await asyncio.create_subprocess_exec(
+        *command, cwd=_ROOT, stdout=asyncio.subprocess.PIPE
+    )
+    line = (await process.stdout.readline()).decode()
+    # "Fake Tovala API on http://127.0.0.1:PORT (user N)"
+    return process, line.split(" on ", 1)[1].split()[0]
+
+
+async def _old(client: TovalaClient, path: str, limit: Optional[int], since: Optional[datetime]) -> List[HistoryEntry]:
+    """cooking_history before streaming: whole body in, decoded, then sliced."""
+    data = await client._get_json(path, endpoint="history")
+    entries = []
+    for item in data[:limit]:
+        entry = HistoryEntry.from_api(item)
+        if entry is None:
+            continue
+        if since is not None and entry.start_time is not None and entry.start_time <= since:
+            break
+        entries.append(entry)
+    return entries
+
+
+async def _new(client: TovalaClient, oven_id: str, limit: Optional[int], since: Optional[datetime]) -> List[HistoryEntry]:
+    async with aclosing(client.iter_cooking_history(oven_id, limit=limit, since=since)) as entries:
+        return [entry async for entry in entries]
+
+
+async def _measure(read: Callable[[], Awaitable[List[Any]]], rounds: int) -> Tuple[float, float, int]:
+    """Return (median ms per read, peak KiB during one read, entries read)."""
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        entries = await read()
+        timings.append((time.perf_counter() - started) * 1000)
+    del entries
+
+    tracemalloc.start()
+    entries = await read()
+    peak = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return statistics.median(timings), peak, len(entries)
+
+
+async def _run(args: argparse.Namespace, paging: bool) -> None:
+    process, url = await _start_server(args.history, paging)
+    try:
+        async with ClientSession() as session:
+            client = TovalaClient(
+                session, email="bench@example.invalid", password="x",
+                api_bases=[url], rate_limiter=TokenBucket(1e9, 1e9),
+            )
+            await client.login()
+            oven_id = "oven-0"
+            path = f"/v0/users/{client.user_id}/ovens/{oven_id}/cook/history"
+            since = datetime.now(timezone.utc) - timedelta(days=args.days)
+            reads = (
+                (f"latest {args.latest}", args.latest, None),
+                (f"last {args.days:g} days", None, since),
+                ("whole history", None, None),
+            )
+            print(f"\nServer {'honours' if paging else 'ignores'} limit/offset:")
+            print(f"{'read':<16} {'entries':>8} {'old ms':>8} {'new ms':>8} {'old KiB':>9} {'new KiB':>9}")
+            for name, limit, cutoff in reads:
+                old_ms, old_kib, count = await _measure(
+                    lambda: _old(client, path, limit, cutoff), args.rounds
+                )
+                new_ms, new_kib, new_count = await _measure(
+                    lambda: _new(client, oven_id, limit, cutoff), args.rounds
+                )
+                assert new_count == count, (name, count, new_count)
+                print(f"{name:<16} {count:>8} {old_ms:>8.1f} {new_ms:>8.1f} {old_kib:>9.0f} {new_kib:>9.0f}")
+            client.close()
+    finally:
+        process.terminate()
+        await process.wait()
+
+
+async def _main(args: argparse.Namespace) -> None:
+    for paging in (True, False):
+        await _run(args, paging)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, default=12000, help="past cooks served")
+    parser.add_argument("--latest", type=int, default=50, help="entries for the latest-N read")
+    parser.add_argument("--days", type=float, default=30, help="window for the since read")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Parse cost and memory of the slotted status/meal/history models.
+
+Compares the old per-update dict flow (copy the client's status dict,
+parse ``estimated_end_time`` and split the barcode in the coordinator,
+then inject ``remaining`` and ``meal``; history timestamps re-parsed by
+every consumer) with the models the client now builds once per changed
+payload.
+
+Reported per payload: CPU per update, bytes allocated per update and
+bytes retained per object kept in coordinator data.
+
+    python -m benchmarks.bench_models --rounds 20000 --history 200
+"""
+from __future__ import annotations
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import argparse
+import json
+import time
+import tracemalloc
+
+from . import _loader  # noqa: F401  registers the "tovala" package
+from tovala.models import HistoryEntry, Meal, OvenStatus
+
+_NOW = datetime(2025, 11, 7, 1, 30, tzinfo=timezone.utc)
+
+_STATUS = {
+    "state": "cooking",
+    "barcode": "133A254|463|5E34BF80",
+    "estimated_start_time": "2025-11-07T01:23:48.000003Z",
+    "estimated_end_time": "2025-11-07T01:43:48.000003Z",
+    "remote_control_enabled": True,
+}
+_MEAL = {
+    "id": 463,
+    "title": "Chicken Tikka Masala",
+    "subtitle": "with basmati rice",
+    "images": [{"url": "//cdn.tovala.com/meals/463/hero.jpg"}],
+    "ingredients": "chicken, rice, cream",
+}
+
+
+def _history(entries: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "barcode": f"133A254|{index}|5E34BF80",
+            "meal_id": index,
+            "start_time": "2025-11-07T01:23:48.000003Z",
+            "end_time": "2025-11-07T01:43:48.000003Z",
+            "status": "complete",
+        }
+        for index in range(entries)
+    ]
+
+
+def _old_time(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _old_status(raw: Dict[str, Any], meal: Dict[str, Any]) -> Dict[str, Any]:
+    """TovalaCoordinator._async_update_oven before the models."""
+    data = dict(raw)
+    end_time = None
+    if data.get("state") == "cooking" and "estimated_end_time" in data:
+        end_time = _old_time(data["estimated_end_time"])
+    data["remaining"] = max(0, int((end_time - _NOW).total_seconds())) if end_time else 0
+    barcode = data.get("barcode")
+    parts = barcode.split("|") if barcode else []
+    meal_id = parts[1] if len(parts) >= 2 and parts[1].isdigit() else None
+    if meal_id:
+        data["meal"] = meal
+    return data
+
+
+def _new_status(raw: Dict[str, Any], meal: Meal) -> Tuple[OvenStatus, Meal, int]:
+    status = OvenStatus.from_api(raw)
+    remaining = max(0, int((status.end_time - _NOW).total_seconds())) if status.end_time else 0
+    return status, meal, remaining
+
+
+def _old_history(raw: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """History buffer merge plus statistics: each re-parsed start/end times."""
+    for entry in raw:
+        _old_time(entry.get("start_time") or "")  # coordinator merge
+        _old_time(entry.get("start_time") or "")  # statistics high-water check
+        _old_time(entry.get("end_time") or "")
+    return raw
+
+
+def _new_history(raw: List[Dict[str, Any]]) -> List[HistoryEntry]:
+    entries = [HistoryEntry.from_api(entry) for entry in raw]
+    for entry in entries:
+        entry.start_time, entry.end_time  # already parsed
+    return entries
+
+
+def _measure(func: Callable[[], Any], rounds: int) -> Tuple[float, float]:
+    """Return (microseconds per call, KiB allocated by one call)."""
+    started = time.process_time()
+    for _ in range(rounds):
+        func()
+    cpu = (time.process_time() - started) / rounds * 1e6
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    func()
+    peak = (tracemalloc.get_traced_memory()[1] - before) / 1024
+    tracemalloc.stop()
+    return cpu, peak
+
+
+def _retained(factory: Callable[[], Any], count: int = 1000) -> float:
+    """Bytes kept alive per object built by factory."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [factory() for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return size / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20000)
+    parser.add_argument("--history", type=int, default=200, help="entries per history fetch")
+    args = parser.parse_args()
+
+    # The old flow received the decoded JSON; the new one parses it from the same
+    raw_status = json.loads(json.dumps(_STATUS))
+    raw_meal = json.loads(json.dumps(_MEAL))
+    meal = Meal.from_api(raw_meal)
+    raw_history = _history(args.history)
+    history_rounds = max(1, args.rounds // max(1, args.history))
+
+    rows = [
+        ("status update", args.rounds,
+         lambda: _old_status(raw_status, raw_meal), lambda: _new_status(raw_status, meal)),
+        (f"history ({args.history})", history_rounds,
+         lambda: _old_history(raw_history), lambda: _new_history(raw_history)),
+    ]
+    print(f"{'payload':<16} {'old µs':>8} {'new µs':>8} {'old KiB':>8} {'new KiB':>8}")
+    for name, rounds, old, new in rows:
+        old_cpu, old_kib = _measure(old, rounds)
+        new_cpu, new_kib = _measure(new, rounds)
+        print(f"{name:<16} {old_cpu:>8.2f} {new_cpu:>8.2f} {old_kib:>8.2f} {new_kib:>8.2f}")
+
+    print("\nRetained bytes per object:")
+    for name, old, new in (
+        ("status", lambda: _old_status(raw_status, raw_meal), lambda: OvenStatus.from_api(raw_status)),
+        ("meal", lambda: json.loads(json.dumps(_MEAL)), lambda: Meal.from_api(raw_meal)),
+        ("history entry", lambda: json.loads(json.dumps(raw_history[0])),
+         lambda: HistoryEntry.from_api(raw_history[0])),
+    ):
+        print(f"  {name:<14} old {_retained(old):>6.0f}  new {_retained(new):>6.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Simulate days of status polling against the fake API.
+
+Drives TovalaClient with the same PollSchedule and per-oven bookkeeping as
+TovalaCoordinator on a virtual clock, and reports API requests per hour,
+p50/p99 refresh latency and Python heap usage for 1..N ovens.
+
+    python -m benchmarks.bench_polling --days 2 --ovens 1 4 8
+    python -m benchmarks.bench_polling --fixed 10   # pre-adaptive baseline
+"""
+from __future__ import annotations
+from typing import Dict, List, Optional
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from aiohttp import ClientSession
+
+from . import _loader  # noqa: F401  registers the "tovala" package
+from .fake_tovala import FakeTovala, VirtualClock
+from tovala.api import TovalaClient
+from tovala.const import MAX_PARALLEL_REQUESTS
+from tovala.meal_cache import MealCache
+from tovala.policy import TokenBucket
+from tovala.schedule import PollSchedule
+
+
+class _Oven:
+    def __init__(self, oven_id: str):
+        self.oven_id = oven_id
+        self.last_state: Optional[str] = None
+        self.interval = 0.0
+        self.next_poll = 0.0
+        self.last_meal_id: Optional[str] = None
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def simulate(
+    ovens: int,
+    days: float,
+    cooks_per_day: int,
+    latency: float,
+    schedule: PollSchedule,
+    seed: int = 0,
+) -> Dict[str, float]:
+    clock = VirtualClock()
+    server = FakeTovala(ovens=ovens, clock=clock, latency=latency, seed=seed)
+    server.schedule_daily_cooks(days, cooks_per_day)
+    url = await server.start()
+
+    tracemalloc.start()
+    latencies: List[float] = []
+    peak_heap = 0
+    try:
+        async with ClientSession() as session:
+            # The simulation runs much faster than real time, so lift the
+            # client-side rate limit that assumes wall-clock pacing.
+            client = TovalaClient(
+                session, email="bench@example.invalid", password="x",
+                api_bases=[url], rate_limiter=TokenBucket(1e9, 1e9),
+            )
+            meal_cache = MealCache()
+            await client.login()
+            state = {oven_id: _Oven(oven_id) for oven_id in server.oven_ids}
+            semaphore = asyncio.Semaphore(MAX_PARALLEL_REQUESTS)
+            end = clock.now() + days * 86400
+
+            async def poll(oven: _Oven) -> None:
+                async with semaphore:
+                    data = await client.oven_status(oven.oven_id)
+                now = clock.now()
+                status = data.state
+                remaining = 0
+                if data.end_time is not None:
+                    remaining = max(0, int(data.end_time.timestamp() - now))
+                meal_id = data.meal_id
+                if meal_id and meal_id != oven.last_meal_id:
+                    meal = meal_cache.get(meal_id)
+                    if meal is None:
+                        meal = await client.meal_details(meal_id)
+                        if meal:
+                            meal_cache.put(meal_id, meal)
+                    oven.last_meal_id = meal_id
+                oven.interval = schedule.next_interval(status, remaining, oven.last_state, oven.interval)
+                oven.next_poll = now + oven.interval
+                oven.last_state = status
+
+            while clock.now() < end:
+                now = clock.now()
+                due = [oven for oven in state.values() if oven.next_poll <= now]
+                started = time.perf_counter()
+                await asyncio.gather(*(poll(oven) for oven in due))
+                latencies.append(time.perf_counter() - started)
+                peak_heap = max(peak_heap, tracemalloc.get_traced_memory()[1])
+                clock.advance_to(min(oven.next_poll for oven in state.values()))
+            client.close()
+    finally:
+        current_heap = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        await server.stop()
+
+    hours = days * 24
+    total = sum(count for name, count in server.requests.items() if name not in ("304", "429", "503"))
+    return {
+        "ovens": ovens,
+        "requests_per_hour": total / hours,
+        "status_per_hour": server.requests["status"] / hours,
+        "meal_requests": server.requests["meal"],
+        "logins": server.requests["login"],
+        "refreshes": len(latencies),
+        "not_modified": server.requests["304"],
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "heap_peak_kib": peak_heap / 1024,
+        "heap_end_kib": current_heap / 1024,
+    }
+
+
+def _print_table(rows: List[Dict[str, float]]) -> None:
+    columns = [
+        ("ovens", "{:>5}"), ("requests_per_hour", "{:>9.1f}"), ("status_per_hour", "{:>10.1f}"),
+        ("meal_requests", "{:>5}"), ("logins", "{:>6}"), ("refreshes", "{:>9}"),
+        ("p50_ms", "{:>7.2f}"), ("p99_ms", "{:>7.2f}"),
+        ("heap_peak_kib", "{:>9.0f}"), ("heap_end_kib", "{:>8.0f}"),
+    ]
+    headers = ["ovens", "req/h", "status/h", "meals", "logins", "refreshes", "p50 ms", "p99 ms", "peak KiB", "end KiB"]
+    widths = [len(fmt.format(rows[0][key])) if rows else len(name) for (key, fmt), name in zip(columns, headers)]
+    print("  ".join(name.rjust(max(width, len(name))) for name, width in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(
+            fmt.format(row[key]).rjust(max(width, len(name)))
+            for (key, fmt), name, width in zip(columns, headers, widths)
+        ))
+
+
+async def _main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=1.0)
+    parser.add_argument("--ovens", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--cooks-per-day", type=int, default=2)
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    parser.add_argument("--fixed", type=int, default=None,
+                        help="poll every N seconds regardless of state (baseline)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.fixed:
+        schedule = PollSchedule(args.fixed, args.fixed, args.fixed)
+        # A fixed cadence has no finish wake-up
+        schedule.next_interval = lambda *_: float(args.fixed)  # type: ignore[method-assign]
+    else:
+        schedule = PollSchedule()
+
+    rows = []
+    for ovens in args.ovens:
+        rows.append(await simulate(
+            ovens, args.days, args.cooks_per_day, args.latency_ms / 1000, schedule, args.seed
+        ))
+    print(f"{args.days:g} simulated day(s), {args.cooks_per_day} cook(s)/day/oven, "
+          f"{'fixed %ss' % args.fixed if args.fixed else 'adaptive'} polling")
+    _print_table(rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
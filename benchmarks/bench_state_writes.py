@@ -0,0 +1,213 @@
+"""State-machine and recorder churn of the Tovala entities over a simulated day.
+
+Replays one oven's day (idle polling, cooks with a 1 s local countdown,
+half-hourly history refreshes) through two entity models:
+
+* old: every coordinator update rebuilds the attribute dicts and writes
+  state for every entity, meal data included in the recorded attributes;
+* new: attributes are cached per status/meal object and history version,
+  state is written only when (available, value, attributes) changed, and
+  large static meal/history attributes are left out of the recorder.
+
+Reported per model: state writes, attribute dict builds, recorder
+attribute bytes serialized and distinct attribute rows the recorder keeps.
+
+    python -m benchmarks.bench_state_writes --days 1 --cooks-per-day 3
+"""
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, FrozenSet, List, Optional, Set
+import argparse
+import json
+
+from . import _loader  # noqa: F401  registers the "tovala" package
+from tovala.attributes import (
+    LAST_COOK_UNRECORDED_ATTRIBUTES,
+    REMAINING_UNRECORDED_ATTRIBUTES,
+    history_attributes,
+    last_cook_value,
+    meal_attributes,
+    status_attributes,
+)
+from tovala.const import DEFAULT_HISTORY_INTERVAL, HISTORY_BUFFER_SIZE
+from tovala.models import HistoryEntry, Meal, OvenStatus
+from tovala.schedule import PollSchedule
+
+COOK_SECONDS = 20 * 60
+_T0 = datetime(2025, 11, 7, tzinfo=timezone.utc)
+
+_MEAL = Meal.from_api({
+    "id": 463,
+    "title": "Chicken Tikka Masala",
+    "subtitle": "with basmati rice, cilantro chutney and toasted naan",
+    "images": [{"url": "//cdn.tovala.com/meals/463/hero-1200x800.jpg"}],
+    "ingredients": ", ".join(f"ingredient {index} (contains: milk, wheat)" for index in range(40)),
+})
+
+
+class _Recorder:
+    """Counts what Home Assistant's recorder would serialize and keep."""
+
+    def __init__(self) -> None:
+        self.writes = 0
+        self.attribute_bytes = 0
+        self._rows: Set[str] = set()
+
+    def write(self, attrs: Dict[str, Any], unrecorded: FrozenSet[str]) -> None:
+        self.writes += 1
+        recorded = json.dumps(
+            {key: value for key, value in attrs.items() if key not in unrecorded}, sort_keys=True
+        )
+        self.attribute_bytes += len(recorded)
+        self._rows.add(recorded)
+
+    @property
+    def attribute_rows(self) -> int:
+        return len(self._rows)
+
+
+class _Model:
+    """One oven's three entities (remaining, timer running, last cook)."""
+
+    def __init__(self, cached: bool):
+        self.cached = cached
+        self.recorder = _Recorder()
+        self.builds = 0
+        self._snapshots: Dict[str, Optional[tuple]] = {"remaining": None, "running": None, "last_cook": None}
+        self._status_source: Any = None
+        self._meal_source: Any = None
+        self._meal_attrs: Dict[str, Any] = {}
+        self._status_attrs: Dict[str, Any] = {}
+        self._history_version: Optional[int] = None
+        self._history_attrs: Dict[str, Any] = {}
+        self._history_value = ""
+
+    def _remaining_attrs(self, data: OvenStatus, meal: Optional[Meal]) -> Dict[str, Any]:
+        if not self.cached:
+            self.builds += 2
+            return status_attributes(data, meal_attributes(meal))
+        if meal is not self._meal_source:
+            self._meal_source = meal
+            self._meal_attrs = meal_attributes(meal)
+            self._status_source = None
+            self.builds += 1
+        if data is not self._status_source:
+            self._status_source = data
+            self._status_attrs = status_attributes(data, self._meal_attrs)
+            self.builds += 1
+        return self._status_attrs
+
+    def _write(self, key: str, snapshot: tuple, attrs: Dict[str, Any], unrecorded: FrozenSet[str]) -> None:
+        if self.cached:
+            if snapshot == self._snapshots[key]:
+                return
+            self._snapshots[key] = snapshot
+        self.recorder.write(attrs, unrecorded if self.cached else frozenset())
+
+    def status_update(self, data: OvenStatus, meal: Optional[Meal], remaining: int) -> None:
+        attrs = self._remaining_attrs(data, meal)
+        self._write("remaining", (remaining, attrs), attrs, REMAINING_UNRECORDED_ATTRIBUTES)
+        self._write("running", (remaining > 0,), {}, frozenset())
+
+    def history_update(self, history: List[HistoryEntry], version: int) -> None:
+        if not self.cached or version != self._history_version:
+            self._history_version = version
+            self._history_value = last_cook_value(history)
+            self._history_attrs = history_attributes(history)
+            self.builds += 1
+        self._write(
+            "last_cook", (self._history_value, self._history_attrs),
+            self._history_attrs, LAST_COOK_UNRECORDED_ATTRIBUTES,
+        )
+
+
+def simulate(days: float, cooks_per_day: int, cached: bool) -> Dict[str, float]:
+    model = _Model(cached)
+    schedule = PollSchedule()
+    horizon = int(days * 86400)
+    spacing = 86400 // max(1, cooks_per_day)
+    cook_starts = {start for start in range(spacing // 2, horizon, spacing)}
+
+    idle = OvenStatus.from_api({"state": "idle", "remote_control_enabled": True})
+    data = idle
+    meal: Optional[Meal] = None
+    end_time: Optional[int] = None
+    last_state: Optional[str] = None
+    interval = 0.0
+    next_poll = 0
+    history: List[HistoryEntry] = []
+    history_version = 0
+    pending_history: List[HistoryEntry] = []
+
+    for now in range(horizon):
+        if now in cook_starts:
+            end_time = now + COOK_SECONDS
+        cooking = end_time is not None and now < end_time
+        remaining = end_time - now if cooking else 0
+
+        if now >= next_poll:
+            # The coordinator hands back the same status for an unchanged
+            # payload, and always_update=False suppresses the listener call.
+            if cooking and data.state != "cooking":
+                data = OvenStatus.from_api({
+                    "state": "cooking", "barcode": "133A254|463|5E34BF80",
+                    "estimated_end_time": (_T0 + timedelta(seconds=end_time)).isoformat(),
+                })
+                meal = _MEAL
+                model.status_update(data, meal, remaining)
+            elif not cooking and data is not idle:
+                pending_history.append(HistoryEntry(
+                    barcode=data.barcode, meal_id=463,
+                    start_time=_T0 + timedelta(seconds=now - COOK_SECONDS),
+                    end_time=_T0 + timedelta(seconds=now), status="complete",
+                ))
+                data = idle
+                end_time = None
+                model.status_update(data, meal, 0)
+            state = data.state
+            interval = schedule.next_interval(state, remaining, last_state, interval)
+            last_state = state
+            next_poll = now + int(interval)
+        elif cooking:
+            # Local 1 s countdown tick
+            model.status_update(data, meal, remaining)
+
+        if now % DEFAULT_HISTORY_INTERVAL == 0:
+            changed = bool(pending_history) or not now
+            if pending_history:
+                history = (pending_history[::-1] + history)[:HISTORY_BUFFER_SIZE]
+                pending_history = []
+                history_version += 1
+            # always_update=False: an unchanged history refresh calls no listener
+            if changed or not cached:
+                model.history_update(history, history_version)
+
+    recorder = model.recorder
+    return {
+        "writes": recorder.writes,
+        "builds": model.builds,
+        "attribute_kib": recorder.attribute_bytes / 1024,
+        "attribute_rows": recorder.attribute_rows,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=1.0)
+    parser.add_argument("--cooks-per-day", type=int, default=2)
+    args = parser.parse_args()
+
+    old = simulate(args.days, args.cooks_per_day, cached=False)
+    new = simulate(args.days, args.cooks_per_day, cached=True)
+    print(f"{args.days:g} simulated day(s), {args.cooks_per_day} cook(s)/day, one oven")
+    print(f"{'':16}{'old':>10}{'new':>10}{'change':>9}")
+    for key, label in (
+        ("writes", "state writes"), ("builds", "attr builds"),
+        ("attribute_kib", "recorded KiB"), ("attribute_rows", "attr rows"),
+    ):
+        change = (new[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+        print(f"{label:16}{old[key]:>10.0f}{new[key]:>10.0f}{change:>8.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Local stand-in for the Tovala cloud API.
+
+Serves /v0/getToken, /v0/users/{id}/ovens, .../cook/status, .../cook/history
+(paged with ?limit=&offset= unless told not to) and
+/v1/users/{id}/meals/{meal_id} from scripted cook sessions on a virtual
+clock, with optional latency, error and 429 injection.
+"""
+from __future__ import annotations
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import random
+import time
+
+from aiohttp import web
+
+USER_ID = 4242
+
+
+class VirtualClock:
+    """Simulated wall clock (epoch seconds) that only moves when told to."""
+
+    def __init__(self, start: Optional[float] = None):
+        self._now = time.time() if start is None else start
+
+    def now(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float) -> None:
+        self._now += max(0.0, seconds)
+
+    def advance_to(self, when: float) -> None:
+        self._now = max(self._now, when)
+
+
+class CookSession:
+    def __init__(self, start: float, duration: float, barcode: str, status: str = "complete"):
+        self.start = start
+        self.duration = duration
+        self.barcode = barcode
+        self.status = status
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _jwt(payload: Dict[str, Any]) -> str:
+    def b64(data: bytes) -> str:
+        return base64.urlsafe_b64encode(data).decode().rstrip("=")
+    return f"{b64(b'{}')}.{b64(json.dumps(payload).encode())}.fake"
+
+
+class FakeTovala:
+    """Scriptable fake Tovala API server."""
+
+    def __init__(
+        self,
+        ovens: int = 1,
+        clock: Optional[VirtualClock] = None,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: Optional[int] = None,
+        etags: bool = True,
+        token_ttl: int = 3600,
+        history_size: int = 20,
+        paging: bool = True,
+        reject_paging: bool = False,
+        seed: int = 0,
+    ):
+        self.clock = clock or VirtualClock()
+        self.latency = latency  # seconds added to every response
+        self.error_rate = error_rate  # fraction of requests answered with 503
+        self.rate_limit = rate_limit  # requests per virtual minute before 429
+        self.etags = etags  # answer If-None-Match on /cook/status with 304
+        self.token_ttl = token_ttl
+        self.paging = paging  # honour ?limit=&offset= on /cook/history
+        self.reject_paging = reject_paging  # answer 400 to them instead
+        self.oven_ids = [f"oven-{index}" for index in range(ovens)]
+        self.sessions: Dict[str, List[CookSession]] = {oven_id: [] for oven_id in self.oven_ids}
+        self.requests: Counter = Counter()
+        self._random = random.Random(seed)
+        self._window_start = 0.0
+        self._window_count = 0
+        self._runner: Optional[web.AppRunner] = None
+        self.url: Optional[str] = None
+
+        # Pre-existing history, oldest first
+        for oven_id in self.oven_ids:
+            for index in range(history_size, 0, -1):
+                start = self.clock.now() - index * 6 * 3600
+                self.add_cook(oven_id, start, 15 * 60, self.meal_barcode(self._random.randint(1, 50)))
+
+    @staticmethod
+    def meal_barcode(meal_id: int) -> str:
+        return f"133A254|{meal_id}|5E34BF80"
+
+    def add_cook(self, oven_id: str, start: float, duration: float, barcode: str) -> CookSession:
+        """Script a cook session on an oven."""
+        session = CookSession(start, duration, barcode)
+        self.sessions[oven_id].append(session)
+        self.sessions[oven_id].sort(key=lambda item: item.start)
+        return session
+
+    def schedule_daily_cooks(self, days: float, per_day: int, duration: float = 20 * 60) -> None:
+        """Scatter per_day random cooks per oven over the next days."""
+        now = self.clock.now()
+        for oven_id in self.oven_ids:
+            for _ in range(int(days * per_day)):
+                start = now + self._random.uniform(0, days * 86400)
+                self.add_cook(oven_id, start, duration, self.meal_barcode(self._random.randint(1, 50)))
+
+    def _active(self, oven_id: str) -> Optional[CookSession]:
+        now = self.clock.now()
+        for session in self.sessions[oven_id]:
+            if session.start <= now < session.end:
+                return session
+        return None
+
+    # -- HTTP -----------------------------------------------------------------
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.requests[request.match_info.route.name or "unknown"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.rate_limit is not None:
+            now = self.clock.now()
+            if now - self._window_start >= 60:
+                self._window_start, self._window_count = now, 0
+            self._window_count += 1
+            if self._window_count > self.rate_limit:
+                self.requests["429"] += 1
+                retry_after = max(1, int(60 - (now - self._window_start)))
+                return web.json_response(
+                    {"error": "rate limited"}, status=429, headers={"Retry-After": str(retry_after)}
+                )
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.requests["503"] += 1
+            return web.json_response({"error": "unavailable"}, status=503)
+        return await handler(request)
+
+    async def _login(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if not body.get("email") or not body.get("password"):
+            return web.json_response({"error": "invalid"}, status=401)
+        exp = int(time.time()) + self.token_ttl
+        return web.json_response({"token": _jwt({"userId": USER_ID, "exp": exp})})
+
+    async def _ovens(self, request: web.Request) -> web.Response:
+        return web.json_response([{"id": oven_id, "name": oven_id} for oven_id in self.oven_ids])
+
+    async def _status(self, request: web.Request) -> web.Response:
+        oven_id = request.match_info["oven_id"]
+        if oven_id not in self.sessions:
+            return web.json_response({"error": "not found"}, status=404)
+        session = self._active(oven_id)
+        if session is None:
+            body = {"state": "idle", "remote_control_enabled": True}
+        else:
+            body = {
+                "state": "cooking",
+                "barcode": session.barcode,
+                "estimated_start_time": _iso(session.start),
+                "estimated_end_time": _iso(session.end),
+                "remote_control_enabled": True,
+            }
+        if not self.etags:
+            return web.json_response(body)
+        text = json.dumps(body)
+        etag = f'"{hashlib.md5(text.encode()).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.requests["304"] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=text, content_type="application/json", headers={"ETag": etag})
+
+    async def _history(self, request: web.Request) -> web.Response:
+        oven_id = request.match_info["oven_id"]
+        if oven_id not in self.sessions:
+            return web.json_response({"error": "not found"}, status=404)
+        if self.reject_paging and ("limit" in request.query or "offset" in request.query):
+            return web.json_response({"error": "unknown parameter"}, status=400)
+        now = self.clock.now()
+        finished = (session for session in reversed(self.sessions[oven_id]) if session.end <= now)
+        if self.paging and "limit" in request.query:
+            offset = int(request.query.get("offset", 0))
+            finished = itertools.islice(finished, offset, offset + int(request.query["limit"]))
+        entries = [
+            {
+                "barcode": session.barcode,
+                "meal_id": int(session.barcode.split("|")[1]) if "|" in session.barcode else None,
+                "start_time": _iso(session.start),
+                "end_time": _iso(session.end),
+                "status": session.status,
+            }
+            for session in finished
+        ]
+        return web.json_response(entries)
+
+    async def _meal(self, request: web.Request) -> web.Response:
+        meal_id = int(request.match_info["meal_id"])
+        return web.json_response({"meal": {
+            "id": meal_id,
+            "title": f"Meal {meal_id}",
+            "subtitle": "with a side of benchmarks",
+            "images": [{"url": f"//cdn.example.invalid/meals/{meal_id}.jpg"}],
+            "ingredients": ", ".join(f"ingredient {index}" for index in range(25)),
+        }})
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post("/v0/getToken", self._login, name="login")
+        app.router.add_get("/v0/users/{user_id}/ovens", self._ovens, name="ovens")
+        app.router.add_get("/v0/users/{user_id}/ovens/{oven_id}/cook/status", self._status, name="status")
+        app.router.add_get("/v0/users/{user_id}/ovens/{oven_id}/cook/history", self._history, name="history")
+        app.router.add_get("/v1/users/{user_id}/meals/{meal_id}", self._meal, name="meal")
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve on host:port (0 picks a free port). Returns the base URL."""
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        self.url = f"http://{host}:{bound_port}"
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def _main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a fake Tovala API server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--ovens", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=None, help="requests per minute before 429")
+    parser.add_argument("--history", type=int, default=20, help="past cooks per oven")
+    parser.add_argument("--no-paging", action="store_true", help="ignore limit/offset on /cook/history")
+    args = parser.parse_args()
+
+    server = FakeTovala(
+        ovens=args.ovens,
+        latency=args.latency_ms / 1000,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        history_size=args.history,
+        paging=not args.no_paging,
+    )
+    # Real time drives the clock when run standalone
+    server.clock.now = time.time  # type: ignore[method-assign]
+    server.add_cook(server.oven_ids[0], time.time() + 5, 120, FakeTovala.meal_barcode(463))
+    print(f"Fake Tovala API on {await server.start(port=args.port)} (user {USER_ID})", flush=True)
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -1,17 +1,58 @@
 # custom_components/tovala/__init__.py
 from __future__ import annotations
+import asyncio
 import logging
-from homeassistant.core import HomeAssistant
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.storage import Store
 
-from .const import DOMAIN, PLATFORMS
-from .api import TovalaClient, TovalaAuthError, TovalaApiError
-from .coordinator import TovalaCoordinator
+from .const import (
+    DOMAIN,
+    DATA_ACCOUNTS,
+    DATA_IMAGE_CACHE,
+    DATA_SCHEDULER,
+    PLATFORMS,
+    STORAGE_VERSION,
+    STORAGE_KEY_AUTH,
+    STORAGE_KEY_MEALS,
+    STORAGE_KEY_STATE,
+    STORAGE_KEY_STATS,
+    SERVICE_BACKFILL_STATISTICS,
+    DEFAULT_BACKFILL_PAGE_SIZE,
+    CONF_OVEN_ID,
+    CONF_OVENS,
+    CONF_COOKING_INTERVAL,
+    CONF_IDLE_INTERVAL,
+    CONF_MAX_IDLE_INTERVAL,
+    CONF_TICK_INTERVAL,
+    DEFAULT_COOKING_INTERVAL,
+    DEFAULT_IDLE_INTERVAL,
+    DEFAULT_MAX_IDLE_INTERVAL,
+    DEFAULT_TICK_INTERVAL,
+)
+from .accounts import AccountRegistry, account_key
+from .api import TovalaClient, TovalaAuthError
+from .coordinator import TovalaCoordinator, TovalaHistoryCoordinator
+from .image_cache import MealImageCache
+from .long_term_stats import TovalaStatisticsImporter
+from .meal_cache import MealCache
+from .scheduler import PollScheduler
+from .views import TovalaMealImageView
 
 _LOGGER = logging.getLogger(__name__)
 
+# Retry delay (seconds) for background discovery while no oven is known yet
+DISCOVERY_RETRY_DELAY = 60
+
+ATTR_PAGE_SIZE = "page_size"
+BACKFILL_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_PAGE_SIZE, default=DEFAULT_BACKFILL_PAGE_SIZE): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=1000)
+    ),
+})
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Tovala from a config entry."""
@@ -19,51 +60,245 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     email = entry.data.get("email")
     password = entry.data.get("password")
-    oven_id = entry.data.get("oven_id")
     token = entry.data.get("token")  # optional, for future token-based auth
 
     session = async_get_clientsession(hass)
-    client = TovalaClient(session, email=email, password=password, token=token)
-
-    try:
-        # Authenticate and determine which base URL (beta or prod) works.
-        await client.login()
-    except TovalaAuthError as err:
-        raise ConfigEntryNotReady(f"Authentication failed: {err}") from err
-    except TovalaApiError as err:
-        raise ConfigEntryNotReady(f"Connection error: {err}") from err
-    except Exception as err:
-        raise ConfigEntryNotReady(f"Unexpected error: {err}") from err
-
-    # Try to get ovens (non-fatal if we can't yet)
-    if not oven_id:
+    auth_store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY_AUTH}.{entry.entry_id}")
+
+    def _save_auth() -> None:
+        auth_store.async_delay_save(client.export_auth, 1)
+
+    # Entries on the same account share one client (token, rate limit) and pollers
+    registry: AccountRegistry = hass.data[DOMAIN].setdefault(DATA_ACCOUNTS, AccountRegistry())
+    key = account_key(email)
+    pollers = None
+    if key is not None:
+        client = registry.acquire(
+            key,
+            entry.entry_id,
+            lambda: TovalaClient(session, email=email, password=password, token=token),
+            _save_auth,
+        )
+        client.update_password(password)
+        if client.authenticated:
+            # Token from the config flow or another entry: keep our copy current
+            _save_auth()
+    else:
+        client = TovalaClient(session, email=email, password=password, token=token)
+        client.set_auth_listener(_save_auth)
+        entry.async_on_unload(client.close)
+
+    # Reuse the token and base URL from the last run while they are still valid
+    if not client.authenticated:
+        stored_auth = await auth_store.async_load()
+        if stored_auth:
+            client.restore_auth(stored_auth)
+
+    if key is not None:
+        # Entries set up at the same time wait for the first one's pollers
+        pollers = await registry.async_reserve_pollers(key)
+    shared = pollers is not None
+    if shared:
+        # Another entry on this account already polls its ovens
+        _LOGGER.debug("Sharing pollers for %s with entry %s", key, entry.entry_id)
+        coord, history, statistics = pollers
+    else:
         try:
-            ovens = await client.list_ovens()
-            _LOGGER.info("list_ovens returned: %s", ovens)
-            if ovens:
-                oven_id = ovens[0].get("id")
-                _LOGGER.info("Extracted oven_id: %s from first oven: %s", oven_id, ovens[0])
-                if oven_id:
-                    hass.config_entries.async_update_entry(
-                        entry, data={**entry.data, "oven_id": oven_id}
-                    )
-        except Exception as e:
-            # Ovens list isn't critical for initial setup
-            _LOGGER.error("Failed to discover ovens during setup: %s", e, exc_info=True)
-            oven_id = None
-
-    coord = TovalaCoordinator(hass, client, oven_id)
-    await coord.async_config_entry_first_refresh()
-
-    hass.data[DOMAIN][entry.entry_id] = {"client": client, "coordinator": coord}
+            coord, history, statistics = await _async_create_pollers(hass, entry, client)
+        except BaseException:
+            if key is not None:
+                # Let a waiting entry build them instead
+                registry.set_pollers(key, None)
+            raise
+        if key is not None:
+            registry.set_pollers(key, (coord, history, statistics))
+
+    if key is not None:
+        # Entity unique ids come from the oven id: one entry per oven creates them
+        ovens = registry.claim_ovens(key, entry.entry_id, coord.oven_ids)
+
+        async def _async_release() -> None:
+            owned = registry.owned_ovens(key, entry.entry_id)
+            closed = registry.release(key, entry.entry_id)
+            if not shared:
+                # The pollers use this entry's options and storage: they go with it
+                registry.set_pollers(key, None)
+                await coord.async_shutdown()
+                await history.async_shutdown()
+            if not closed and (owned or not shared):
+                # The account's other entries take over the pollers and ovens
+                for other in registry.entry_ids(key):
+                    hass.async_create_task(hass.config_entries.async_reload(other))
+
+        entry.async_on_unload(_async_release)
+    else:
+        ovens = coord.oven_ids
+        entry.async_on_unload(coord.async_shutdown)
+        entry.async_on_unload(history.async_shutdown)
+
+    hass.data[DOMAIN][entry.entry_id] = {
+        "client": client,
+        "coordinator": coord,
+        "history_coordinator": history,
+        "statistics": statistics,
+        "ovens": ovens,  # oven ids this entry creates entities for
+    }
+    _async_register_services(hass)
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    if not shared:
+        entry.async_create_background_task(hass, _async_start(hass, entry, coord), "tovala_startup")
     return True
 
- 
+
+async def _async_create_pollers(hass: HomeAssistant, entry: ConfigEntry, client: TovalaClient) -> tuple:
+    """Build the status and history coordinators plus the statistics importer for an account."""
+    # Entities are built from the last known oven list; login and discovery
+    # run in the background so startup never waits on the Tovala cloud.
+    ovens = list(entry.data.get(CONF_OVENS) or [])
+    oven_id = entry.data.get(CONF_OVEN_ID)
+    if not ovens and oven_id:
+        ovens = [{"id": oven_id}]
+
+    # Meal details survive restarts and are shared by every oven on the account
+    meal_cache = MealCache(Store(hass, STORAGE_VERSION, f"{STORAGE_KEY_MEALS}.{entry.entry_id}"))
+    await meal_cache.async_load()
+
+    coord = TovalaCoordinator(
+        hass,
+        client,
+        ovens,
+        cooking_interval=entry.options.get(CONF_COOKING_INTERVAL, DEFAULT_COOKING_INTERVAL),
+        idle_interval=entry.options.get(CONF_IDLE_INTERVAL, DEFAULT_IDLE_INTERVAL),
+        max_idle_interval=entry.options.get(CONF_MAX_IDLE_INTERVAL, DEFAULT_MAX_IDLE_INTERVAL),
+        tick_interval=entry.options.get(CONF_TICK_INTERVAL, DEFAULT_TICK_INTERVAL),
+        meal_cache=meal_cache,
+        store=Store(hass, STORAGE_VERSION, f"{STORAGE_KEY_STATE}.{entry.entry_id}"),
+        # One scheduler paces status polls from every entry and oven
+        scheduler=hass.data[DOMAIN].setdefault(DATA_SCHEDULER, PollScheduler()),
+    )
+    await coord.async_restore()
+    coord.image_cache = _async_get_image_cache(hass)
+
+    # History polls on its own slow cadence
+    history = TovalaHistoryCoordinator(hass, client, coord.ovens)
+    coord.history_coordinator = history
+    # New history entries teach each oven's usage profile; the listener lives
+    # as long as the coordinators do
+    history.async_add_listener(coord.async_history_updated)
+
+    # Finished cooks feed recorder long-term statistics incrementally
+    statistics = TovalaStatisticsImporter(
+        hass, client, Store(hass, STORAGE_VERSION, f"{STORAGE_KEY_STATS}.{entry.entry_id}")
+    )
+    await statistics.async_load()
+    history.statistics = statistics
+    return coord, history, statistics
+
+
+async def _async_start(hass: HomeAssistant, entry: ConfigEntry, coord: TovalaCoordinator) -> None:
+    """Log in, discover ovens and run the first refreshes off the startup path."""
+    client = coord.client
+    while True:
+        try:
+            # Authenticate and determine which base URL (beta or prod) works.
+            # No-op when the restored token is still valid.
+            await client.login()
+            discovered = [oven for oven in await client.list_ovens() if oven.get("id")]
+            break
+        except TovalaAuthError as err:
+            # Raising ConfigEntryAuthFailed from this background task would go
+            # unnoticed, so start the reauth flow it would have started
+            _LOGGER.error("Authentication failed: %s", err)
+            entry.async_start_reauth(hass)
+            return
+        except Exception as err:
+            _LOGGER.warning("Tovala not reachable during setup: %s", err)
+        if coord.ovens:
+            # The coordinator keeps retrying the login on its own schedule
+            discovered = None
+            break
+        await asyncio.sleep(DISCOVERY_RETRY_DELAY)
+
+    if discovered is not None:
+        _LOGGER.info("list_ovens returned %d oven(s): %s", len(discovered), [o.get("id") for o in discovered])
+        known = [{"id": str(oven["id"]), "name": oven.get("name")} for oven in discovered]
+        if known and known != entry.data.get(CONF_OVENS):
+            # The update listener reloads the entry so entities match the account
+            _LOGGER.info("Oven list changed, reloading Tovala entry")
+            hass.config_entries.async_update_entry(
+                entry,
+                data={
+                    **entry.data,
+                    CONF_OVENS: known,
+                    # Remember one oven so we can still poll it if discovery fails later
+                    CONF_OVEN_ID: entry.data.get(CONF_OVEN_ID) or known[0]["id"],
+                },
+            )
+            return
+
+    await coord.async_refresh()
+    await coord.history_coordinator.async_refresh()
+
+
+def _async_get_image_cache(hass: HomeAssistant) -> MealImageCache:
+    """Meal images are the same for every account: one cache and view per instance."""
+    cache = hass.data[DOMAIN].get(DATA_IMAGE_CACHE)
+    if cache is None:
+        cache = hass.data[DOMAIN][DATA_IMAGE_CACHE] = MealImageCache(
+            async_get_clientsession(hass), hass.config.path(".cache", DOMAIN, "meal_images")
+        )
+        hass.http.register_view(TovalaMealImageView(cache))
+    return cache
+
+
+def _async_register_services(hass: HomeAssistant) -> None:
+    """Register domain services once, shared by every config entry."""
+    if hass.services.has_service(DOMAIN, SERVICE_BACKFILL_STATISTICS):
+        return
+
+    async def _async_backfill_statistics(call: ServiceCall) -> None:
+        """Rebuild long-term statistics from the complete cooking history."""
+        done = set()
+        for data in list(hass.data.get(DOMAIN, {}).values()):
+            if not isinstance(data, dict) or "statistics" not in data:
+                continue
+            # Entries on one account share their importer: backfill it once
+            if id(data["statistics"]) in done:
+                continue
+            done.add(id(data["statistics"]))
+            for oven in data["coordinator"].ovens.values():
+                await data["statistics"].async_backfill(oven.oven_id, oven.name, call.data[ATTR_PAGE_SIZE])
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL_STATISTICS, _async_backfill_statistics, schema=BACKFILL_SCHEMA
+    )
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when options (poll intervals) or the oven list change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop the persisted token, meal cache, status and statistics marks when the entry is deleted."""
+    for key in (STORAGE_KEY_AUTH, STORAGE_KEY_MEALS, STORAGE_KEY_STATE, STORAGE_KEY_STATS):
+        await Store(hass, STORAGE_VERSION, f"{key}.{entry.entry_id}").async_remove()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a Tovala config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id, None)
+        if not any(
+            other.entry_id in hass.data[DOMAIN] for other in hass.config_entries.async_entries(DOMAIN)
+        ):
+            # Last entry gone: cancel polls still waiting for a slot. The next
+            # setup starts a fresh scheduler.
+            scheduler = hass.data[DOMAIN].pop(DATA_SCHEDULER, None)
+            if scheduler is not None:
+                scheduler.close()
     return unload_ok
\ No newline at end of file
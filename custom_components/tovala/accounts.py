@@ -0,0 +1,141 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import asyncio
+import logging
+
+from .api import TovalaClient
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def account_key(email: Optional[str]) -> Optional[str]:
+    """Registry key for an account; None when there is no email to share on."""
+    if not email:
+        return None
+    return email.strip().lower()
+
+
+class _Account:
+    def __init__(self, client: TovalaClient):
+        self.client = client
+        # entry_id -> callback persisting that entry's copy of the token
+        self.entries: Dict[str, Optional[Callable[[], None]]] = {}
+        # Status/history coordinators: built by the first entry, shared by the rest
+        self.pollers: Any = None
+        # Set while an entry builds the pollers; resolves when it is done
+        self.building: Optional[asyncio.Future] = None
+        # oven_id -> entry_id whose entities show that oven
+        self.oven_owners: Dict[str, str] = {}
+
+    def notify_auth(self) -> None:
+        for listener in list(self.entries.values()):
+            if listener is not None:
+                listener()
+
+
+class AccountRegistry:
+    """One shared TovalaClient per Tovala account, reference-counted by config entry.
+
+    Entries on the same account share a token, the rate limiter and one set
+    of pollers, so every oven is polled once however many entries watch it.
+    Each oven's entities belong to a single entry, since their unique ids
+    are built from the oven id. The config flow borrows the client to
+    validate credentials without a second login.
+    """
+
+    def __init__(self) -> None:
+        self._accounts: Dict[str, _Account] = {}
+
+    def get(self, key: Optional[str]) -> Optional[TovalaClient]:
+        account = self._accounts.get(key) if key else None
+        return account.client if account is not None else None
+
+    def adopt(self, key: str, client: TovalaClient) -> bool:
+        """Keep a client logged in by the config flow for the entry about to be set up.
+
+        Returns False when the account already has a client; the caller then
+        still owns (and must close) the one it passed in.
+        """
+        if key in self._accounts:
+            return False
+        account = self._accounts[key] = _Account(client)
+        client.set_auth_listener(account.notify_auth)
+        return True
+
+    def acquire(
+        self,
+        key: str,
+        entry_id: str,
+        factory: Callable[[], TovalaClient],
+        auth_listener: Optional[Callable[[], None]] = None,
+    ) -> TovalaClient:
+        """Return the account's client (creating it if needed) and count entry_id as a user."""
+        account = self._accounts.get(key)
+        if account is None:
+            account = self._accounts[key] = _Account(factory())
+            account.client.set_auth_listener(account.notify_auth)
+        else:
+            _LOGGER.debug("Sharing Tovala client for %s with entry %s", key, entry_id)
+        account.entries[entry_id] = auth_listener
+        return account.client
+
+    async def async_reserve_pollers(self, key: str) -> Any:
+        """The account's shared pollers, waiting while another entry builds them.
+
+        Returns None when the caller is to build them; it must then call
+        set_pollers, with None if building failed. The reservation is made
+        before the first await, so entries set up at the same time never
+        both build.
+        """
+        while True:
+            account = self._accounts[key]
+            if account.pollers is not None:
+                return account.pollers
+            if account.building is None:
+                account.building = asyncio.get_running_loop().create_future()
+                return None
+            # Shielded: a cancelled setup must not cancel the others' wait
+            await asyncio.shield(account.building)
+
+    def set_pollers(self, key: str, pollers: Any) -> None:
+        account = self._accounts.get(key)
+        if account is None:
+            return
+        account.pollers = pollers
+        if account.building is not None:
+            if not account.building.done():
+                account.building.set_result(None)
+            account.building = None
+
+    def entry_ids(self, key: str) -> List[str]:
+        account = self._accounts.get(key)
+        return list(account.entries) if account is not None else []
+
+    def claim_ovens(self, key: str, entry_id: str, oven_ids: Iterable[str]) -> List[str]:
+        """Ovens entry_id should create entities for: those no other entry shows yet."""
+        owners = self._accounts[key].oven_owners
+        return [oven_id for oven_id in oven_ids if owners.setdefault(oven_id, entry_id) == entry_id]
+
+    def owned_ovens(self, key: str, entry_id: str) -> List[str]:
+        account = self._accounts.get(key)
+        if account is None:
+            return []
+        return [oven_id for oven_id, owner in account.oven_owners.items() if owner == entry_id]
+
+    def release(self, key: str, entry_id: str) -> bool:
+        """Drop entry_id's reference and oven claims.
+
+        Returns True when it was the last one: the client is then closed and
+        the caller shuts the account's pollers down.
+        """
+        account = self._accounts.get(key)
+        if account is None:
+            return False
+        account.entries.pop(entry_id, None)
+        for oven_id in self.owned_ovens(key, entry_id):
+            del account.oven_owners[oven_id]
+        if not account.entries:
+            account.client.close()
+            del self._accounts[key]
+            return True
+        return False
@@ -1,11 +1,29 @@
 # custom_components/tovala/api.py
 from __future__ import annotations
-from typing import Any, Dict, List, Optional, Sequence
-from aiohttp import ClientSession, ClientError, ClientTimeout
+from contextlib import aclosing
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+from aiohttp import ClientResponse, ClientSession, ClientError, ClientTimeout
+import asyncio
 import time
 import logging
 import json
 import base64
+import hashlib
+import codecs
+import contextvars
+
+try:
+    # Faster JSON backend when available (Home Assistant ships orjson)
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads
+
+from .breaker import CircuitBreaker
+from .jsonstream import JsonArrayParser
+from .metrics import EndpointStats
+from .models import HistoryEntry, Meal, OvenStatus
+from .policy import DEFAULT_POLICIES, RequestPolicy, TokenBucket, parse_retry_after
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,12 +35,104 @@ DEFAULT_BASES: Sequence[str] = (
 
 LOGIN_PATH = "/v0/getToken"
 
+# Start the next base URL if the preferred one hasn't answered within this many seconds
+LOGIN_HEDGE_DELAY = 1.5
+# Client-side rate limit shared by every request on one account
+DEFAULT_RATE_LIMIT = 60  # requests per minute
+DEFAULT_RATE_BURST = 10
+
+# A base that failed is avoided for this long (seconds) unless nothing else is healthy
+BASE_FAILURE_COOLDOWN = 300
+
+# Renew the token in the background this many seconds before it expires
+TOKEN_RENEW_BEFORE = 300
+TOKEN_RENEW_RETRY = 60
+
+# Cooking history is streamed in chunks of this many bytes, never held in
+# memory whole. Its first page has this many entries; later ones double.
+STREAM_CHUNK_SIZE = 16 * 1024
+HISTORY_PAGE_SIZE = 100
+
+_T = TypeVar("_T")
+
+# Set while a request holds the circuit breaker's permission, so a login it
+# triggers (first token, or a rejected one) does not ask the breaker again
+_UNDER_BREAKER: contextvars.ContextVar[bool] = contextvars.ContextVar("tovala_under_breaker", default=False)
+
 class TovalaAuthError(Exception):
     """Authentication failed (bad credentials or denied)."""
 
 class TovalaApiError(Exception):
     """Other API/HTTP failures."""
 
+class TovalaCircuitOpenError(TovalaApiError):
+    """Refused locally: the circuit breaker is open after repeated failures."""
+
+    def __init__(self, retry_in: float):
+        super().__init__(f"Tovala API unavailable; next attempt in {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+def _snippet(body: bytes, limit: int = 200) -> str:
+    """Decode the start of a response body for log and error messages."""
+    return body[:limit].decode("utf-8", errors="replace")
+
+class _RetryableError(TovalaApiError):
+    """Transient failure worth retrying (429, 5xx, connection errors)."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None, host_fault: bool = True):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.host_fault = host_fault  # False for account-level limits like 429
+
+class _RejectedError(TovalaApiError):
+    """The API answered with a client error (4xx) that retrying will not fix."""
+
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.status = status
+
+def _is_host_fault(err: BaseException) -> bool:
+    """Whether a failed request says the host is unwell (worth trying another base)."""
+    if isinstance(err, _RetryableError):
+        return err.host_fault
+    return isinstance(err, (ClientError, asyncio.TimeoutError))
+
+class _BaseHealth:
+    """Rolling latency/failure score for one API base URL."""
+
+    def __init__(self, order: int):
+        self.order = order  # position in the configured list, used as tie-breaker
+        self.latency: Optional[float] = None  # EWMA, seconds
+        self.failures = 0  # consecutive
+        self.last_failure = 0.0
+
+    def record_success(self, latency: float) -> None:
+        self.latency = latency if self.latency is None else 0.7 * self.latency + 0.3 * latency
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.last_failure = time.monotonic()
+
+    @property
+    def healthy(self) -> bool:
+        return not self.failures or time.monotonic() - self.last_failure > BASE_FAILURE_COOLDOWN
+
+    def sort_key(self) -> tuple:
+        # Healthy first, then fastest measured, then configured order
+        return (not self.healthy, self.failures, self.latency if self.latency is not None else 1.0, self.order)
+
+
+class _CachedResponse:
+    """Validators and parsed body from the last 200 response for a path."""
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], digest: bytes, data: Any):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+        self.data = data
+
+
 class TovalaClient:
     def __init__(
         self,
@@ -31,6 +141,9 @@ class TovalaClient:
         password: Optional[str] = None,
         token: Optional[str] = None,
         api_bases: Optional[Sequence[str]] = None,
+        policies: Optional[Dict[str, RequestPolicy]] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        breaker: Optional[CircuitBreaker] = None,
     ):
         self._session = session
         self._email = email
@@ -39,7 +152,36 @@ class TovalaClient:
         self._token_exp = 0
         self._bases: Sequence[str] = api_bases or DEFAULT_BASES
         self._base: Optional[str] = None  # set on successful login
+        self._health: Dict[str, _BaseHealth] = {
+            base: _BaseHealth(order) for order, base in enumerate(self._bases)
+        }
         self._user_id: Optional[int] = None  # extracted from JWT token
+        self._login_task: Optional[asyncio.Task] = None  # in-flight login shared by all callers
+        self._renew_handle: Optional[asyncio.TimerHandle] = None
+        self._renew_task: Optional[asyncio.Task] = None
+        self._auth_listener: Optional[Callable[[], None]] = None
+        self._policies: Dict[str, RequestPolicy] = {**DEFAULT_POLICIES, **(policies or {})}
+        self._rate_limiter = rate_limiter or TokenBucket(DEFAULT_RATE_LIMIT / 60, DEFAULT_RATE_BURST)
+        self._conditional: Dict[str, _CachedResponse] = {}  # path -> last response
+        # Shared by every endpoint: an outage is an account-wide condition
+        self.breaker = breaker or CircuitBreaker()
+        self.metrics: Dict[str, float] = {
+            "requests": 0,
+            "not_modified": 0,
+            "unchanged": 0,
+            "retries": 0,
+            "errors": 0,
+            "rate_limited": 0,
+            "throttled_waits": 0,
+            "throttled_seconds": 0.0,
+            "shared": 0,
+            "short_circuited": 0,
+        }
+        self.endpoint_stats: Dict[str, EndpointStats] = {}
+        self.logins = 0
+        self._status_inflight: Dict[str, asyncio.Future] = {}
+        self._token_issued: Optional[float] = None  # epoch seconds, from the iat claim if present
+        self._history_paging = True  # False once the server was seen ignoring limit/offset
 
     @property
     def base_url(self) -> Optional[str]:
@@ -49,8 +191,54 @@ class TovalaClient:
     def user_id(self) -> Optional[int]:
         return self._user_id
 
-    def _decode_jwt_user_id(self, token: str) -> Optional[int]:
-        """Extract userId from JWT token payload without verification."""
+    @property
+    def token_age(self) -> Optional[float]:
+        """Seconds since the current token was issued, if known."""
+        if not self._token or self._token_issued is None:
+            return None
+        return max(0.0, time.time() - self._token_issued)
+
+    def _stats(self, endpoint: str) -> EndpointStats:
+        stats = self.endpoint_stats.get(endpoint)
+        if stats is None:
+            stats = self.endpoint_stats[endpoint] = EndpointStats()
+        return stats
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """Counters, per-endpoint latency and auth state; contains no secrets."""
+        return {
+            "totals": dict(self.metrics),
+            "endpoints": {name: stats.as_dict() for name, stats in self.endpoint_stats.items()},
+            "logins": self.logins,
+            "token_age": None if self.token_age is None else round(self.token_age),
+            "token_expires_in": round(self._token_exp - time.time()) if self._token else None,
+            "base_url": self._base,
+            "breaker": self.breaker.as_dict(),
+            "bases": {
+                base: {
+                    "healthy": health.healthy,
+                    "failures": health.failures,
+                    "latency_ms": None if health.latency is None else round(health.latency * 1000, 1),
+                }
+                for base, health in self._health.items()
+            },
+        }
+
+    def _ranked_bases(self) -> List[str]:
+        """Configured bases ordered by health and measured latency."""
+        return sorted(self._bases, key=lambda base: self._health[base].sort_key())
+
+    def _fail_over(self, failed_base: str) -> bool:
+        """Switch to the best other healthy base. Returns True if we switched."""
+        for base in self._ranked_bases():
+            if base != failed_base and self._health[base].healthy:
+                _LOGGER.warning("Failing over from %s to %s", failed_base, base)
+                self._base = base
+                return True
+        return False
+
+    def _decode_jwt_payload(self, token: str) -> Optional[Dict[str, Any]]:
+        """Decode a JWT payload without verification."""
         try:
             # JWT format: header.payload.signature
             parts = token.split('.')
@@ -67,39 +255,292 @@ class TovalaClient:
 
             decoded = base64.urlsafe_b64decode(payload)
             data = json.loads(decoded)
-            user_id = data.get("userId")
-
-            if user_id:
-                _LOGGER.debug("Extracted userId %s from JWT", user_id)
-                return int(user_id)
-            else:
-                _LOGGER.warning("No userId field in JWT payload")
-                return None
+            return data if isinstance(data, dict) else None
         except Exception as e:
             _LOGGER.error("Failed to decode JWT: %s", e, exc_info=True)
             return None
 
+    def _decode_jwt_user_id(self, token: str) -> Optional[int]:
+        """Extract userId from JWT token payload without verification."""
+        data = self._decode_jwt_payload(token) or {}
+        user_id = data.get("userId")
+
+        if user_id:
+            _LOGGER.debug("Extracted userId %s from JWT", user_id)
+            return int(user_id)
+        else:
+            _LOGGER.warning("No userId field in JWT payload")
+            return None
+
+    def _decode_jwt_exp(self, token: str) -> Optional[int]:
+        """Extract the exp claim (epoch seconds) from a JWT, if present."""
+        data = self._decode_jwt_payload(token) or {}
+        try:
+            return int(data["exp"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def _decode_jwt_iat(self, token: str) -> Optional[int]:
+        """Extract the iat claim (epoch seconds) from a JWT, if present."""
+        data = self._decode_jwt_payload(token) or {}
+        try:
+            return int(data["iat"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def export_auth(self) -> Dict[str, Any]:
+        """Return the token state worth persisting across restarts."""
+        return {
+            "token": self._token,
+            "token_exp": self._token_exp,
+            "base": self._base,
+            "user_id": self._user_id,
+        }
+
+    def restore_auth(self, state: Dict[str, Any]) -> bool:
+        """Load token state saved by export_auth(). Returns True if it is usable."""
+        token = state.get("token")
+        token_exp = int(state.get("token_exp") or 0)
+        base = state.get("base")
+        if not token or base not in self._bases or token_exp <= time.time() + 60:
+            _LOGGER.debug("Stored token is missing or expired; a fresh login is needed")
+            return False
+
+        self._token = token
+        self._token_exp = token_exp
+        self._token_issued = self._decode_jwt_iat(token)
+        self._base = base
+        self._user_id = state.get("user_id") or self._decode_jwt_user_id(token)
+        _LOGGER.debug("Restored token for %s (userId: %s), expires in %ds",
+                      base, self._user_id, token_exp - time.time())
+        if self._email and self._password:
+            self._schedule_renewal(token_exp - time.time() - TOKEN_RENEW_BEFORE)
+        return True
+
+    def set_auth_listener(self, listener: Optional[Callable[[], None]]) -> None:
+        """Register a callback invoked after every successful login."""
+        self._auth_listener = listener
+
+    def invalidate_token(self) -> None:
+        """Forget the current token so the next request logs in again."""
+        if self._email and self._password:
+            self._token = None
+            self._token_exp = 0
+
+    def _token_is_valid(self) -> bool:
+        return bool(self._token) and self._token_exp > time.time() + 60
+
+    @property
+    def authenticated(self) -> bool:
+        """True while the client holds a token that is not about to expire."""
+        return self._token_is_valid()
+
+    def has_credentials(self, email: Optional[str], password: Optional[str]) -> bool:
+        return self._email == email and self._password == password
+
+    def update_password(self, password: str) -> None:
+        """Switch to a new password; the current token is dropped if it changed."""
+        if password != self._password:
+            self._password = password
+            self.invalidate_token()
+
     async def login(self) -> None:
-        """Ensure we have a valid bearer token. Tries beta then prod."""
-        if self._token and self._token_exp > time.time() + 60:
+        """Ensure we have a valid bearer token.
+
+        Concurrent callers share a single in-flight login.
+        """
+        if self._token_is_valid():
+            return
+        await self._async_join_login(force=False)
+
+    async def ensure_token(self, valid_for: float) -> None:
+        """Renew now unless the token stays valid for at least valid_for more seconds.
+
+        Used to get a login out of the way before a busy period.
+        """
+        if self._token_is_valid() and self._token_exp > time.time() + valid_for:
+            return
+        if not (self._email and self._password):
+            # A bare token cannot be renewed; just make sure it is usable
+            await self.login()
+            return
+        await self._async_join_login(force=True)
+
+    async def _async_join_login(self, force: bool) -> None:
+        """Start a login unless one is already running, then wait for it."""
+        task = self._login_task
+        if task is None or task.done():
+            task = asyncio.get_running_loop().create_task(self._async_login(force))
+            self._login_task = task
+        else:
+            _LOGGER.debug("Waiting for in-flight login")
+        # Shield so a cancelled caller doesn't abort the login other callers wait on
+        await asyncio.shield(task)
+
+    def _schedule_renewal(self, delay: float) -> None:
+        """Renew the token in the background before it expires."""
+        if self._renew_handle is not None:
+            self._renew_handle.cancel()
+        self._renew_handle = asyncio.get_running_loop().call_later(
+            max(0.0, delay), self._start_renewal
+        )
+
+    def _start_renewal(self) -> None:
+        self._renew_handle = None
+        self._renew_task = asyncio.get_running_loop().create_task(self._async_renew())
+
+    async def _async_renew(self) -> None:
+        _LOGGER.debug("Renewing token ahead of expiry")
+        try:
+            await self._async_join_login(force=True)
+        except Exception as e:
+            _LOGGER.warning("Background token renewal failed: %s", e)
+            # Try again while the current token is still usable
+            if self._token_exp > time.time() + TOKEN_RENEW_RETRY:
+                self._schedule_renewal(TOKEN_RENEW_RETRY)
+
+    def close(self) -> None:
+        """Cancel background renewal and any in-flight login or status request."""
+        if self._renew_handle is not None:
+            self._renew_handle.cancel()
+            self._renew_handle = None
+        if self._renew_task is not None and not self._renew_task.done():
+            self._renew_task.cancel()
+        self._renew_task = None
+        if self._login_task is not None and not self._login_task.done():
+            self._login_task.cancel()
+        self._login_task = None
+        for task in self._status_inflight.values():
+            task.cancel()
+
+    async def _async_login(self, force: bool = False) -> None:
+        """Fetch a bearer token, racing the configured base URLs."""
+        if not force and self._token_is_valid():
             _LOGGER.debug("Token still valid, skipping login")
             return
         if not (self._token or (self._email and self._password)):
             raise TovalaAuthError("Missing credentials")
 
-        # If we already have a token but exp unknown, assume 1 hour left
+        # If we already have a token but exp unknown, read it from the JWT
+        # (assume 1 hour left if the token carries no exp claim)
         if self._token and not self._token_exp:
-            self._token_exp = int(time.time()) + 3600
-            self._base = self._bases[0]
-            _LOGGER.debug("Using provided token with assumed expiry")
-            return
+            self._token_exp = self._decode_jwt_exp(self._token) or int(time.time()) + 3600
+            self._base = self._base or self._bases[0]
+            self._user_id = self._user_id or self._decode_jwt_user_id(self._token)
+            if self._token_is_valid():
+                _LOGGER.debug("Using provided token (expires in %ds)", self._token_exp - time.time())
+                return
 
-        if self._token:
+        if self._token and not (self._email and self._password):
             # Token supplied by options: we don't yet know the right base.
             self._base = self._bases[0]
             _LOGGER.debug("Using provided token with base: %s", self._base)
             return
 
+        # A credential login is a request like any other: refused while the
+        # circuit breaker is open, and its outcome counts towards it. A login
+        # made on behalf of a request that went through the breaker is part of
+        # that request.
+        guarded = not _UNDER_BREAKER.get()
+        if guarded and not self.breaker.allow():
+            self.metrics["short_circuited"] += 1
+            raise TovalaCircuitOpenError(self.breaker.retry_in)
+
+        # Race the bases, healthiest first. Each further base is only started
+        # after a short hedge delay (or as soon as an earlier one fails with a
+        # host fault), so a healthy preferred host costs a single request.
+        # Refused credentials and rate limits end the race at once: another
+        # host would only answer the same.
+        bases = self._ranked_bases()
+        tasks: List[asyncio.Task] = []
+        errors: List[Exception] = []
+        try:
+            pending: set = set()
+            for index, base in enumerate(bases):
+                task = asyncio.ensure_future(self._login_at(base))
+                tasks.append(task)
+                pending.add(task)
+                is_last = index == len(bases) - 1
+                result = await self._await_first_login(pending, errors, None if is_last else LOGIN_HEDGE_DELAY)
+                if result is not None:
+                    break
+            else:
+                result = None
+                while pending and result is None:
+                    result = await self._await_first_login(pending, errors, None)
+        except BaseException:
+            # Refused, rate limited or cancelled: no verdict on the API's health
+            if guarded:
+                self.breaker.release()
+            raise
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        if guarded:
+            if result is not None:
+                self.breaker.record_success()
+            else:
+                self._record_breaker_failure()
+
+        if result is not None:
+            base, token, data = result
+            self._token = token
+            self._token_exp = self._decode_jwt_exp(token) or (
+                int(time.time()) + int(data.get("expiresIn", 3600))
+            )
+            self._base = base
+            self._token_issued = self._decode_jwt_iat(token) or time.time()
+            self.logins += 1
+
+            # Extract userId from JWT token
+            self._user_id = self._decode_jwt_user_id(token)
+            if not self._user_id:
+                _LOGGER.warning("Could not extract userId from token")
+
+            _LOGGER.info("Successfully logged in to %s (userId: %s)", base, self._user_id)
+            self._schedule_renewal(self._token_exp - time.time() - TOKEN_RENEW_BEFORE)
+            if self._auth_listener is not None:
+                self._auth_listener()
+            return
+
+        # If we reach here, every base failed with a host fault
+        _LOGGER.error("All login attempts failed: %s", errors)
+        for err in errors:
+            if isinstance(err, TovalaApiError):
+                raise err
+        if errors:
+            raise TovalaApiError(f"Connection failed: {str(errors[-1])}")
+        raise TovalaApiError("Login failed")
+
+    async def _await_first_login(
+        self, pending: set, errors: List[Exception], timeout: Optional[float]
+    ) -> Optional[tuple]:
+        """Wait until a login attempt succeeds, every attempt failed, or timeout.
+
+        Attempts that failed with a host fault are moved from pending into
+        errors; any other failure is raised straight away.
+        """
+        while pending:
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                return None  # hedge delay elapsed; caller starts the next base
+            for task in done:
+                pending.discard(task)
+                err = task.exception()
+                if err is None:
+                    return task.result()
+                if not _is_host_fault(err):
+                    raise err
+                errors.append(err)
+            if timeout is not None:
+                # A failure frees the slot: start the next base right away
+                return None
+        return None
+
+    async def _login_at(self, base: str) -> tuple:
+        """POST credentials to one base. Returns (base, token, response data)."""
         # CRITICAL: X-Tovala-AppID header is required!
         headers = {
             "Accept": "application/json",
@@ -109,80 +550,69 @@ class TovalaClient:
             "Referer": "https://my.tovala.com/",
             "X-Tovala-AppID": "MAPP",
         }
+        url = f"{base}{LOGIN_PATH}"
+        _LOGGER.debug("Attempting login to %s", url)
+        health = self._health[base]
+        stats = self._stats("login")
+        await self._throttle()
+        self.metrics["requests"] += 1
+        stats.requests += 1
+        started = time.monotonic()
 
-        last_err: Optional[Exception] = None
-        for base in self._bases:
-            url = f"{base}{LOGIN_PATH}"
-            _LOGGER.debug("Attempting login to %s", url)
-            
-            try:
-                timeout = ClientTimeout(total=10)
-                async with self._session.post(
-                    url,
-                    headers=headers,
-                    json={"email": self._email, "password": self._password, "type": "user"},
-                    timeout=timeout,
-                ) as r:
-                    txt = await r.text()
-                    _LOGGER.debug("Login response from %s: status=%s, body=%s", base, r.status, txt[:200])
-                    
-                    if r.status == 429:
-                        # Rate limited - stop immediately
-                        _LOGGER.error("Rate limited by Tovala API: %s", txt)
-                        raise TovalaApiError(f"Rate limited (HTTP 429): {txt}")
-                    
-                    if r.status in (401, 403):
-                        # Stop immediately on explicit auth failure
-                        _LOGGER.error("Authentication failed: HTTP %s - %s", r.status, txt)
-                        raise TovalaAuthError(f"Invalid auth (HTTP {r.status}): {txt}")
-                    
-                    if r.status >= 400:
-                        last_err = TovalaApiError(f"Login failed (HTTP {r.status}): {txt}")
-                        _LOGGER.warning("Login failed for %s: %s", base, last_err)
-                        continue
-                    
-                    data = await r.json()
-                    _LOGGER.debug("Login JSON response keys: %s", list(data.keys()))
+        try:
+            timeout = ClientTimeout(total=self._policies["login"].timeout)
+            async with self._session.post(
+                url,
+                headers=headers,
+                json={"email": self._email, "password": self._password, "type": "user"},
+                timeout=timeout,
+            ) as r:
+                # Read once; decode only what is needed
+                body = await r.read()
+                stats.latency.observe(time.monotonic() - started)
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug("Login response from %s: status=%s, body=%s", base, r.status, _snippet(body))
 
-                # Support both 'token' and 'accessToken' response formats
-                token = data.get("token") or data.get("accessToken") or data.get("jwt")
-                if not token:
-                    last_err = TovalaAuthError("No token returned from getToken")
-                    _LOGGER.warning("No token in response from %s", base)
-                    continue
+                if r.status >= 400:
+                    stats.errors += 1
+                if r.status == 429:
+                    self.metrics["rate_limited"] += 1
+                    stats.rate_limited += 1
+                    txt = _snippet(body, 500)
+                    _LOGGER.error("Rate limited by Tovala API: %s", txt)
+                    raise TovalaApiError(f"Rate limited (HTTP 429): {txt}")
 
-                self._token = token
-                self._token_exp = int(time.time()) + int(data.get("expiresIn", 3600))
-                self._base = base
+                if r.status in (401, 403):
+                    txt = _snippet(body, 500)
+                    _LOGGER.error("Authentication failed: HTTP %s - %s", r.status, txt)
+                    raise TovalaAuthError(f"Invalid auth (HTTP {r.status}): {txt}")
 
-                # Extract userId from JWT token
-                self._user_id = self._decode_jwt_user_id(token)
-                if not self._user_id:
-                    _LOGGER.warning("Could not extract userId from token")
+                if r.status >= 500:
+                    health.record_failure()
+                    raise _RetryableError(
+                        f"Login failed (HTTP {r.status}): {_snippet(body, 500)}",
+                        parse_retry_after(r.headers.get("Retry-After")),
+                    )
+                if r.status >= 400:
+                    _LOGGER.warning("Login failed for %s: HTTP %s", base, r.status)
+                    raise TovalaApiError(f"Login failed (HTTP {r.status}): {_snippet(body, 500)}")
 
-                _LOGGER.info("Successfully logged in to %s (userId: %s)", base, self._user_id)
-                return
-                
-            except TovalaAuthError:
-                # Do not try other bases if credentials are wrong
-                raise
-            except TovalaApiError:
-                # Also stop on rate limits
-                raise
-            except ClientError as e:
-                last_err = e
-                _LOGGER.error("Connection error for %s: %s", base, str(e))
-                # Try next base
-            except Exception as e:
-                last_err = e
-                _LOGGER.error("Unexpected error for %s: %s", base, str(e), exc_info=True)
-                # Try next base
-
-        # If we reach here, all bases failed
-        _LOGGER.error("All login attempts failed. Last error: %s", last_err)
-        if isinstance(last_err, Exception):
-            raise TovalaApiError(f"Connection failed: {str(last_err)}")
-        raise TovalaApiError("Login failed")
+                data = _json_loads(body)
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug("Login JSON response keys: %s", list(data.keys()))
+        except (ClientError, asyncio.TimeoutError) as e:
+            health.record_failure()
+            stats.errors += 1
+            _LOGGER.error("Connection error for %s: %s", base, str(e))
+            raise
+        health.record_success(time.monotonic() - started)
+
+        # Support both 'token' and 'accessToken' response formats
+        token = data.get("token") or data.get("accessToken") or data.get("jwt")
+        if not token:
+            _LOGGER.warning("No token in response from %s", base)
+            raise TovalaAuthError("No token returned from getToken")
+        return base, token, data
 
     async def _auth_headers(self) -> Dict[str, str]:
         await self.login()
@@ -191,33 +621,321 @@ class TovalaClient:
             "X-Tovala-AppID": "MAPP",
         }
 
-    async def _get_json(self, path: str, **fmt) -> Any:
+    async def _throttle(self) -> None:
+        """Wait for the shared rate limiter and record any delay."""
+        waited = await self._rate_limiter.acquire()
+        if waited:
+            self.metrics["throttled_waits"] += 1
+            self.metrics["throttled_seconds"] += waited
+            _LOGGER.debug("Throttled for %.2fs by client-side rate limit", waited)
+
+    async def _get_json(
+        self,
+        path: str,
+        endpoint: str = "default",
+        conditional: bool = False,
+        parse: Optional[Callable[[Any], Any]] = None,
+        **fmt,
+    ) -> Any:
+        """GET a JSON document with the endpoint's retry policy applied.
+
+        parse, if given, turns the decoded JSON into the returned object.
+        With conditional=True the request carries If-None-Match /
+        If-Modified-Since from the previous response, and the previously
+        returned (parsed) object itself is returned again when the server
+        answers 304 or sends a byte-identical body. Callers must treat it as
+        read-only.
+
+        Requests go through the circuit breaker: while it is open they fail
+        fast with TovalaCircuitOpenError, and a request that still fails
+        after its retries counts towards opening it.
+        """
+        return await self._guarded(
+            endpoint,
+            lambda policy: self._get_json_once(
+                path, policy, endpoint=endpoint, conditional=conditional, parse=parse, **fmt
+            ),
+        )
+
+    async def _guarded(self, endpoint: str, send: Callable[[RequestPolicy], Awaitable[_T]]) -> _T:
+        """Run one request through the circuit breaker and the endpoint's retry policy."""
+        if not self.breaker.allow():
+            self.metrics["short_circuited"] += 1
+            raise TovalaCircuitOpenError(self.breaker.retry_in)
+        marker = _UNDER_BREAKER.set(True)
+        try:
+            result = await self._retrying(endpoint, send)
+        except _RetryableError:
+            self._record_breaker_failure()
+            raise
+        except BaseException:
+            # Answered with a client error, or cancelled: no verdict either way
+            self.breaker.release()
+            raise
+        finally:
+            _UNDER_BREAKER.reset(marker)
+        self.breaker.record_success()
+        return result
+
+    def _record_breaker_failure(self) -> None:
+        self.breaker.record_failure()
+        if not self.breaker.is_closed:
+            _LOGGER.warning("Tovala API failing; pausing requests for %.0fs", self.breaker.retry_in)
+
+    async def _retrying(self, endpoint: str, send: Callable[[RequestPolicy], Awaitable[_T]]) -> _T:
+        policy = self._policies.get(endpoint) or self._policies["default"]
+        attempt = 0
+        while True:
+            try:
+                return await send(policy)
+            except _RetryableError as err:
+                delay = policy.delay(attempt, err.retry_after)
+                if delay is None:
+                    raise
+                attempt += 1
+                self.metrics["retries"] += 1
+                _LOGGER.debug("Retrying %s (%s/%s) in %.2fs: %s",
+                              endpoint, attempt, policy.retries, delay, err)
+                await asyncio.sleep(delay)
+
+    async def _get_json_once(
+        self,
+        path: str,
+        policy: RequestPolicy,
+        endpoint: str = "default",
+        conditional: bool = False,
+        parse: Optional[Callable[[Any], Any]] = None,
+        _retry_auth: bool = True,
+        **fmt,
+    ) -> Any:
         if not self._base:
             # Ensure login determined the base URL
             await self.login()
         assert self._base, "Base URL not set after login"
         headers = await self._auth_headers()
-        url = f"{self._base}{path.format(**fmt)}"
+        sent_token = self._token
+        base = self._base
+        health = self._health[base]
+        path = path.format(**fmt)
+        url = f"{base}{path}"
         _LOGGER.debug("GET %s", url)
-        
+        rejected = False
+        failed: Optional[_RetryableError] = None
+
+        cached = self._conditional.get(path) if conditional else None
+        if cached is not None:
+            headers = dict(headers)
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        stats = self._stats(endpoint)
+        await self._throttle()
+        self.metrics["requests"] += 1
+        stats.requests += 1
+        started = time.monotonic()
         try:
-            timeout = ClientTimeout(total=10)
+            timeout = ClientTimeout(total=policy.timeout)
             async with self._session.get(url, headers=headers, timeout=timeout) as r:
-                txt = await r.text()
-                _LOGGER.debug("GET %s -> %s, body=%s", url, r.status, txt[:200])
-                
+                # Read once; decode only what is needed
+                body = await r.read()
+                stats.latency.observe(time.monotonic() - started)
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug("GET %s -> %s, body=%s", url, r.status, _snippet(body))
+
+                if r.status == 429:
+                    self.metrics["rate_limited"] += 1
+                    stats.rate_limited += 1
+                    failed = _RetryableError(
+                        f"Rate limited (HTTP 429): {_snippet(body, 500)}",
+                        parse_retry_after(r.headers.get("Retry-After")),
+                        host_fault=False,
+                    )
+                elif r.status >= 500:
+                    health.record_failure()
+                    failed = _RetryableError(
+                        f"HTTP {r.status}: {_snippet(body, 500)}",
+                        parse_retry_after(r.headers.get("Retry-After")),
+                    )
+                else:
+                    health.record_success(time.monotonic() - started)
+                if r.status == 304 and cached is not None:
+                    self.metrics["not_modified"] += 1
+                    stats.not_modified += 1
+                    return cached.data
                 if r.status == 404:
-                    raise TovalaApiError("not_found")
-                if r.status >= 400:
-                    raise TovalaApiError(f"HTTP {r.status}: {txt}")
-                try:
-                    return await r.json()
-                except Exception:
-                    # Some endpoints may return empty body
-                    return {}
-        except ClientError as e:
+                    stats.errors += 1
+                    raise _RejectedError("not_found", r.status)
+                if r.status == 401 and _retry_auth and self._email and self._password:
+                    # Token rejected (e.g. a stale one restored from storage): log in again once
+                    _LOGGER.info("Token rejected for %s, logging in again", url)
+                    rejected = True
+                elif failed is None and r.status >= 400:
+                    stats.errors += 1
+                    raise _RejectedError(f"HTTP {r.status}: {_snippet(body, 500)}", r.status)
+                elif failed is None:
+                    if conditional:
+                        digest = hashlib.blake2b(body, digest_size=16).digest()
+                        if cached is not None and cached.digest == digest:
+                            # Same bytes as last time: skip parsing entirely
+                            self.metrics["unchanged"] += 1
+                            stats.unchanged += 1
+                            return cached.data
+                    try:
+                        data = _json_loads(body)
+                    except ValueError:
+                        # Some endpoints may return empty body
+                        data = {}
+                    if parse is not None:
+                        data = parse(data)
+                    if conditional:
+                        self._conditional[path] = _CachedResponse(
+                            r.headers.get("ETag"), r.headers.get("Last-Modified"), digest, data
+                        )
+                    return data
+        except (ClientError, asyncio.TimeoutError) as e:
+            health.record_failure()
             _LOGGER.error("Connection error for %s: %s", url, str(e))
-            raise TovalaApiError(f"Connection failed: {str(e)}")
+            failed = _RetryableError(f"Connection failed: {str(e)}")
+
+        if failed is not None:
+            self.metrics["errors"] += 1
+            stats.errors += 1
+            if failed.host_fault:
+                # Retry against the next healthy base, if there is one
+                self._fail_over(base)
+            raise failed
+
+        if rejected:
+            if self._token == sent_token:
+                # Another caller may already have replaced the token
+                self.invalidate_token()
+            return await self._get_json_once(
+                path, policy, endpoint=endpoint, conditional=conditional, parse=parse, _retry_auth=False
+            )
+
+    async def _open_stream(
+        self,
+        path: str,
+        policy: RequestPolicy,
+        endpoint: str = "default",
+        params: Optional[Dict[str, str]] = None,
+        _retry_auth: bool = True,
+    ) -> ClientResponse:
+        """Send a GET and return the response unread once it has an OK status.
+
+        Errors are classified exactly like _get_json_once. The caller owns
+        the returned response and must release or close it.
+        """
+        if not self._base:
+            await self.login()
+        assert self._base, "Base URL not set after login"
+        headers = await self._auth_headers()
+        sent_token = self._token
+        base = self._base
+        health = self._health[base]
+        url = f"{base}{path}"
+        _LOGGER.debug("GET %s (streamed) %s", url, params or "")
+        failed: Optional[_RetryableError] = None
+
+        stats = self._stats(endpoint)
+        await self._throttle()
+        self.metrics["requests"] += 1
+        stats.requests += 1
+        started = time.monotonic()
+        try:
+            # Bound connecting and each read, not the whole body: the consumer sets the pace
+            timeout = ClientTimeout(total=None, sock_connect=policy.timeout, sock_read=policy.timeout)
+            r = await self._session.get(url, headers=headers, params=params, timeout=timeout)
+            if r.status < 400:
+                stats.latency.observe(time.monotonic() - started)
+                health.record_success(time.monotonic() - started)
+                return r
+            async with r:
+                body = await r.read()
+            stats.latency.observe(time.monotonic() - started)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("GET %s -> %s, body=%s", url, r.status, _snippet(body))
+
+            if r.status == 429:
+                self.metrics["rate_limited"] += 1
+                stats.rate_limited += 1
+                failed = _RetryableError(
+                    f"Rate limited (HTTP 429): {_snippet(body, 500)}",
+                    parse_retry_after(r.headers.get("Retry-After")),
+                    host_fault=False,
+                )
+            elif r.status >= 500:
+                health.record_failure()
+                failed = _RetryableError(
+                    f"HTTP {r.status}: {_snippet(body, 500)}",
+                    parse_retry_after(r.headers.get("Retry-After")),
+                )
+            else:
+                health.record_success(time.monotonic() - started)
+            if r.status == 404:
+                stats.errors += 1
+                raise _RejectedError("not_found", r.status)
+            if r.status == 401 and _retry_auth and self._email and self._password:
+                # Token rejected: log in again once, below
+                _LOGGER.info("Token rejected for %s, logging in again", url)
+            elif failed is None:
+                stats.errors += 1
+                raise _RejectedError(f"HTTP {r.status}: {_snippet(body, 500)}", r.status)
+        except (ClientError, asyncio.TimeoutError) as e:
+            health.record_failure()
+            _LOGGER.error("Connection error for %s: %s", url, str(e))
+            failed = _RetryableError(f"Connection failed: {str(e)}")
+
+        if failed is not None:
+            self.metrics["errors"] += 1
+            stats.errors += 1
+            if failed.host_fault:
+                self._fail_over(base)
+            raise failed
+
+        if self._token == sent_token:
+            self.invalidate_token()
+        return await self._open_stream(path, policy, endpoint=endpoint, params=params, _retry_auth=False)
+
+    async def _stream_json_array(
+        self, path: str, endpoint: str = "default", params: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[Any]:
+        """GET a JSON array and yield its elements as the body arrives.
+
+        The breaker and retry policy apply until the response status is
+        known; after that a failure is raised rather than retried, since
+        elements may already have been handed out. Closing the generator
+        early (aclosing / break) drops the connection, so the rest of the
+        body is never downloaded or parsed.
+        """
+        response = await self._guarded(
+            endpoint, lambda policy: self._open_stream(path, policy, endpoint=endpoint, params=params)
+        )
+        parser = JsonArrayParser()
+        decode = codecs.getincrementaldecoder("utf-8")(errors="replace").decode
+        try:
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                for element in parser.feed(decode(chunk)):
+                    yield element
+                if parser.done:
+                    break
+            else:
+                parser.feed(decode(b"", final=True))
+                parser.close()
+        except (ClientError, asyncio.TimeoutError) as e:
+            self.metrics["errors"] += 1
+            self._stats(endpoint).errors += 1
+            raise TovalaApiError(f"Connection failed while reading {path}: {e}") from e
+        except ValueError as e:
+            self._stats(endpoint).errors += 1
+            raise TovalaApiError(f"Malformed response from {path}: {e}") from e
+        finally:
+            if response.content.at_eof():
+                response.release()
+            else:
+                response.close()
 
     async def list_ovens(self) -> List[Dict[str, Any]]:
         """Get user's ovens list."""
@@ -228,42 +946,71 @@ class TovalaClient:
 
         try:
             path = f"/v0/users/{self._user_id}/ovens"
-            data = await self._get_json(path)
+            data = await self._get_json(path, endpoint="ovens")
             _LOGGER.debug("Ovens endpoint returned: %s", data)
 
             if isinstance(data, list):
                 _LOGGER.info("Found %d ovens", len(data))
-                if data:
+                if data and _LOGGER.isEnabledFor(logging.DEBUG):
                     _LOGGER.debug("First oven object keys: %s", list(data[0].keys()) if data[0] else "empty")
                 return data
             else:
                 _LOGGER.warning("Unexpected ovens response format: %s", type(data))
                 return []
+        except TovalaCircuitOpenError:
+            raise
         except Exception as e:
             _LOGGER.error("Failed to list ovens: %s", e, exc_info=True)
             raise TovalaApiError(f"Failed to list ovens: {str(e)}")
 
-    async def oven_status(self, oven_id: str) -> Dict[str, Any]:
-        """Fetch oven cooking status."""
+    async def oven_status(self, oven_id: str) -> OvenStatus:
+        """Fetch oven cooking status.
+
+        Conditional: when nothing changed since the last call the same
+        OvenStatus object is returned again, so callers can detect that with ``is`` and
+        must not mutate it. Concurrent callers for one oven share a single
+        request. (Config entries on one account share a single poller, so
+        each oven is only polled once per cycle to begin with.)
+        """
         if not oven_id:
             _LOGGER.warning("oven_status called with empty oven_id")
-            return {}
+            return OvenStatus()
 
         if not self._user_id:
             raise TovalaApiError("No user_id available - login first")
 
+        # Callers asking for the same oven while a request is out share it
+        task = self._status_inflight.get(oven_id)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_oven_status(oven_id))
+            self._status_inflight[oven_id] = task
+            task.add_done_callback(lambda done: self._status_done(oven_id, done))
+        else:
+            self.metrics["shared"] += 1
+        return await asyncio.shield(task)
+
+    def _status_done(self, oven_id: str, task: asyncio.Future) -> None:
+        self._status_inflight.pop(oven_id, None)
+        if not task.cancelled():
+            task.exception()  # mark it retrieved even if every caller was cancelled
+
+    async def _fetch_oven_status(self, oven_id: str) -> OvenStatus:
         _LOGGER.debug("Fetching status for oven %s (user %s)", oven_id, self._user_id)
 
         try:
             path = f"/v0/users/{self._user_id}/ovens/{oven_id}/cook/status"
-            data = await self._get_json(path)
-            _LOGGER.debug("Status endpoint returned: %s", data)
-            return data
+            status = await self._get_json(
+                path, endpoint="status", conditional=True, parse=OvenStatus.from_api
+            )
+            _LOGGER.debug("Status endpoint returned state=%s barcode=%s", status.state, status.barcode)
+            return status
+        except TovalaCircuitOpenError:
+            raise
         except Exception as e:
             _LOGGER.error("Failed to fetch oven status: %s", e, exc_info=True)
             raise TovalaApiError(f"Failed to fetch oven status: {str(e)}")
 
-    async def meal_details(self, meal_id: str) -> Optional[Dict[str, Any]]:
+    async def meal_details(self, meal_id: str) -> Optional[Meal]:
         """Fetch meal details by ID."""
         if not meal_id:
             _LOGGER.warning("meal_details called with empty meal_id")
@@ -276,19 +1023,102 @@ class TovalaClient:
 
         try:
             path = f"/v1/users/{self._user_id}/meals/{meal_id}"
-            data = await self._get_json(path)
+            data = await self._get_json(path, endpoint="meal")
             _LOGGER.debug("Meal details endpoint returned: %s", data)
 
             # Response format: {"meal": {...}}
             if isinstance(data, dict) and "meal" in data:
-                return data["meal"]
-            return data
+                return Meal.from_api(data["meal"])
+            return Meal.from_api(data)
         except Exception as e:
             _LOGGER.warning("Failed to fetch meal details for meal_id %s: %s", meal_id, e)
             return None
 
-    async def cooking_history(self, oven_id: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Fetch cooking history for an oven."""
+    async def iter_cooking_history(
+        self,
+        oven_id: str,
+        limit: Optional[int] = None,
+        since: Optional[datetime] = None,
+        page_size: int = HISTORY_PAGE_SIZE,
+    ) -> AsyncIterator[HistoryEntry]:
+        """Yield an oven's cooking history, most recent first, as it is downloaded.
+
+        Stops after limit entries, or at the first entry that started at or
+        before since, without reading the rest. History is requested in
+        pages with limit/offset, page_size entries first and twice as many
+        each time after, so short reads stay one small request while a full
+        read takes a handful. A server that ignores paging sends its whole
+        history in the first response, which is then streamed the same way;
+        one that rejects it with a 4xx is asked once more without it. Either
+        way later calls stop asking for pages.
+        Use contextlib.aclosing when not consuming it to the end.
+        """
+        if not oven_id:
+            _LOGGER.warning("iter_cooking_history called with empty oven_id")
+            return
+        if not self._user_id:
+            raise TovalaApiError("No user_id available - login first")
+        if limit is not None and limit <= 0:
+            return
+
+        path = f"/v0/users/{self._user_id}/ovens/{oven_id}/cook/history"
+        page = max(1, page_size)
+        paged = self._history_paging
+        offset = 0  # raw entries received in earlier pages
+        skip = 0  # entries already yielded, when starting over without paging
+        yielded = 0
+        head = None  # identity of the very first entry
+        while True:
+            want = page if limit is None else min(page, limit - yielded)
+            params = {"limit": str(want), "offset": str(offset)} if paged else None
+            received = 0
+            repeated = False
+            try:
+                async with aclosing(self._stream_json_array(path, endpoint="history", params=params)) as items:
+                    async for item in items:
+                        received += 1
+                        if received <= skip:
+                            continue
+                        key = (item.get("barcode"), item.get("start_time")) if isinstance(item, dict) else None
+                        if received == 1:
+                            if offset and key == head:
+                                repeated = True  # offset ignored: the first page came back again
+                                break
+                            if not offset:
+                                head = key
+                        entry = HistoryEntry.from_api(item)
+                        if entry is None:
+                            continue
+                        if since is not None and entry.start_time is not None and entry.start_time <= since:
+                            return
+                        yield entry
+                        yielded += 1
+                        if limit is not None and yielded >= limit:
+                            return
+            except _RejectedError as err:
+                if not paged or err.status in (401, 403):
+                    raise
+                # limit/offset themselves may be what the server refuses:
+                # ask once more without them, skipping what was already read
+                _LOGGER.debug("History endpoint rejected paging (HTTP %s); streaming it whole from now on", err.status)
+                self._history_paging = paged = False
+                skip, offset = offset, 0
+                continue
+
+            if paged and (repeated or received > want):
+                _LOGGER.debug("History endpoint ignores paging; streaming it whole from now on")
+                self._history_paging = paged = False
+                if repeated:
+                    # Start over in one response, skipping what was already read
+                    skip, offset = offset, 0
+                    continue
+            if not paged or received < want:
+                return
+            offset += received
+            page *= 2
+
+    async def cooking_history(self, oven_id: str, limit: Optional[int] = 10) -> List[HistoryEntry]:
+        """Fetch cooking history for an oven (everything the API returns when limit is None)."""
         if not oven_id:
             _LOGGER.warning("cooking_history called with empty oven_id")
             return []
@@ -299,14 +1129,12 @@ class TovalaClient:
         _LOGGER.debug("Fetching cooking history for oven %s (user %s)", oven_id, self._user_id)
 
         try:
-            path = f"/v0/users/{self._user_id}/ovens/{oven_id}/cook/history"
-            data = await self._get_json(path)
-            _LOGGER.debug("Cooking history endpoint returned: %s entries", len(data) if isinstance(data, list) else "unknown")
-
-            if isinstance(data, list):
-                # Return limited results (most recent first)
-                return data[:limit]
-            return []
+            async with aclosing(self.iter_cooking_history(oven_id, limit=limit)) as entries:
+                history = [entry async for entry in entries]
+            _LOGGER.debug("Cooking history endpoint returned %s entries", len(history))
+            return history
+        except TovalaCircuitOpenError:
+            raise
         except Exception as e:
             _LOGGER.warning("Failed to fetch cooking history: %s", e)
-            return []
\ No newline at end of file
+            raise TovalaApiError(f"Failed to fetch cooking history: {str(e)}")
\ No newline at end of file
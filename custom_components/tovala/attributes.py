@@ -0,0 +1,97 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+
+from .models import HistoryEntry, Meal, OvenStatus
+
+# Large, static attributes kept on the entity but out of recorder history
+REMAINING_UNRECORDED_ATTRIBUTES = frozenset(
+    {"meal_subtitle", "meal_image", "meal_image_local", "meal_ingredients"}
+)
+LAST_COOK_UNRECORDED_ATTRIBUTES = frozenset({"recent_history"})
+
+# Served from the local meal image cache with long-lived cache headers
+MEAL_IMAGE_LOCAL_URL = "/api/tovala/meal_image/{meal_id}"
+
+
+def meal_attributes(meal: Optional[Meal]) -> Dict[str, Any]:
+    """Attributes derived from a meal's details."""
+    if meal is None:
+        return {}
+
+    attrs = {
+        "meal_id": meal.id,
+        "meal_title": meal.title,
+        "meal_subtitle": meal.subtitle,
+    }
+
+    # First image URL, if available
+    if meal.image_url:
+        attrs["meal_image"] = meal.image_url
+        if str(meal.id).isdigit():
+            attrs["meal_image_local"] = MEAL_IMAGE_LOCAL_URL.format(meal_id=meal.id)
+
+    # Ingredients
+    if meal.ingredients:
+        attrs["meal_ingredients"] = meal.ingredients
+
+    return attrs
+
+
+def status_attributes(status: Optional[OvenStatus], meal_attrs: Dict[str, Any]) -> Dict[str, Any]:
+    """Attributes for the remaining-time sensor from one oven's status."""
+    if status is None:
+        return {}
+
+    attrs = {}
+
+    # Cooking state
+    if status.state:
+        attrs["cooking_state"] = status.state
+
+    # Barcode
+    if status.barcode:
+        attrs["barcode"] = status.barcode
+
+    # Meal details (if available)
+    attrs.update(meal_attrs)
+
+    # End time (if cooking)
+    if status.estimated_end_time:
+        attrs["estimated_end_time"] = status.estimated_end_time
+
+    return attrs
+
+
+def last_cook_value(history: List[HistoryEntry]) -> str:
+    """Return the last cook barcode or meal name."""
+    if not history:
+        return "No history"
+
+    last = history[0]
+
+    # If there's a meal_id, try to show something more meaningful
+    if last.meal_id:
+        return f"Meal #{last.meal_id}"
+
+    return last.barcode or "Unknown"
+
+
+def history_attributes(history: List[HistoryEntry]) -> Dict[str, Any]:
+    """Return cooking history as attributes."""
+    if not history:
+        return {}
+
+    last = history[0].as_dict()
+    attrs = {
+        # Last cook details
+        "last_cook_barcode": last["barcode"],
+        "last_cook_meal_id": last["meal_id"],
+        "last_cook_start_time": last["start_time"],
+        "last_cook_end_time": last["end_time"],
+        "last_cook_status": last["status"],
+    }
+
+    # Recent history (up to 10 most recent)
+    attrs["recent_history"] = [cook.as_dict() for cook in history[:10]]
+
+    return attrs
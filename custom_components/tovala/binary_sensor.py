@@ -3,30 +3,29 @@ from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySen
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN
 from .coordinator import TovalaCoordinator
+from .entity import TovalaEntity
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, add_entities: AddEntitiesCallback):
-    coord: TovalaCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-    add_entities([TovalaTimerRunningBinarySensor(coord)])
+    data = hass.data[DOMAIN][entry.entry_id]
+    coord: TovalaCoordinator = data["coordinator"]
+    add_entities([TovalaTimerRunningBinarySensor(coord, oven_id) for oven_id in data["ovens"]])
 
-class TovalaTimerRunningBinarySensor(CoordinatorEntity[TovalaCoordinator], BinarySensorEntity):
-    _attr_name = "Tovala Timer Running"
+class TovalaTimerRunningBinarySensor(TovalaEntity[TovalaCoordinator], BinarySensorEntity):
     _attr_device_class = BinarySensorDeviceClass.RUNNING
     _attr_icon = "mdi:timer-sand"
 
-    def __init__(self, coordinator: TovalaCoordinator):
-        super().__init__(coordinator)
-        self._attr_unique_id = f"tovala_{coordinator.oven_id}_timer_running"
+    def __init__(self, coordinator: TovalaCoordinator, oven_id: str):
+        super().__init__(coordinator, oven_id, "timer_running", "Timer Running")
 
     @property
     def is_on(self) -> bool:
-        if not self.coordinator.data:
-            return False
-        remaining = int(self.coordinator.data.get("remaining") or self.coordinator.data.get("time_remaining") or 0)
-        return remaining > 0
+        return self.coordinator.remaining(self.oven_id) > 0
 
     @property
-    def available(self) -> bool:
-        return self.coordinator.last_update_success
\ No newline at end of file
+    def extra_state_attributes(self):
+        return self._stale_attributes()
+
+    def _state_snapshot(self) -> tuple:
+        return (self.available, self.is_on, self.stale_since)
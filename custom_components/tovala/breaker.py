@@ -0,0 +1,98 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, Optional
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = 3  # consecutive failed requests before opening
+DEFAULT_RESET_TIMEOUT = 30.0  # seconds until the first probe
+DEFAULT_MAX_RESET_TIMEOUT = 900.0  # probe at least this often while the cloud is down
+
+
+class CircuitBreaker:
+    """Stop calling a failing API, probing it less and less often.
+
+    Closed: requests flow and consecutive failures are counted. After
+    failure_threshold of them the breaker opens and requests are refused
+    without touching the network. Once the reset timeout has passed one
+    probe is let through (half-open): success closes the breaker, failure
+    reopens it with the timeout doubled, up to max_reset_timeout.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        max_reset_timeout: float = DEFAULT_MAX_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._threshold = max(1, failure_threshold)
+        self._reset_timeout = reset_timeout
+        self._max_reset_timeout = max(reset_timeout, max_reset_timeout)
+        self._clock = clock
+        self.state = CLOSED
+        self.failures = 0  # consecutive
+        self.opened = 0  # times the breaker has opened
+        self.rejected = 0  # requests refused while open
+        self._timeout = reset_timeout
+        self._retry_at = 0.0
+
+    @property
+    def is_closed(self) -> bool:
+        return self.state == CLOSED
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed (0 when closed)."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self._retry_at - self._clock())
+
+    def allow(self) -> bool:
+        """Whether a request may go out now. Open -> half-open lets one probe through."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and self._clock() >= self._retry_at:
+            self.state = HALF_OPEN
+            return True
+        # Open and waiting, or a probe is already in flight
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self._timeout = self._reset_timeout
+
+    def release(self) -> None:
+        """A request ended without telling us anything about the API (cancelled,
+        or refused before it was sent). Lets the next caller probe instead."""
+        if self.state == HALF_OPEN:
+            self.state = OPEN
+            self._retry_at = self._clock()
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN:
+            # The probe failed: back off further
+            self._timeout = min(self._max_reset_timeout, self._timeout * 2)
+            self._open()
+        elif self.state == CLOSED and self.failures >= self._threshold:
+            self._open()
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened += 1
+        self._retry_at = self._clock() + self._timeout
+
+    def as_dict(self) -> Dict[str, Any]:
+        retry_in: Optional[float] = round(self.retry_in, 1) if self.state == OPEN else None
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "retry_in": retry_in,
+        }
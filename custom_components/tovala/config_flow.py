@@ -2,27 +2,61 @@
 from __future__ import annotations
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from .const import DOMAIN, CONF_EMAIL, CONF_PASSWORD
+from .const import (
+    DOMAIN,
+    DATA_ACCOUNTS,
+    CONF_EMAIL,
+    CONF_PASSWORD,
+    CONF_COOKING_INTERVAL,
+    CONF_IDLE_INTERVAL,
+    CONF_MAX_IDLE_INTERVAL,
+    CONF_TICK_INTERVAL,
+    DEFAULT_COOKING_INTERVAL,
+    DEFAULT_IDLE_INTERVAL,
+    DEFAULT_MAX_IDLE_INTERVAL,
+    DEFAULT_TICK_INTERVAL,
+    MIN_SCAN_INTERVAL,
+)
+from .accounts import AccountRegistry, account_key
 from .api import TovalaClient, TovalaAuthError
 
 class TovalaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Tovala."""
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return TovalaOptionsFlow()
+
     async def async_step_user(self, user_input=None):
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            session = async_get_clientsession(self.hass)
-            client = TovalaClient(
-                session,
-                email=user_input[CONF_EMAIL],
-                password=user_input[CONF_PASSWORD],
+            registry: AccountRegistry = self.hass.data.setdefault(DOMAIN, {}).setdefault(
+                DATA_ACCOUNTS, AccountRegistry()
             )
+            key = account_key(user_input[CONF_EMAIL])
+            # An account that is already set up lends its client: no second login
+            registered = registry.get(key)
+            client = registered
+            if client is None or not client.has_credentials(
+                user_input[CONF_EMAIL], user_input[CONF_PASSWORD]
+            ):
+                client = TovalaClient(
+                    async_get_clientsession(self.hass),
+                    email=user_input[CONF_EMAIL],
+                    password=user_input[CONF_PASSWORD],
+                )
+            adopted = False
             try:
                 # Just verify auth for now; oven selection will be added later
                 await client.login()
+                if key is not None and client is not registered:
+                    # Hand the fresh token to the entry about to be set up
+                    adopted = registry.adopt(key, client)
                 return self.async_create_entry(
                     title="Tovala",
                     data={
@@ -35,6 +69,11 @@ class TovalaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             except Exception:
                 # Any other error: treat as connectivity/unknown for now
                 errors["base"] = "cannot_connect"
+            finally:
+                if client is not registered and not adopted:
+                    # Only used to check the credentials: stop its token renewal.
+                    # The registered client picks the new password up at setup.
+                    client.close()
 
         schema = vol.Schema(
             {
@@ -42,4 +81,76 @@ class TovalaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_PASSWORD): str,
             }
         )
-        return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
\ No newline at end of file
+        return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
+
+    async def async_step_reauth(self, entry_data):
+        """Tovala refused the stored password: ask for a new one."""
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(self, user_input=None):
+        errors: dict[str, str] = {}
+        entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
+
+        if user_input is not None:
+            client = TovalaClient(
+                async_get_clientsession(self.hass),
+                email=entry.data[CONF_EMAIL],
+                password=user_input[CONF_PASSWORD],
+            )
+            try:
+                await client.login()
+            except TovalaAuthError:
+                errors["base"] = "auth"
+            except Exception:
+                errors["base"] = "cannot_connect"
+            else:
+                # The reload hands the new password to the account's client
+                return self.async_update_reload_and_abort(
+                    entry, data={**entry.data, CONF_PASSWORD: user_input[CONF_PASSWORD]}
+                )
+            finally:
+                client.close()
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema({vol.Required(CONF_PASSWORD): str}),
+            description_placeholders={"email": entry.data[CONF_EMAIL]},
+            errors=errors,
+        )
+
+
+class TovalaOptionsFlow(config_entries.OptionsFlow):
+    """Configure Tovala poll intervals."""
+
+    async def async_step_init(self, user_input=None):
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            if user_input[CONF_MAX_IDLE_INTERVAL] < user_input[CONF_IDLE_INTERVAL]:
+                errors["base"] = "invalid_intervals"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        interval = vol.All(vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL, max=3600))
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_COOKING_INTERVAL,
+                    default=options.get(CONF_COOKING_INTERVAL, DEFAULT_COOKING_INTERVAL),
+                ): interval,
+                vol.Required(
+                    CONF_IDLE_INTERVAL,
+                    default=options.get(CONF_IDLE_INTERVAL, DEFAULT_IDLE_INTERVAL),
+                ): interval,
+                vol.Required(
+                    CONF_MAX_IDLE_INTERVAL,
+                    default=options.get(CONF_MAX_IDLE_INTERVAL, DEFAULT_MAX_IDLE_INTERVAL),
+                ): interval,
+                vol.Required(
+                    CONF_TICK_INTERVAL,
+                    default=options.get(CONF_TICK_INTERVAL, DEFAULT_TICK_INTERVAL),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=60)),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
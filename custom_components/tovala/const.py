@@ -1,9 +1,70 @@
 DOMAIN = "tovala"
-PLATFORMS = ["sensor", "binary_sensor"]
+PLATFORMS = ["sensor", "binary_sensor", "image"]
 CONF_EMAIL = "email"
 CONF_PASSWORD = "password"
 CONF_OVEN_ID = "oven_id"
+CONF_OVENS = "ovens"  # last discovered oven list, used to build entities before login
+CONF_COOKING_INTERVAL = "cooking_interval"
+CONF_IDLE_INTERVAL = "idle_interval"
+CONF_MAX_IDLE_INTERVAL = "max_idle_interval"
+CONF_TICK_INTERVAL = "tick_interval"
+
+# hass.data[DOMAIN] key holding the per-account client registry
+DATA_ACCOUNTS = "accounts"
+# hass.data[DOMAIN] key holding the meal image cache shared by all entries
+DATA_IMAGE_CACHE = "meal_images"
+# hass.data[DOMAIN] key holding the poll scheduler shared by all entries
+DATA_SCHEDULER = "scheduler"
 
 EVENT_TIMER_FINISHED = "tovala_timer_finished"
 
-DEFAULT_SCAN_INTERVAL = 10  # seconds
\ No newline at end of file
+STORAGE_VERSION = 1
+STORAGE_KEY_AUTH = f"{DOMAIN}.auth"  # suffixed with the config entry id
+STORAGE_KEY_MEALS = f"{DOMAIN}.meals"  # suffixed with the config entry id
+STORAGE_KEY_STATE = f"{DOMAIN}.state"  # suffixed with the config entry id
+STORAGE_KEY_STATS = f"{DOMAIN}.statistics"  # suffixed with the config entry id
+STATE_SAVE_DELAY = 30  # seconds; batches status snapshots written between polls
+
+DEFAULT_SCAN_INTERVAL = 10  # seconds
+
+# Adaptive polling (seconds). While cooking we poll at the cooking cadence and
+# aim one extra poll just past estimated_end_time; while idle the interval
+# starts at DEFAULT_IDLE_INTERVAL and backs off up to DEFAULT_MAX_IDLE_INTERVAL.
+DEFAULT_COOKING_INTERVAL = DEFAULT_SCAN_INTERVAL
+DEFAULT_IDLE_INTERVAL = 30
+DEFAULT_MAX_IDLE_INTERVAL = 120
+IDLE_BACKOFF_FACTOR = 2
+FINISH_WAKEUP_MARGIN = 1
+MIN_SCAN_INTERVAL = 1
+
+# Usage profile (cook starts per hour of the week, learned from history):
+# idle ovens poll at the idle interval in hours where a cook is likely and
+# at the maximum idle interval outside them. The token and meal cache are
+# warmed PREWARM_LEAD seconds before a likely hour starts.
+PREWARM_LEAD = 300
+# The token must still be valid this long into the window; background
+# renewal keeps it fresh after that
+PREWARM_TOKEN_MARGIN = 300
+PREWARM_MEALS = 5  # recent meals per oven fetched into the meal cache
+
+# Meals seen in recent history are fetched into the meal cache in the
+# background, so a new barcode is almost always a cache hit.
+MEAL_WARM_LIMIT = 20  # distinct recent meals per oven
+
+# Local countdown between polls (seconds); no API call per tick
+DEFAULT_TICK_INTERVAL = 1
+MAX_PARALLEL_REQUESTS = 4  # concurrent status requests per account
+
+# During a cloud outage entities keep the last good data (flagged with a
+# stale_since attribute) for this long before going unavailable.
+MAX_STALE_AGE = 6 * 3600  # seconds
+
+# Cooking history has its own slow cadence; a finished cook triggers an
+# extra refresh after HISTORY_REFRESH_DELAY so the new entry is picked up.
+DEFAULT_HISTORY_INTERVAL = 1800  # seconds
+HISTORY_REFRESH_DELAY = 30  # seconds
+HISTORY_BUFFER_SIZE = 50  # entries kept per oven
+
+# Long-term statistics import
+SERVICE_BACKFILL_STATISTICS = "backfill_statistics"
+DEFAULT_BACKFILL_PAGE_SIZE = 100
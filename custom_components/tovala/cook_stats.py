@@ -0,0 +1,93 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from .models import HistoryEntry, parse_time
+
+# statistic key -> (name suffix, unit)
+COOK_STATISTICS: Dict[str, tuple] = {
+    "cooks": ("cooks", None),
+    "cook_minutes": ("cook time", "min"),
+    "meal_cooks": ("meal cooks", None),
+    "manual_cooks": ("manual cooks", None),
+}
+
+
+def entry_values(entry: HistoryEntry, start: datetime, end: datetime) -> Dict[str, float]:
+    """Statistic increments contributed by one finished cook."""
+    meal = bool(entry.meal_id)
+    return {
+        "cooks": 1,
+        "cook_minutes": max(0.0, (end - start).total_seconds() / 60),
+        "meal_cooks": 1 if meal else 0,
+        "manual_cooks": 0 if meal else 1,
+    }
+
+
+class CookStatsAccumulator:
+    """Hourly, cumulative cook statistics for one oven with a high-water mark.
+
+    Only entries that started after the high-water mark are folded in, so
+    each history fetch costs O(new entries) however long the history is.
+    ``add`` returns the hourly rows to (re)write; the newest hour may be
+    rewritten when later cooks land in it.
+    """
+
+    def __init__(self, state: Optional[Dict[str, Any]] = None):
+        state = state or {}
+        self.high_water: Optional[datetime] = parse_time(state.get("high_water"))
+        self._last_hour: Optional[datetime] = parse_time(state.get("last_hour"))
+        # Cumulative sums up to and including _last_hour, and that hour's own values
+        self._sums: Dict[str, float] = {key: 0.0 for key in COOK_STATISTICS}
+        self._sums.update(state.get("sums") or {})
+        self._hour_values: Dict[str, float] = {key: 0.0 for key in COOK_STATISTICS}
+        self._hour_values.update(state.get("hour_values") or {})
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "high_water": self.high_water.isoformat() if self.high_water else None,
+            "last_hour": self._last_hour.isoformat() if self._last_hour else None,
+            "sums": dict(self._sums),
+            "hour_values": dict(self._hour_values),
+        }
+
+    def add(self, entries: Iterable[HistoryEntry]) -> Dict[str, List[Dict[str, Any]]]:
+        """Fold new finished cooks in. Returns statistic key -> rows (start, state, sum)."""
+        fresh = []
+        for entry in entries:
+            start = entry.start_time
+            if start is None or (self.high_water is not None and start <= self.high_water):
+                continue
+            fresh.append((start, entry))
+        fresh.sort(key=lambda item: item[0])
+
+        rows: Dict[str, List[Dict[str, Any]]] = {key: [] for key in COOK_STATISTICS}
+        dirty = False
+        for start, entry in fresh:
+            end = entry.end_time
+            if end is None:
+                # Still cooking: leave it and everything after it for the next pass
+                break
+            hour = start.replace(minute=0, second=0, microsecond=0)
+            if self._last_hour is None or hour > self._last_hour:
+                if dirty:
+                    self._emit(rows)
+                self._last_hour = hour
+                self._hour_values = {key: 0.0 for key in COOK_STATISTICS}
+            # Cooks can only land in the newest hour or a later one
+            for key, value in entry_values(entry, start, end).items():
+                self._hour_values[key] += value
+                self._sums[key] += value
+            self.high_water = start
+            dirty = True
+        if dirty:
+            self._emit(rows)
+        return rows
+
+    def _emit(self, rows: Dict[str, List[Dict[str, Any]]]) -> None:
+        for key in COOK_STATISTICS:
+            rows[key].append({
+                "start": self._last_hour,
+                "state": self._hour_values[key],
+                "sum": self._sums[key],
+            })
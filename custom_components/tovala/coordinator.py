@@ -1,128 +1,750 @@
 from __future__ import annotations
 from datetime import timedelta, datetime
-from typing import Any, Optional
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+import asyncio
 import logging
-import re
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, DEFAULT_SCAN_INTERVAL, EVENT_TIMER_FINISHED
+from .api import TovalaAuthError, TovalaCircuitOpenError
+from .const import (
+    DOMAIN,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_COOKING_INTERVAL,
+    DEFAULT_IDLE_INTERVAL,
+    DEFAULT_MAX_IDLE_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    DEFAULT_TICK_INTERVAL,
+    MAX_PARALLEL_REQUESTS,
+    DEFAULT_HISTORY_INTERVAL,
+    HISTORY_REFRESH_DELAY,
+    HISTORY_BUFFER_SIZE,
+    EVENT_TIMER_FINISHED,
+    STATE_SAVE_DELAY,
+    MAX_STALE_AGE,
+    PREWARM_LEAD,
+    PREWARM_TOKEN_MARGIN,
+    PREWARM_MEALS,
+    MEAL_WARM_LIMIT,
+)
+from .meal_cache import MealCache, MealWarmer
+from .metrics import LatencyHistogram
+from .models import HistoryEntry, Meal, OvenStatus
+from .schedule import PollSchedule
+from .scheduler import SLIP_BUCKETS_MS, PollScheduler, priority_for
+from .usage import UsageProfile
 
 _LOGGER = logging.getLogger(__name__)
 
+
+class OvenState:
+    """Per-oven runtime state kept between polls."""
+
+    def __init__(self, oven_id: str, name: Optional[str] = None):
+        self.oven_id = oven_id
+        self.name = name
+        self.last_reported_remaining: Optional[int] = None
+        self.last_meal_id: Optional[str] = None
+        self.cached_meal_details: Optional[Meal] = None
+        self.last_state: Optional[str] = None
+        self.interval: float = DEFAULT_SCAN_INTERVAL
+        self.next_poll: float = 0.0  # loop time this oven is next due
+        self.last_slip: Optional[float] = None  # seconds the last poll ran past its target
+        self.usage = UsageProfile(tz=dt_util.DEFAULT_TIME_ZONE)
+        self.end_time: Optional[datetime] = None
+        self.stale_since: Optional[datetime] = None  # first failed poll of the current outage
+
+
 class TovalaCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    def __init__(self, hass: HomeAssistant, client, oven_id: str):
+    """Poll every oven on one account in a single batched refresh.
+
+    ``data`` maps oven_id -> OvenStatus, the client's own (read-only)
+    object, so an unchanged payload leaves ``data`` identical.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client,
+        ovens: List[Dict[str, Any]],
+        cooking_interval: int = DEFAULT_COOKING_INTERVAL,
+        idle_interval: int = DEFAULT_IDLE_INTERVAL,
+        max_idle_interval: int = DEFAULT_MAX_IDLE_INTERVAL,
+        tick_interval: float = DEFAULT_TICK_INTERVAL,
+        max_parallel: int = MAX_PARALLEL_REQUESTS,
+        meal_cache: Optional[MealCache] = None,
+        store: Any = None,
+        scheduler: Optional[PollScheduler] = None,
+    ):
         super().__init__(
             hass,
             _LOGGER,  # Changed from hass.helpers.logger.getLogger(__name__)
             name=f"{DOMAIN}_coordinator",
             update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            # Listeners are only notified when the returned data differs
+            always_update=False,
         )
         self.client = client
-        self.oven_id = oven_id
-        self._last_reported_remaining = None
-        self._last_meal_id = None
-        self._cached_meal_details = None
+        self.meal_cache = meal_cache if meal_cache is not None else MealCache()
+        # Fetches meal details off the polling path, a few at a time
+        self.meal_warmer = MealWarmer(self.meal_cache, client.meal_details)
+        self._store = store  # last status per oven, restored before the first refresh
+        self.image_cache = None  # optional MealImageCache, prefetched on new meals
+        self.cached_images: set = set()  # meal ids whose image was cached this session
+        self.ovens: Dict[str, OvenState] = {}
+        for oven in ovens:
+            oven_id = oven.get("id")
+            if oven_id:
+                self.ovens[str(oven_id)] = OvenState(str(oven_id), oven.get("name"))
+        self._schedule = PollSchedule(cooking_interval, idle_interval, max_idle_interval)
+        self._tick_interval = timedelta(seconds=max(0.1, float(tick_interval)))
+        self._semaphore = asyncio.Semaphore(max(1, int(max_parallel)))
+        # Domain-wide pacing shared with every other entry's coordinator
+        self.scheduler = scheduler if scheduler is not None else PollScheduler()
+        self._unsub_tick = None
+        self.history_coordinator: Optional[TovalaHistoryCoordinator] = None
+        self._unsub_history_refresh = None
+        self._unsub_prewarm = None
+        # Instrumentation
+        self.refreshes = 0
+        self.refresh_latency = LatencyHistogram()
+        self.poll_slip = LatencyHistogram(SLIP_BUCKETS_MS)
+        self.effective_interval: Optional[float] = None  # EWMA of seconds between refreshes
+        self._last_refresh: Optional[float] = None
 
-    def _extract_meal_id(self, barcode: str) -> Optional[str]:
-        """Extract meal_id from barcode.
+    @property
+    def oven_ids(self) -> List[str]:
+        return list(self.ovens)
 
-        Tovala meal barcodes: "133A254|463|5E34BF80" or "133A254|13251|5E34BF80|A"
-        Manual modes: "manual-mini-toast-4", "Bake at 400° for 15:00"
-        """
-        if not barcode:
+    def oven_data(self, oven_id: str) -> Optional[OvenStatus]:
+        """Return the last parsed status for one oven (None if unknown)."""
+        if not self.data:
             return None
+        return self.data.get(oven_id)
+
+    def stale_since(self, oven_id: str) -> Optional[datetime]:
+        """When polling this oven started failing, if its data is being served stale."""
+        oven = self.ovens.get(oven_id)
+        return oven.stale_since if oven is not None else None
+
+    def meal(self, oven_id: str) -> Optional[Meal]:
+        """The current meal, or the last one after cooking ends."""
+        oven = self.ovens.get(oven_id)
+        return oven.cached_meal_details if oven is not None else None
+
+    def remaining(self, oven_id: str) -> int:
+        """Seconds left on an oven's current cook, interpolated from the local clock."""
+        oven = self.ovens.get(oven_id)
+        if oven is not None and oven.end_time is not None:
+            return max(0, int((oven.end_time - dt_util.utcnow()).total_seconds()))
+        return 0
+
+    def status_payload(self, oven_id: str) -> Dict[str, Any]:
+        """One oven's status as a plain dict, with remaining time and meal."""
+        status = self.oven_data(oven_id)
+        data = status.as_dict() if status is not None else {}
+        data["remaining"] = self.remaining(oven_id)
+        meal = self.meal(oven_id)
+        if meal is not None:
+            data["meal"] = meal.as_dict()
+        return data
+
+    def _check_timer_finished(self, oven: OvenState, remaining: int, offline: bool = False) -> None:
+        """Fire EVENT_TIMER_FINISHED once when remaining crosses to 0."""
+        if (oven.last_reported_remaining and oven.last_reported_remaining > 0) and remaining == 0:
+            _LOGGER.info("Timer finished for oven %s", oven.oven_id)
+            self.hass.bus.async_fire(EVENT_TIMER_FINISHED, {
+                "oven_id": oven.oven_id,
+                "data": self.status_payload(oven.oven_id),
+                "finished_offline": offline,
+            })
+            self._schedule_history_refresh()
+            self._save_state()
+        oven.last_reported_remaining = remaining
+
+    def _schedule_history_refresh(self) -> None:
+        """Refresh cooking history shortly after a cook ends."""
+        if self.history_coordinator is None or self._unsub_history_refresh is not None:
+            return
+
+        @callback
+        def _refresh(_now: datetime) -> None:
+            self._unsub_history_refresh = None
+            self.hass.async_create_task(self.history_coordinator.async_request_refresh())
+
+        self._unsub_history_refresh = async_call_later(self.hass, HISTORY_REFRESH_DELAY, _refresh)
+
+    def _update_ticker(self) -> None:
+        """Run the local countdown only while some oven has an end time to count to."""
+        counting = any(
+            oven.end_time is not None and self.remaining(oven.oven_id) > 0
+            for oven in self.ovens.values()
+        )
+        if counting:
+            if self._unsub_tick is None:
+                self._unsub_tick = async_track_time_interval(
+                    self.hass, self._async_tick, self._tick_interval
+                )
+        elif self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+
+    @callback
+    def _async_tick(self, _now: datetime) -> None:
+        """Recompute remaining time locally; no API call."""
+        finished = False
+        for oven in self.ovens.values():
+            if oven.end_time is None:
+                continue
+            remaining = self.remaining(oven.oven_id)
+            self._check_timer_finished(oven, remaining)
+            finished = finished or remaining == 0
+        self.async_update_listeners()
+        if finished:
+            self._update_ticker()
 
-        # Try to extract meal ID from Tovala barcode format
-        parts = barcode.split("|")
-        if len(parts) >= 2:
-            potential_meal_id = parts[1]
-            # Check if it's numeric (meal IDs are numeric)
-            if potential_meal_id.isdigit():
-                return potential_meal_id
+    async def async_shutdown(self) -> None:
+        """Stop the local countdown along with the coordinator."""
+        if self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+        if self._unsub_history_refresh is not None:
+            self._unsub_history_refresh()
+            self._unsub_history_refresh = None
+        if self._unsub_prewarm is not None:
+            self._unsub_prewarm()
+            self._unsub_prewarm = None
+        self.meal_warmer.close()
+        await super().async_shutdown()
 
-        return None
+    def _schedule_next_poll(self, now: float) -> None:
+        """Set update_interval to the soonest poll any oven wants."""
+        seconds = min(
+            (oven.next_poll - now for oven in self.ovens.values()),
+            default=DEFAULT_SCAN_INTERVAL,
+        )
+        seconds = max(MIN_SCAN_INTERVAL, seconds)
+        interval = timedelta(seconds=seconds)
+        if interval != self.update_interval:
+            _LOGGER.debug("Next poll in %.0fs", seconds)
+            self.update_interval = interval
+
+    def _set_meal(self, oven: OvenState, meal_id: str, meal: Meal) -> None:
+        oven.cached_meal_details = meal
+        _LOGGER.info("Meal details for oven %s: %s", oven.oven_id, meal.title)
+        self._prefetch_image(meal_id, meal)
+
+    @callback
+    def _meal_arrived(self, oven: OvenState, meal_id: str, future: asyncio.Future) -> None:
+        """Details for a meal that missed the cache came in from the warmer."""
+        if oven.last_meal_id != meal_id:
+            return  # the oven has moved on to something else
+        meal = None if future.cancelled() else future.result()
+        if meal is None:
+            _LOGGER.warning("Failed to fetch meal details for meal_id %s", meal_id)
+            oven.last_meal_id = None  # try again on the next poll
+            return
+        self._set_meal(oven, meal_id, meal)
+        self._save_state()
+        self.async_update_listeners()
+
+    def _warm_recent_meals(self, limit: int) -> None:
+        """Queue meals from recent history for background fetching."""
+        meal_ids = [
+            meal_id
+            for oven_id in self.ovens
+            for meal_id in self._recent_meal_ids(oven_id, limit)
+            if meal_id not in self.meal_cache
+        ]
+        if meal_ids:
+            _LOGGER.debug("Warming %d meal(s) from cooking history", len(meal_ids))
+            self.hass.async_create_background_task(
+                self.meal_warmer.async_warm(meal_ids), f"{DOMAIN}_meal_warmer"
+            )
+
+    async def async_restore(self) -> None:
+        """Seed data and per-oven runtime state from the last run.
+
+        Entities start from the last known status and meal, and a cook that
+        ended while Home Assistant was down still fires EVENT_TIMER_FINISHED.
+        """
+        if self._store is None:
+            return
+        stored = await self._store.async_load() or {}
+        saved_status = stored.get("status", {})
+        saved_ovens = stored.get("ovens", {})
+        status: Dict[str, OvenStatus] = {}
+        finished: List[OvenState] = []
+        for oven_id, oven in self.ovens.items():
+            data = saved_status.get(oven_id)
+            data = OvenStatus.from_api(data) if isinstance(data, dict) else None
+            saved = saved_ovens.get(oven_id) or {}
+            oven.usage = UsageProfile(saved.get("usage"), dt_util.DEFAULT_TIME_ZONE)
+            oven.last_state = saved.get("state") or (data.state if data else None)
+            end_time = saved.get("end_time")
+            oven.end_time = dt_util.parse_datetime(end_time) if end_time else (
+                data.end_time if data else None
+            )
+
+            # Meal details come back from the meal cache; only the id is stored
+            oven.last_meal_id = saved.get("meal_id")
+            if oven.last_meal_id and oven.last_meal_id in self.meal_cache:
+                oven.cached_meal_details = self.meal_cache.get(oven.last_meal_id)
+            elif oven.last_meal_id and oven.last_meal_id.isdigit():
+                oven.last_meal_id = None  # evicted: fetch it again on the next poll
+
+            remaining = self.remaining(oven_id)
+            oven.last_reported_remaining = saved.get("remaining")
+            if oven.last_reported_remaining and remaining == 0:
+                finished.append(oven)
+            else:
+                oven.last_reported_remaining = remaining
+
+            if data is not None:
+                status[oven_id] = data
+
+        if status:
+            _LOGGER.debug("Restored last known status for %d oven(s)", len(status))
+            self.data = status
+        for oven in finished:
+            _LOGGER.info("Oven %s finished cooking while offline", oven.oven_id)
+            self._check_timer_finished(oven, 0, offline=True)
+        self._update_ticker()
+        self._schedule_prewarm()
+
+    def _save_state(self) -> None:
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_save, STATE_SAVE_DELAY)
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Compact runtime state: status without meal payloads, plus per-oven bookkeeping."""
+        status = {}
+        ovens = {}
+        for oven_id, oven in self.ovens.items():
+            data = self.oven_data(oven_id)
+            if data is not None:
+                status[oven_id] = data.as_dict()
+            ovens[oven_id] = {
+                "state": oven.last_state,
+                "remaining": oven.last_reported_remaining,
+                "meal_id": oven.last_meal_id,
+                "end_time": oven.end_time.isoformat() if oven.end_time else None,
+                "usage": oven.usage.as_dict(),
+            }
+        return {"status": status, "ovens": ovens}
+
+    @property
+    def current_interval(self) -> float:
+        """Seconds until the coordinator's next scheduled refresh."""
+        return self.update_interval.total_seconds() if self.update_interval else 0.0
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """Poll cadence, refresh latency and cache counters for diagnostics."""
+        cache = self.meal_cache
+        return {
+            "current_interval": self.current_interval,
+            "effective_interval": None if self.effective_interval is None else round(self.effective_interval, 1),
+            "refreshes": self.refreshes,
+            "refresh_latency": self.refresh_latency.as_dict(),
+            "poll_slip": self.poll_slip.as_dict(),
+            "last_update_success": self.last_update_success,
+            "ovens": {
+                oven.oven_id: {
+                    "state": oven.last_state,
+                    "interval": oven.interval,
+                    "remaining": self.remaining(oven.oven_id),
+                    "stale_since": oven.stale_since.isoformat() if oven.stale_since else None,
+                    "last_slip": None if oven.last_slip is None else round(oven.last_slip, 2),
+                    "usage": {
+                        "cooks": oven.usage.total,
+                        "learning": not oven.usage.ready,
+                        "likely_now": oven.usage.ready and oven.usage.likely(dt_util.utcnow()),
+                    },
+                }
+                for oven in self.ovens.values()
+            },
+            "meal_cache": {
+                "size": len(cache),
+                "hits": cache.hits,
+                "misses": cache.misses,
+                "hit_rate": cache.hit_rate,
+                "warmed": self.meal_warmer.fetched,
+                "warm_failed": self.meal_warmer.failed,
+                "warm_queued": self.meal_warmer.queued,
+            },
+        }
+
+    def _prefetch_image(self, meal_id: str, meal: Meal) -> None:
+        """Download the meal image into the local cache off the polling path."""
+        url = meal.image_url
+        if self.image_cache is None or not url:
+            return
+        self.hass.async_create_background_task(
+            self._async_prefetch_image(meal_id, url), f"tovala_meal_image_{meal_id}"
+        )
+
+    async def _async_prefetch_image(self, meal_id: str, url: str) -> None:
+        if await self.image_cache.async_fetch(meal_id, url) is not None:
+            # Let the image entity pick up the cached copy
+            self.cached_images.add(meal_id)
+            self.async_update_listeners()
 
     async def _async_update_data(self) -> dict:
-        if not self.oven_id:
+        started = self.hass.loop.time()
+        if self._last_refresh is not None:
+            gap = started - self._last_refresh
+            self.effective_interval = (
+                gap if self.effective_interval is None else 0.8 * self.effective_interval + 0.2 * gap
+            )
+        self._last_refresh = started
+        self.refreshes += 1
+        try:
+            return await self._async_poll_ovens()
+        finally:
+            self.refresh_latency.observe(self.hass.loop.time() - started)
+
+    async def _async_poll_ovens(self) -> dict:
+        if not self.ovens:
             # Return empty data if we don't have an oven yet
-            _LOGGER.warning("No oven_id configured yet")
+            _LOGGER.warning("No ovens configured yet")
             return {}
-        
+
+        # Only poll ovens whose own schedule is due; a manual refresh polls all
+        now = self.hass.loop.time()
+        ovens = [oven for oven in self.ovens.values() if oven.next_poll <= now + 0.5]
+        if not ovens:
+            ovens = list(self.ovens.values())
+
+        try:
+            # One login shared by every status request in this cycle
+            await self.client.login()
+        except Exception as err:
+            results: List[Any] = [err] * len(ovens)
+        else:
+            results = await asyncio.gather(
+                *(self._async_update_oven(oven, min(oven.next_poll, now)) for oven in ovens),
+                return_exceptions=True,
+            )
+        for result in results:
+            if isinstance(result, TovalaAuthError):
+                # Refused credentials do not fix themselves: stop polling and
+                # ask the user to sign in again
+                raise ConfigEntryAuthFailed(str(result)) from result
+
+        now = self.hass.loop.time()
+        data: dict[str, OvenStatus] = dict(self.data or {})
+        errors: List[BaseException] = []
+        stale_changed = False
+        for oven, result in zip(ovens, results):
+            if isinstance(result, BaseException):
+                if isinstance(result, (TovalaCircuitOpenError, asyncio.CancelledError)):
+                    # Breaker open, or the scheduler closed while it waited (unload)
+                    _LOGGER.debug("Skipped polling oven %s: %r", oven.oven_id, result)
+                else:
+                    _LOGGER.error("Error fetching status for oven %s: %s", oven.oven_id, result)
+                errors.append(result)
+                if oven.stale_since is None:
+                    oven.stale_since = dt_util.utcnow()
+                    stale_changed = True
+                # Retry at the oven's normal cadence, or when the breaker allows a
+                # probe; its last known status stays in data
+                oven.next_poll = now + max(
+                    oven.interval, DEFAULT_SCAN_INTERVAL, self.client.breaker.retry_in
+                ) + self.scheduler.jitter(oven.interval)
+                continue
+            if oven.stale_since is not None:
+                oven.stale_since = None
+                stale_changed = True
+            data[oven.oven_id] = result
+
+        self._schedule_next_poll(now)
+        if len(errors) == len(ovens) and not self._can_serve_stale(ovens):
+            raise UpdateFailed(f"Error fetching oven status: {errors[0]}") from errors[0]
+
+        self._update_ticker()
+        if data != self.data:
+            self._save_state()
+        elif stale_changed:
+            # Same data, so the coordinator itself will not notify: the
+            # entities' stale_since attribute still has to follow.
+            self.async_update_listeners()
+        return data
+
+    def _can_serve_stale(self, ovens: List[OvenState]) -> bool:
+        """Whether failed ovens can keep their last good status instead of going unavailable."""
+        if not self.data or any(oven.oven_id not in self.data for oven in ovens):
+            return False
+        since = min(oven.stale_since for oven in ovens if oven.stale_since is not None)
+        age = (dt_util.utcnow() - since).total_seconds()
+        if age > MAX_STALE_AGE:
+            _LOGGER.warning("Tovala unreachable for %.0f minutes; marking entities unavailable", age / 60)
+            return False
+        return True
+
+    def _next_interval(self, oven: OvenState, state: str, remaining: int) -> float:
+        """State-driven interval, shaped by the oven's usage profile while idle."""
+        interval = self._schedule.next_interval(state, remaining, oven.last_state, oven.interval)
+        if state == "idle":
+            interval = oven.usage.idle_interval(
+                dt_util.utcnow(), interval, self._schedule.idle_interval,
+                self._schedule.max_idle_interval,
+            )
+        return interval
+
+    @callback
+    def async_history_updated(self) -> None:
+        """Fold new history entries into the usage profiles (history coordinator listener)."""
+        if self.history_coordinator is None:
+            return
+        added = 0
+        for oven_id, oven in self.ovens.items():
+            added += oven.usage.add(self.history_coordinator.oven_data(oven_id))
+        if added:
+            self._save_state()
+            self._schedule_prewarm()
+            self._warm_recent_meals(MEAL_WARM_LIMIT)
+
+    def _schedule_prewarm(self, after: Optional[datetime] = None) -> None:
+        """Arm a warm-up PREWARM_LEAD before the next likely usage window of any oven."""
+        if self._unsub_prewarm is not None:
+            self._unsub_prewarm()
+            self._unsub_prewarm = None
+        now = dt_util.utcnow()
+        windows = [
+            window for window in (oven.usage.next_window(after or now) for oven in self.ovens.values())
+            if window is not None
+        ]
+        if not windows:
+            return
+        window = min(windows)
+        delay = max(0.0, (window - now).total_seconds() - PREWARM_LEAD)
+
+        @callback
+        def _prewarm(_now: datetime) -> None:
+            self._unsub_prewarm = None
+            self.hass.async_create_background_task(
+                self._async_prewarm(window), f"{DOMAIN}_prewarm"
+            )
+
+        self._unsub_prewarm = async_call_later(self.hass, delay, _prewarm)
+
+    async def _async_prewarm(self, window: datetime) -> None:
+        """Renew the token and fetch recently cooked meals before a likely window."""
+        _LOGGER.debug("Warming up for usage window at %s", window)
         try:
-            data = await self.client.oven_status(self.oven_id)
-            _LOGGER.info("Oven status received: %s", data)
+            # Renew only if the token would lapse early in the window; a
+            # token expiring later is renewed in the background as usual
+            until = (window - dt_util.utcnow()).total_seconds()
+            await self.client.ensure_token(max(0.0, until) + PREWARM_TOKEN_MARGIN)
+        except Exception as err:
+            _LOGGER.debug("Token pre-warm failed: %s", err)
+        await self.meal_warmer.async_warm(
+            meal_id
+            for oven_id in self.ovens
+            for meal_id in self._recent_meal_ids(oven_id, PREWARM_MEALS)
+        )
+        self._schedule_prewarm(after=window)
+
+    def _recent_meal_ids(self, oven_id: str, limit: int) -> List[str]:
+        """Distinct meal ids from an oven's buffered history, most recent first."""
+        meal_ids: List[str] = []
+        if self.history_coordinator is None:
+            return meal_ids
+        for entry in self.history_coordinator.oven_data(oven_id):
+            meal_id = str(entry.meal_id) if entry.meal_id else None
+            if meal_id and meal_id.isdigit() and meal_id not in meal_ids:
+                meal_ids.append(meal_id)
+                if len(meal_ids) >= limit:
+                    break
+        return meal_ids
+
+    def _reschedule(self, oven: OvenState) -> None:
+        """Set the oven's next poll from its interval, with jitter so pollers drift apart."""
+        oven.next_poll = self.hass.loop.time() + oven.interval + self.scheduler.jitter(oven.interval)
+
+    async def _async_update_oven(self, oven: OvenState, target: float) -> OvenStatus:
+        """Fetch one oven's status once the scheduler grants a slot (cooking ovens first)."""
+        oven.last_slip = await self.scheduler.acquire(target, priority_for(oven.last_state))
+        self.poll_slip.observe(oven.last_slip)
+        async with self._semaphore:
+            status = await self.client.oven_status(oven.oven_id)
+            previous = self.oven_data(oven.oven_id)
+            if status is previous and (not status.meal_id or status.meal_id == oven.last_meal_id):
+                # Identical payload (304 or same bytes): the client handed back
+                # the object it parsed last time, so skip the meal lookup and
+                # keep data unchanged so no listener fires. A meal whose
+                # details failed to load is looked up again.
+                remaining = self.remaining(oven.oven_id)
+                oven.interval = self._next_interval(oven, oven.last_state or "unknown", remaining)
+                self._reschedule(oven)
+                self._check_timer_finished(oven, remaining)
+                return previous
 
             # Status response format:
             # Idle: {"state":"idle", "remote_control_enabled":true}
             # Cooking: {"state":"cooking", "estimated_start_time":"...", "estimated_end_time":"...", ...}
-            state = data.get("state", "unknown")
+            # The client has already parsed end time and meal id.
+            state = status.state
+            oven.end_time = status.end_time
+            remaining = self.remaining(oven.oven_id)
 
-            # Calculate remaining time from estimated_end_time
-            remaining = 0
-            if state == "cooking" and "estimated_end_time" in data:
-                try:
-                    end_time_str = data["estimated_end_time"]
-                    # Parse ISO format: "2025-11-07T01:43:48.000003163Z"
-                    end_time = datetime.fromisoformat(end_time_str.replace('Z', '+00:00'))
-                    now = dt_util.utcnow()
-                    delta = end_time - now
-                    remaining = max(0, int(delta.total_seconds()))
-                    _LOGGER.debug("Calculated remaining time: %d seconds (end_time=%s, now=%s)",
-                                 remaining, end_time, now)
-                except Exception as e:
-                    _LOGGER.warning("Failed to parse estimated_end_time: %s - %s",
-                                   data.get("estimated_end_time"), e)
-                    remaining = 0
-
-            _LOGGER.debug("Parsed state=%s, remaining=%s", state, remaining)
-
-            # Fire event once when remaining crosses to 0
-            if (self._last_reported_remaining and self._last_reported_remaining > 0) and int(remaining) == 0:
-                _LOGGER.info("Timer finished for oven %s", self.oven_id)
-                self.hass.bus.async_fire(EVENT_TIMER_FINISHED, {
-                    "oven_id": self.oven_id,
-                    "data": data
-                })
-
-            self._last_reported_remaining = int(remaining)
-
-            # Add calculated remaining to data for sensors
-            data["remaining"] = remaining
+            _LOGGER.debug("Oven %s parsed state=%s, remaining=%s, end_time=%s",
+                          oven.oven_id, state, remaining, status.end_time)
+
+            oven.interval = self._next_interval(oven, state, remaining)
+            self._reschedule(oven)
+            oven.last_state = state
 
             # Fetch meal details if cooking and barcode available
-            barcode = data.get("barcode")
-            meal_id = self._extract_meal_id(barcode) if barcode else None
+            barcode = status.barcode
+            meal_id = status.meal_id
 
             if meal_id:
-                # New meal detected - fetch details
-                if meal_id != self._last_meal_id:
-                    _LOGGER.info("New meal detected: %s (previous: %s)", meal_id, self._last_meal_id)
-                    meal_details = await self.client.meal_details(meal_id)
-                    if meal_details:
-                        self._cached_meal_details = meal_details
-                        self._last_meal_id = meal_id
-                        _LOGGER.info("Fetched meal details: %s", meal_details.get("title"))
+                # New meal detected - usually already warmed from history
+                if meal_id != oven.last_meal_id:
+                    _LOGGER.info("New meal detected on oven %s: %s (previous: %s)",
+                                 oven.oven_id, meal_id, oven.last_meal_id)
+                    oven.last_meal_id = meal_id
+                    meal_details = self.meal_cache.get(meal_id)
+                    if meal_details is not None:
+                        self._set_meal(oven, meal_id, meal_details)
                     else:
-                        _LOGGER.warning("Failed to fetch meal details for meal_id %s", meal_id)
-            elif barcode and not meal_id:
+                        # Fetch off the polling path; entities update when it arrives
+                        oven.cached_meal_details = None
+                        self.meal_warmer.request(meal_id).add_done_callback(
+                            lambda future, oven=oven, meal_id=meal_id: self._meal_arrived(oven, meal_id, future)
+                        )
+            elif barcode:
                 # Manual cooking mode (no meal_id in barcode)
-                if barcode != self._last_meal_id:
+                if barcode != oven.last_meal_id:
                     _LOGGER.debug("Manual cooking mode: %s", barcode)
                     # Clear meal cache for manual modes
-                    self._last_meal_id = barcode
-                    self._cached_meal_details = None
+                    oven.last_meal_id = barcode
+                    oven.cached_meal_details = None
             # else: No barcode means cooking finished (state=idle), keep cached meal details
 
-            # Always include cached meal details if available (persists after cooking ends)
-            if self._cached_meal_details:
-                data["meal"] = self._cached_meal_details
-                _LOGGER.debug("Including cached meal in data: %s", self._cached_meal_details.get("title"))
+            self._check_timer_finished(oven, remaining)
 
-            return data
+            return status
 
-        except Exception as err:
-            _LOGGER.error("Error fetching oven status: %s", err, exc_info=True)
-            raise
\ No newline at end of file
+
+class TovalaHistoryCoordinator(DataUpdateCoordinator[dict[str, List[HistoryEntry]]]):
+    """Cooking history on its own slow cadence, kept in a bounded buffer per oven.
+
+    ``data`` maps oven_id -> history entries, most recent first.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client,
+        ovens: Dict[str, OvenState],
+        update_interval: int = DEFAULT_HISTORY_INTERVAL,
+        buffer_size: int = HISTORY_BUFFER_SIZE,
+    ):
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_history",
+            update_interval=timedelta(seconds=update_interval),
+            always_update=False,
+        )
+        self.client = client
+        self.ovens = ovens  # shared with the status coordinator
+        self._buffer_size = buffer_size
+        self._buffers: Dict[str, Deque[HistoryEntry]] = {}
+        self._newest: Dict[str, datetime] = {}  # newest start_time seen per oven
+        self.versions: Dict[str, int] = {}  # bumped whenever an oven's buffer changes
+        self._stale_since: Optional[datetime] = None
+        self.statistics = None  # optional TovalaStatisticsImporter fed with every fetch
+
+    @property
+    def oven_ids(self) -> List[str]:
+        return list(self.ovens)
+
+    def stale_since(self, oven_id: str) -> Optional[datetime]:
+        """When history refreshes started failing, if buffered history is being served stale."""
+        return self._stale_since
+
+    def oven_data(self, oven_id: str) -> List[HistoryEntry]:
+        """Return buffered history for one oven, most recent first."""
+        if not self.data:
+            return []
+        return self.data.get(oven_id) or []
+
+    def _merge(self, oven_id: str, entries: List[HistoryEntry]) -> int:
+        """Add entries newer than anything buffered and update buffered ones that
+        changed since (a cook that was still running gets its end time).
+        Returns how many were added or updated."""
+        buffer = self._buffers.setdefault(oven_id, deque(maxlen=self._buffer_size))
+        newest = self._newest.get(oven_id)
+        known = {(entry.start_time, entry.barcode): index for index, entry in enumerate(buffer)}
+        fresh = []
+        updated = 0
+        for entry in entries:
+            start = entry.start_time
+            if start is None:
+                continue
+            if newest is None or start > newest:
+                fresh.append((start, entry))
+                continue
+            index = known.get((start, entry.barcode))
+            if index is not None:
+                old = buffer[index]
+                if old.end_time != entry.end_time or old.status != entry.status:
+                    buffer[index] = entry
+                    updated += 1
+
+        # Oldest first so appendleft leaves the newest entry at index 0
+        for start, entry in sorted(fresh, key=lambda item: item[0]):
+            buffer.appendleft(entry)
+        if fresh:
+            self._newest[oven_id] = max(start for start, _ in fresh)
+        if fresh or updated:
+            self.versions[oven_id] = self.versions.get(oven_id, 0) + 1
+        return len(fresh) + updated
+
+    async def _async_update_data(self) -> dict:
+        errors = []
+        for oven_id in self.ovens:
+            try:
+                entries = await self.client.cooking_history(oven_id, limit=self._buffer_size)
+            except TovalaCircuitOpenError as err:
+                _LOGGER.debug("Skipped cooking history for oven %s: %s", oven_id, err)
+                errors.append(err)
+                continue
+            except Exception as err:
+                _LOGGER.warning("Error fetching cooking history for oven %s: %s", oven_id, err)
+                errors.append(err)
+                continue
+            changed = self._merge(oven_id, entries)
+            _LOGGER.debug("Merged %d new or updated history entries for oven %s", changed, oven_id)
+            if self.statistics is not None:
+                # Every fetch: a cook deferred while still running is only
+                # imported once a later fetch shows it finished. The importer
+                # keeps its own high-water mark, so this stays O(new entries).
+                try:
+                    await self.statistics.async_process(oven_id, self.ovens[oven_id].name, entries)
+                except Exception as err:
+                    _LOGGER.warning("Failed to import cooking statistics for oven %s: %s", oven_id, err)
+
+        if self.ovens and len(errors) == len(self.ovens):
+            now = dt_util.utcnow()
+            since = self._stale_since or now
+            if self.data is None or (now - since).total_seconds() > MAX_STALE_AGE:
+                raise UpdateFailed(f"Error fetching cooking history: {errors[0]}")
+            if self._stale_since is None:
+                self._stale_since = now
+                self.async_update_listeners()
+            # Keep serving the buffered history through the outage
+            return self.data
+
+        if self._stale_since is not None:
+            self._stale_since = None
+            self.async_update_listeners()
+        return {oven_id: list(buffer) for oven_id, buffer in self._buffers.items()}
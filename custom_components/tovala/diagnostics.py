@@ -0,0 +1,32 @@
+from __future__ import annotations
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_EMAIL, CONF_PASSWORD
+
+TO_REDACT = {CONF_EMAIL, CONF_PASSWORD, "token"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> Dict[str, Any]:
+    """Return request metrics, poll cadence and cache state for one entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    client = data["client"]
+    coord = data["coordinator"]
+    history = data["history_coordinator"]
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "client": client.metrics_snapshot(),
+        "coordinator": coord.metrics_snapshot(),
+        "scheduler": coord.scheduler.metrics_snapshot(),
+        "history": {
+            "update_interval": history.update_interval.total_seconds() if history.update_interval else None,
+            "last_update_success": history.last_update_success,
+            "entries": {oven_id: len(history.oven_data(oven_id)) for oven_id in history.oven_ids},
+        },
+    }
@@ -0,0 +1,66 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Any, Dict, Optional, TypeVar
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import TovalaCoordinator, TovalaHistoryCoordinator
+
+_CoordinatorT = TypeVar("_CoordinatorT", TovalaCoordinator, TovalaHistoryCoordinator)
+
+
+class TovalaEntity(CoordinatorEntity[_CoordinatorT]):
+    """Base entity bound to one oven of a (possibly multi-oven) coordinator."""
+
+    def __init__(self, coordinator: _CoordinatorT, oven_id: str, key: str, name: str):
+        super().__init__(coordinator)
+        self.oven_id = oven_id
+        self._attr_unique_id = f"tovala_{oven_id}_{key}"
+
+        oven_name = coordinator.ovens[oven_id].name if oven_id in coordinator.ovens else None
+        # Keep the original entity names for single-oven accounts
+        if len(coordinator.ovens) > 1:
+            self._attr_name = f"Tovala {oven_name or oven_id} {name}"
+        else:
+            self._attr_name = f"Tovala {name}"
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, oven_id)},
+            manufacturer="Tovala",
+            name=f"Tovala {oven_name}" if oven_name else "Tovala Smart Oven",
+        )
+        self._last_snapshot: Optional[tuple] = None
+
+    @property
+    def oven_data(self) -> Any:
+        """This oven's slice of the coordinator data."""
+        return self.coordinator.oven_data(self.oven_id)
+
+    @property
+    def available(self) -> bool:
+        return self.coordinator.last_update_success
+
+    @property
+    def stale_since(self) -> Optional[datetime]:
+        """Set while the cloud is failing and the last good data is shown."""
+        return self.coordinator.stale_since(self.oven_id)
+
+    def _stale_attributes(self) -> Dict[str, Any]:
+        since = self.stale_since
+        return {"stale_since": since.isoformat()} if since is not None else {}
+
+    def _state_snapshot(self) -> tuple:
+        """Everything that ends up in the state row; compared before writing."""
+        return (self.available, self.stale_since)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the value or attributes actually changed."""
+        snapshot = self._state_snapshot()
+        if snapshot == self._last_snapshot:
+            return
+        self._last_snapshot = snapshot
+        super()._handle_coordinator_update()
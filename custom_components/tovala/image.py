@@ -0,0 +1,63 @@
+from __future__ import annotations
+from typing import Optional
+
+from homeassistant.components.image import ImageEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import TovalaCoordinator
+from .entity import TovalaEntity
+from .image_cache import CONTENT_TYPE
+from .models import Meal
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, add_entities: AddEntitiesCallback):
+    data = hass.data[DOMAIN][entry.entry_id]
+    coord: TovalaCoordinator = data["coordinator"]
+    if coord.image_cache is None:
+        return
+    add_entities([TovalaMealImage(coord, oven_id) for oven_id in data["ovens"]])
+
+class TovalaMealImage(TovalaEntity[TovalaCoordinator], ImageEntity):
+    """Photo of the current (or last) meal, served from the local image cache."""
+    _attr_content_type = CONTENT_TYPE
+    _attr_icon = "mdi:food"
+
+    def __init__(self, coordinator: TovalaCoordinator, oven_id: str):
+        super().__init__(coordinator, oven_id, "meal_image", "Meal Image")
+        ImageEntity.__init__(self, coordinator.hass)
+        self._image_key: Optional[tuple] = None
+        self._refresh_image_key()
+
+    def _meal(self) -> Optional[Meal]:
+        return self.coordinator.meal(self.oven_id)
+
+    def _refresh_image_key(self) -> None:
+        """Bump image_last_updated when the meal or its cached copy changes."""
+        meal = self._meal()
+        meal_id = str(meal.id) if meal else None
+        key = (meal_id, meal_id in self.coordinator.cached_images)
+        if key != self._image_key:
+            self._image_key = key
+            self._attr_image_last_updated = dt_util.utcnow() if meal_id else None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._refresh_image_key()
+        super()._handle_coordinator_update()
+
+    @property
+    def extra_state_attributes(self):
+        return self._stale_attributes()
+
+    def _state_snapshot(self) -> tuple:
+        return (self.available, self._image_key, self.stale_since)
+
+    async def async_image(self) -> Optional[bytes]:
+        meal = self._meal()
+        if not meal or self.coordinator.image_cache is None:
+            return None
+        # Normally prefetched; fetch on demand after a restart or eviction
+        return await self.coordinator.image_cache.async_fetch(str(meal.id), meal.image_url)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Optional
+import asyncio
+import logging
+import os
+import re
+
+from aiohttp import ClientError, ClientSession, ClientTimeout
+
+try:
+    # Pillow ships with Home Assistant; without it images are cached as downloaded
+    from PIL import Image
+except ImportError:  # pragma: no cover
+    Image = None
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_IMAGE_CACHE_BYTES = 20 * 1024 * 1024
+DEFAULT_IMAGE_MAX_SIZE = 640  # pixels, longest side
+IMAGE_FETCH_TIMEOUT = 15  # seconds
+CONTENT_TYPE = "image/jpeg"
+
+
+def _resize(body: bytes, max_size: int) -> bytes:
+    """Downscale to max_size (longest side) and re-encode as JPEG."""
+    if Image is None:
+        return body
+    try:
+        with Image.open(BytesIO(body)) as image:
+            image.thumbnail((max_size, max_size))
+            out = BytesIO()
+            image.convert("RGB").save(out, format="JPEG", quality=85, optimize=True)
+            return out.getvalue()
+    except Exception as err:  # corrupt or unsupported image: keep the original
+        _LOGGER.debug("Could not resize meal image: %s", err)
+        return body
+
+
+class MealImageCache:
+    """Size-bounded on-disk cache of resized meal images, keyed by meal ID.
+
+    Images are downloaded once per meal and evicted least recently used
+    first once the directory grows past max_bytes. File I/O runs in the
+    default executor.
+    """
+
+    def __init__(
+        self,
+        session: ClientSession,
+        directory: str,
+        max_bytes: int = DEFAULT_IMAGE_CACHE_BYTES,
+        max_size: int = DEFAULT_IMAGE_MAX_SIZE,
+    ):
+        self._session = session
+        self._directory = Path(directory)
+        self._max_bytes = max_bytes
+        self._max_size = max_size
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _path(self, meal_id: str) -> Path:
+        return self._directory / f"{int(meal_id)}.jpg"
+
+    async def async_get(self, meal_id: str) -> Optional[bytes]:
+        """Cached image bytes, or None if the meal has not been fetched."""
+        if not re.fullmatch(r"[0-9]+", str(meal_id)):
+            return None
+        return await asyncio.get_running_loop().run_in_executor(None, self._read, self._path(meal_id))
+
+    async def async_fetch(self, meal_id: str, url: str) -> Optional[bytes]:
+        """Download, resize and store one meal's image unless it is cached already."""
+        meal_id = str(meal_id)
+        if not re.fullmatch(r"[0-9]+", meal_id) or not url:
+            return None
+        cached = await self.async_get(meal_id)
+        if cached is not None:
+            return cached
+        task = self._inflight.get(meal_id)
+        if task is None:
+            task = asyncio.ensure_future(self._async_download(meal_id, url))
+            self._inflight[meal_id] = task
+            task.add_done_callback(lambda _done: self._inflight.pop(meal_id, None))
+        return await asyncio.shield(task)
+
+    async def _async_download(self, meal_id: str, url: str) -> Optional[bytes]:
+        try:
+            async with self._session.get(url, timeout=ClientTimeout(total=IMAGE_FETCH_TIMEOUT)) as r:
+                if r.status != 200:
+                    _LOGGER.debug("Meal image %s: HTTP %s", url, r.status)
+                    return None
+                body = await r.read()
+        except (ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Failed to download meal image %s: %s", url, err)
+            return None
+        loop = asyncio.get_running_loop()
+        body = await loop.run_in_executor(None, _resize, body, self._max_size)
+        await loop.run_in_executor(None, self._store, self._path(meal_id), body)
+        _LOGGER.debug("Cached meal image %s (%d bytes)", meal_id, len(body))
+        return body
+
+    @staticmethod
+    def _read(path: Path) -> Optional[bytes]:
+        try:
+            body = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            os.utime(path)  # mark as recently used for eviction
+        except OSError:
+            pass
+        return body
+
+    def _store(self, path: Path, body: bytes) -> None:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(body)
+        tmp.replace(path)
+        self._evict()
+
+    def _evict(self) -> None:
+        files = []
+        total = 0
+        for path in self._directory.glob("*.jpg"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        # Least recently used first
+        for _mtime, size, path in sorted(files):
+            if total <= self._max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
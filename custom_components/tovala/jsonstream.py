@@ -0,0 +1,85 @@
+from __future__ import annotations
+from typing import Any, List
+import json
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+_TERMINATORS = _WHITESPACE + ",]"
+
+# Parser states
+_START = 0  # before the opening bracket
+_FIRST = 1  # after "[": an element or "]"
+_ELEMENT = 2  # after ",": an element
+_SEPARATOR = 3  # after an element: "," or "]"
+_DONE = 4
+
+
+class JsonArrayParser:
+    """Incremental parser for a top-level JSON array.
+
+    Text is fed in as it arrives; every element that is complete by then is
+    returned, and only the unfinished tail is kept. Memory therefore stays
+    around one chunk plus one element, however long the array is. A body
+    that is not an array (e.g. an error object) parses to no elements.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._state = _START
+
+    @property
+    def started(self) -> bool:
+        """Whether anything other than whitespace has been seen."""
+        return self._state != _START or bool(self._buffer.strip(_WHITESPACE))
+
+    @property
+    def done(self) -> bool:
+        """Whether the array (or a non-array body) has been read to its end."""
+        return self._state == _DONE
+
+    def feed(self, text: str) -> List[Any]:
+        """Add text and return the elements completed by it."""
+        if self._state == _DONE:
+            return []
+        buffer = self._buffer + text if self._buffer else text
+        end = len(buffer)
+        pos = 0
+        elements: List[Any] = []
+        state = self._state
+        while True:
+            while pos < end and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= end:
+                break
+            char = buffer[pos]
+            if state == _START:
+                state = _FIRST if char == "[" else _DONE
+                pos += 1
+            elif state == _SEPARATOR or (state == _FIRST and char == "]"):
+                if char == "]":
+                    state = _DONE
+                elif char == ",":
+                    state = _ELEMENT
+                else:
+                    raise ValueError(f"Unexpected {char!r} at offset {pos} in JSON array")
+                pos += 1
+            elif state == _DONE:
+                break
+            else:
+                try:
+                    element, next_pos = _DECODER.raw_decode(buffer, pos)
+                except ValueError:
+                    break  # incomplete: wait for more text
+                if char not in "{[\"" and (next_pos >= end or buffer[next_pos] not in _TERMINATORS):
+                    break  # a number may continue in the next chunk ("1" of "1.5")
+                elements.append(element)
+                pos = next_pos
+                state = _SEPARATOR
+        self._state = state
+        self._buffer = "" if state == _DONE else buffer[pos:]
+        return elements
+
+    def close(self) -> None:
+        """Check the input ended on a complete array."""
+        if self.started and not self.done:
+            raise ValueError("Truncated JSON array")
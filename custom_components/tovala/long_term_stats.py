@@ -0,0 +1,101 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import re
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, DEFAULT_BACKFILL_PAGE_SIZE
+from .cook_stats import COOK_STATISTICS, CookStatsAccumulator
+from .models import HistoryEntry, parse_time
+
+_LOGGER = logging.getLogger(__name__)
+
+STATS_SAVE_DELAY = 10  # seconds
+_EPOCH = parse_time("1970-01-01T00:00:00Z")  # sort key for entries without a start time
+
+
+def statistic_id(oven_id: str, key: str) -> str:
+    """External statistic id, e.g. tovala:b3d64c11_96db_..._cooks."""
+    return f"{DOMAIN}:{re.sub(r'[^a-z0-9_]', '_', str(oven_id).lower())}_{key}"
+
+
+class TovalaStatisticsImporter:
+    """Import finished cooks into recorder long-term statistics.
+
+    Hourly rows (cook count, cook minutes, meal vs manual cooks) are written
+    as external statistics with cumulative sums. A per-oven high-water mark
+    is persisted, so every history refresh only folds in new entries.
+    """
+
+    def __init__(self, hass: HomeAssistant, client, store: Any = None):
+        self.hass = hass
+        self.client = client
+        self._store = store
+        self._accumulators: Dict[str, CookStatsAccumulator] = {}
+        self._lock = asyncio.Lock()  # a backfill must not interleave with a refresh
+
+    async def async_load(self) -> None:
+        if self._store is None:
+            return
+        stored = await self._store.async_load() or {}
+        for oven_id, state in stored.get("ovens", {}).items():
+            self._accumulators[oven_id] = CookStatsAccumulator(state)
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        return {"ovens": {oven_id: acc.as_dict() for oven_id, acc in self._accumulators.items()}}
+
+    def _save(self) -> None:
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_save, STATS_SAVE_DELAY)
+
+    async def async_process(self, oven_id: str, name: Optional[str], entries: List[HistoryEntry]) -> int:
+        """Fold entries newer than the high-water mark in. Returns hourly rows written."""
+        async with self._lock:
+            accumulator = self._accumulators.setdefault(oven_id, CookStatsAccumulator())
+            written = self._import(oven_id, name, accumulator.add(entries))
+            if written:
+                self._save()
+            return written
+
+    async def async_backfill(
+        self, oven_id: str, name: Optional[str], page_size: int = DEFAULT_BACKFILL_PAGE_SIZE
+    ) -> int:
+        """Rebuild one oven's statistics from its full history, one page at a time."""
+        entries = await self.client.cooking_history(oven_id, limit=None)
+        # Oldest first, so every page only moves the high-water mark forward
+        entries.sort(key=lambda entry: entry.start_time or _EPOCH)
+        written = 0
+        async with self._lock:
+            accumulator = self._accumulators[oven_id] = CookStatsAccumulator()
+            for offset in range(0, len(entries), max(1, page_size)):
+                written += self._import(oven_id, name, accumulator.add(entries[offset:offset + page_size]))
+                await asyncio.sleep(0)  # let the event loop breathe between pages
+            self._save()
+        _LOGGER.info("Backfilled %d history entries for oven %s (%d hourly rows)",
+                     len(entries), oven_id, written)
+        return written
+
+    def _import(self, oven_id: str, name: Optional[str], rows: Dict[str, List[Dict[str, Any]]]) -> int:
+        count = len(rows.get("cooks") or [])
+        if not count:
+            return 0
+        if "recorder" not in self.hass.config.components:
+            _LOGGER.debug("Recorder not loaded; skipping statistics import")
+            return count
+        from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+        for key, (suffix, unit) in COOK_STATISTICS.items():
+            if not rows[key]:
+                continue
+            metadata = {
+                "has_mean": False,
+                "has_sum": True,
+                "name": f"Tovala {name or oven_id} {suffix}",
+                "source": DOMAIN,
+                "statistic_id": statistic_id(oven_id, key),
+                "unit_of_measurement": unit,
+            }
+            async_add_external_statistics(self.hass, metadata, rows[key])
+        return count
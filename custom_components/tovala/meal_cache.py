@@ -0,0 +1,179 @@
+from __future__ import annotations
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, Optional, Set
+import asyncio
+import logging
+import time
+
+from .models import Meal
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MEAL_CACHE_SIZE = 200
+DEFAULT_MEAL_CACHE_TTL = 30 * 24 * 3600  # meal metadata hardly ever changes
+MEAL_CACHE_SAVE_DELAY = 30  # seconds; batches writes after bursts of new meals
+DEFAULT_WARM_WORKERS = 4  # concurrent meal fetches by the background warmer
+
+
+class MealCache:
+    """Size-bounded LRU cache of meal details with a TTL.
+
+    Keyed by the numeric meal ID parsed from the barcode. When a store
+    (anything with async_load/async_delay_save, e.g. a Home Assistant Store)
+    is given, entries survive restarts.
+    """
+
+    def __init__(
+        self,
+        store: Any = None,
+        max_size: int = DEFAULT_MEAL_CACHE_SIZE,
+        ttl: float = DEFAULT_MEAL_CACHE_TTL,
+    ):
+        self._store = store
+        self._max_size = max(1, max_size)
+        self._ttl = ttl
+        # meal_id -> (fetched_at epoch seconds, meal); oldest first
+        self._entries: "OrderedDict[str, tuple[float, Meal]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, meal_id: str) -> bool:
+        entry = self._entries.get(str(meal_id))
+        return entry is not None and time.time() - entry[0] < self._ttl
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        """Fraction of lookups served from the cache, None before the first lookup."""
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+    async def async_load(self) -> None:
+        if self._store is None:
+            return
+        stored = await self._store.async_load() or {}
+        now = time.time()
+        for meal_id, (fetched_at, meal) in stored.get("meals", {}).items():
+            meal = Meal.from_api(meal)
+            if meal is not None and now - fetched_at < self._ttl:
+                self._entries[meal_id] = (fetched_at, meal)
+        self._evict()
+        _LOGGER.debug("Loaded %d cached meals", len(self._entries))
+
+    def get(self, meal_id: str) -> Optional[Meal]:
+        """Return cached meal details and mark them recently used."""
+        meal_id = str(meal_id)
+        entry = self._entries.get(meal_id)
+        if entry is None or time.time() - entry[0] >= self._ttl:
+            if entry is not None:
+                del self._entries[meal_id]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(meal_id)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, meal_id: str, meal: Meal) -> None:
+        meal_id = str(meal_id)
+        self._entries[meal_id] = (time.time(), meal)
+        self._entries.move_to_end(meal_id)
+        self._evict()
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_save, MEAL_CACHE_SAVE_DELAY)
+
+    def _evict(self) -> None:
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        return {
+            "meals": {
+                meal_id: [fetched_at, meal.as_dict()]
+                for meal_id, (fetched_at, meal) in self._entries.items()
+            }
+        }
+
+
+class MealWarmer:
+    """Resolve meal IDs into a MealCache in the background.
+
+    Requests for the same meal share one fetch, and at most ``workers``
+    fetches run at once. Each request returns a future that resolves to the
+    meal (None if it could not be fetched), so callers can react when the
+    details arrive instead of waiting for them.
+    """
+
+    def __init__(
+        self,
+        cache: MealCache,
+        fetch: Callable[[str], Awaitable[Optional[Meal]]],
+        workers: int = DEFAULT_WARM_WORKERS,
+    ):
+        self._cache = cache
+        self._fetch = fetch
+        self._workers = max(1, workers)
+        self._queue: Deque[str] = deque()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.fetched = 0
+        self.failed = 0
+
+    def request(self, meal_id: str) -> asyncio.Future:
+        """Future for one meal's details, queueing a fetch unless it is cached or pending."""
+        meal_id = str(meal_id)
+        future = self._pending.get(meal_id)
+        if future is not None:
+            return future
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if meal_id in self._cache:
+            future.set_result(self._cache.get(meal_id))
+            return future
+        self._pending[meal_id] = future
+        self._queue.append(meal_id)
+        if len(self._tasks) < self._workers:
+            task = loop.create_task(self._async_worker())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return future
+
+    async def async_warm(self, meal_ids: Iterable[str]) -> int:
+        """Fetch every meal not cached yet, concurrently. Returns how many were fetched."""
+        futures = [self.request(meal_id) for meal_id in meal_ids if str(meal_id) not in self._cache]
+        if not futures:
+            return 0
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        return sum(1 for result in results if isinstance(result, Meal))
+
+    async def _async_worker(self) -> None:
+        while self._queue:
+            meal_id = self._queue.popleft()
+            future = self._pending.get(meal_id)
+            meal: Optional[Meal] = None
+            try:
+                meal = await self._fetch(meal_id)
+            except Exception as err:  # fetch errors only mean "not warmed"
+                _LOGGER.debug("Failed to warm meal %s: %s", meal_id, err)
+            finally:
+                self._pending.pop(meal_id, None)
+            if meal is not None:
+                self._cache.put(meal_id, meal)
+                self.fetched += 1
+            else:
+                self.failed += 1
+            if future is not None and not future.done():
+                future.set_result(meal)
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._queue.clear()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+from typing import Any, Dict, Optional, Sequence
+
+# Upper bounds of the latency buckets, in milliseconds; slower samples go to "+Inf"
+LATENCY_BUCKETS_MS: Sequence[float] = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; constant memory however long it runs."""
+
+    def __init__(self, buckets_ms: Sequence[float] = LATENCY_BUCKETS_MS):
+        self._bounds = tuple(buckets_ms)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        for index, bound in enumerate(self._bounds):
+            if ms <= bound:
+                self._counts[index] += 1
+                return
+        self._counts[-1] += 1
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Upper bound (ms) of the bucket holding the pct-th percentile, capped at the max."""
+        if not self.count:
+            return None
+        rank = pct / 100 * self.count
+        seen = 0
+        for bound, count in zip(self._bounds, self._counts):
+            seen += count
+            if seen >= rank:
+                return round(min(float(bound), self.max_ms), 1)
+        return self.max_ms
+
+    def as_dict(self) -> Dict[str, Any]:
+        buckets = {f"le_{bound:g}": count for bound, count in zip(self._bounds, self._counts)}
+        buckets["le_inf"] = self._counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "max_ms": round(self.max_ms, 1),
+            "buckets": buckets,
+        }
+
+
+class EndpointStats:
+    """Request counters and latency for one API endpoint."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.not_modified = 0
+        self.unchanged = 0
+        self.latency = LatencyHistogram()
+
+    @property
+    def cache_hit_rate(self) -> Optional[float]:
+        """Share of requests answered by 304 or an identical body."""
+        if not self.requests:
+            return None
+        return (self.not_modified + self.unchanged) / self.requests
+
+    def as_dict(self) -> Dict[str, Any]:
+        hit_rate = self.cache_hit_rate
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+            "cache_hit_rate": None if hit_rate is None else round(hit_rate, 3),
+            "latency": self.latency.as_dict(),
+        }
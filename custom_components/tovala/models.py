@@ -0,0 +1,196 @@
+from __future__ import annotations
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+
+def parse_time(value: Optional[str]) -> Optional[datetime]:
+    """Parse an API timestamp ("2025-11-07T01:43:48.000003163Z") as an aware datetime."""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    # The API reports UTC
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def parse_meal_id(barcode: Optional[str]) -> Optional[str]:
+    """Extract meal_id from a barcode.
+
+    Tovala meal barcodes: "133A254|463|5E34BF80" or "133A254|13251|5E34BF80|A"
+    Manual modes: "manual-mini-toast-4", "Bake at 400° for 15:00"
+    """
+    if not barcode:
+        return None
+    parts = barcode.split("|")
+    # Meal IDs are numeric
+    if len(parts) >= 2 and parts[1].isdigit():
+        return parts[1]
+    return None
+
+
+class OvenStatus:
+    """One cook/status response, parsed once by the client.
+
+    Instances are shared with the client's conditional-request cache and
+    must be treated as read-only. Fields the integration does not use are
+    kept in ``extra`` so events and the saved state still carry them.
+    """
+
+    __slots__ = (
+        "state",
+        "barcode",
+        "meal_id",
+        "estimated_start_time",
+        "estimated_end_time",
+        "end_time",
+        "remote_control_enabled",
+        "extra",
+    )
+
+    _FIELDS = ("state", "barcode", "estimated_start_time", "estimated_end_time", "remote_control_enabled")
+
+    def __init__(
+        self,
+        state: str = "unknown",
+        barcode: Optional[str] = None,
+        estimated_start_time: Optional[str] = None,
+        estimated_end_time: Optional[str] = None,
+        remote_control_enabled: Optional[bool] = None,
+        extra: Optional[Dict[str, Any]] = None,
+    ):
+        self.state = state
+        self.barcode = barcode
+        self.meal_id = parse_meal_id(barcode)
+        self.estimated_start_time = estimated_start_time
+        self.estimated_end_time = estimated_end_time
+        # Only a cooking oven counts down to its end time
+        self.end_time = parse_time(estimated_end_time) if state == "cooking" else None
+        self.remote_control_enabled = remote_control_enabled
+        self.extra = extra or {}
+
+    @classmethod
+    def from_api(cls, data: Any) -> "OvenStatus":
+        if not isinstance(data, dict):
+            return cls()
+        return cls(
+            data.get("state") or "unknown",
+            data.get("barcode") or None,
+            data.get("estimated_start_time"),
+            data.get("estimated_end_time"),
+            data.get("remote_control_enabled"),
+            {key: value for key, value in data.items() if key not in cls._FIELDS},
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """The API fields, for events and persistence."""
+        data: Dict[str, Any] = {"state": self.state}
+        for key in self._FIELDS[1:]:
+            value = getattr(self, key)
+            if value is not None:
+                data[key] = value
+        for key, value in self.extra.items():
+            data.setdefault(key, value)
+        return data
+
+
+class Meal:
+    """Meal details with the image URL resolved up front.
+
+    Every other field of the meal, the raw images list included, is kept in
+    ``extra`` so events and the meal cache still carry it.
+    """
+
+    __slots__ = ("id", "title", "subtitle", "image_url", "ingredients", "extra")
+
+    _FIELDS = ("id", "title", "subtitle", "ingredients")
+
+    def __init__(
+        self,
+        id: Any = None,
+        title: Optional[str] = None,
+        subtitle: str = "",
+        image_url: Optional[str] = None,
+        ingredients: Any = None,
+        extra: Optional[Dict[str, Any]] = None,
+    ):
+        self.id = id
+        self.title = title
+        self.subtitle = subtitle
+        self.image_url = image_url
+        self.ingredients = ingredients
+        self.extra = extra or {}
+
+    @classmethod
+    def from_api(cls, data: Any) -> Optional["Meal"]:
+        if not isinstance(data, dict) or not data:
+            return None
+        image_url = None
+        images = data.get("images") or []
+        if images and isinstance(images[0], dict):
+            # Construct full URL from CDN path
+            image_url = images[0].get("url") or None
+            if image_url and image_url.startswith("//"):
+                image_url = f"https:{image_url}"
+        return cls(
+            data.get("id"),
+            data.get("title"),
+            data.get("subtitle", ""),
+            image_url,
+            data.get("ingredients"),
+            {key: value for key, value in data.items() if key not in cls._FIELDS},
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """The API fields, for events and the meal cache."""
+        data: Dict[str, Any] = {"id": self.id, "title": self.title, "subtitle": self.subtitle}
+        if self.ingredients:
+            data["ingredients"] = self.ingredients
+        for key, value in self.extra.items():
+            data.setdefault(key, value)
+        if self.image_url and "images" not in data:
+            data["images"] = [{"url": self.image_url}]
+        return data
+
+
+class HistoryEntry:
+    """One cooking history entry with its timestamps parsed."""
+
+    __slots__ = ("barcode", "meal_id", "start_time", "end_time", "status")
+
+    def __init__(
+        self,
+        barcode: str = "",
+        meal_id: Any = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        status: str = "",
+    ):
+        self.barcode = barcode
+        self.meal_id = meal_id
+        self.start_time = start_time
+        self.end_time = end_time
+        self.status = status
+
+    @classmethod
+    def from_api(cls, data: Any) -> Optional["HistoryEntry"]:
+        if not isinstance(data, dict):
+            return None
+        barcode = data.get("barcode") or ""
+        return cls(
+            barcode,
+            data.get("meal_id") or parse_meal_id(barcode),
+            parse_time(data.get("start_time")),
+            parse_time(data.get("end_time")),
+            data.get("status") or "",
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "barcode": self.barcode,
+            "meal_id": self.meal_id,
+            "start_time": self.start_time.isoformat() if self.start_time else "",
+            "end_time": self.end_time.isoformat() if self.end_time else "",
+            "status": self.status,
+        }
@@ -0,0 +1,87 @@
+from __future__ import annotations
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+import asyncio
+import random
+import time
+
+
+class RequestPolicy:
+    """Timeout and retry behaviour for one API endpoint."""
+
+    def __init__(
+        self,
+        retries: int = 2,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        max_retry_after: float = 60.0,
+        timeout: float = 10.0,
+    ):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        # Give up instead of sleeping when the server asks us to wait longer than this
+        self.max_retry_after = max_retry_after
+        self.timeout = timeout
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """Seconds to wait before retry number attempt+1, or None to give up."""
+        if attempt >= self.retries:
+            return None
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            return retry_after
+        # Full jitter: uniform in [0, capped exponential]
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+
+# Login already races the base URLs, so it is not retried on top of that.
+DEFAULT_POLICIES: Dict[str, RequestPolicy] = {
+    "default": RequestPolicy(),
+    "login": RequestPolicy(retries=0),
+    "ovens": RequestPolicy(retries=2),
+    "status": RequestPolicy(retries=1, max_backoff=5.0, max_retry_after=10.0),
+    "meal": RequestPolicy(retries=2),
+    "history": RequestPolicy(retries=2),
+}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Client-side rate limiter shared by every request on one account."""
+
+    def __init__(self, rate: float, capacity: float):
+        self._rate = rate  # tokens per second
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Take one token, waiting if the bucket is empty. Returns seconds waited."""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self._rate
+                await asyncio.sleep(wait)
+                waited += wait
@@ -0,0 +1,48 @@
+from __future__ import annotations
+from typing import Optional
+
+from .const import (
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_COOKING_INTERVAL,
+    DEFAULT_IDLE_INTERVAL,
+    DEFAULT_MAX_IDLE_INTERVAL,
+    IDLE_BACKOFF_FACTOR,
+    FINISH_WAKEUP_MARGIN,
+    MIN_SCAN_INTERVAL,
+)
+
+
+class PollSchedule:
+    """State-driven poll intervals for one oven.
+
+    Kept free of Home Assistant imports so the offline benchmarks can drive
+    the same schedule the coordinator uses.
+    """
+
+    def __init__(
+        self,
+        cooking_interval: int = DEFAULT_COOKING_INTERVAL,
+        idle_interval: int = DEFAULT_IDLE_INTERVAL,
+        max_idle_interval: int = DEFAULT_MAX_IDLE_INTERVAL,
+    ):
+        self.cooking_interval = max(MIN_SCAN_INTERVAL, int(cooking_interval))
+        self.idle_interval = max(MIN_SCAN_INTERVAL, int(idle_interval))
+        self.max_idle_interval = max(self.idle_interval, int(max_idle_interval))
+
+    def next_interval(
+        self, state: str, remaining: int, last_state: Optional[str], last_interval: float
+    ) -> float:
+        """Pick the delay until an oven's next poll from its parsed state."""
+        if state == "cooking":
+            if 0 < remaining <= self.cooking_interval:
+                # Wake up once, just after the estimated end time
+                return max(MIN_SCAN_INTERVAL, remaining + FINISH_WAKEUP_MARGIN)
+            return self.cooking_interval
+
+        if state == "idle":
+            if last_state != "idle" or last_interval < self.idle_interval:
+                return self.idle_interval
+            return min(last_interval * IDLE_BACKOFF_FACTOR, self.max_idle_interval)
+
+        # Unknown state: keep the default cadence until it settles
+        return DEFAULT_SCAN_INTERVAL
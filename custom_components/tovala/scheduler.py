@@ -0,0 +1,114 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import heapq
+import itertools
+import random
+
+from .metrics import LatencyHistogram
+
+DEFAULT_POLL_BUDGET = 60  # status polls per minute, across every entry and oven
+POLL_JITTER = 0.1  # fraction of the interval added at random to each next poll
+POLL_JITTER_MAX = 5.0  # seconds
+SLIP_BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+# Lower sorts first: cooking ovens win when the budget is tight
+PRIORITY_COOKING = 0
+PRIORITY_DEFAULT = 1
+PRIORITY_IDLE = 2
+_PRIORITY_NAMES = {PRIORITY_COOKING: "cooking", PRIORITY_DEFAULT: "other", PRIORITY_IDLE: "idle"}
+
+
+def priority_for(state: Optional[str]) -> int:
+    if state == "cooking":
+        return PRIORITY_COOKING
+    if state == "idle":
+        return PRIORITY_IDLE
+    return PRIORITY_DEFAULT
+
+
+class PollScheduler:
+    """Domain-wide pacing of status polls.
+
+    Every coordinator asks for a slot before polling an oven. Slots are
+    handed out at most once per 60/requests_per_minute seconds, so polls
+    from all entries and ovens are spread out instead of firing together
+    (e.g. right after a restart). Waiting requests are served by priority
+    first and target time second. How late each grant was against its
+    target (slip) is recorded per priority.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = DEFAULT_POLL_BUDGET,
+        jitter: float = POLL_JITTER,
+        max_jitter: float = POLL_JITTER_MAX,
+    ):
+        self.requests_per_minute = max(1.0, float(requests_per_minute))
+        self._spacing = 60.0 / self.requests_per_minute
+        self._jitter = jitter
+        self._max_jitter = max_jitter
+        self._next_free = 0.0  # loop time the next slot opens
+        self._waiters: List[Tuple[int, float, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.granted = 0
+        self.slip: Dict[int, LatencyHistogram] = {
+            priority: LatencyHistogram(SLIP_BUCKETS_MS) for priority in _PRIORITY_NAMES
+        }
+
+    def jitter(self, interval: float) -> float:
+        """Random extra delay for a poll interval, so pollers drift apart rather than align."""
+        return random.uniform(0, min(self._max_jitter, interval * self._jitter))
+
+    async def acquire(self, target: float, priority: int = PRIORITY_DEFAULT) -> float:
+        """Wait for a poll slot. Returns the slip: seconds past target it was granted."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if not self._waiters and now >= self._next_free:
+            return self._grant(now, target, priority)
+        future = loop.create_future()
+        heapq.heappush(self._waiters, (priority, target, next(self._counter), future))
+        self._arm(loop)
+        # A cancelled waiter is skipped when its turn comes
+        return await future
+
+    def _grant(self, now: float, target: float, priority: int) -> float:
+        self._next_free = max(now, self._next_free) + self._spacing
+        self.granted += 1
+        slip = max(0.0, now - target)
+        self.slip[priority].observe(slip)
+        return slip
+
+    def _arm(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._timer is None and self._waiters:
+            self._timer = loop.call_at(self._next_free, self._release, loop)
+
+    def _release(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._timer = None
+        while self._waiters:
+            priority, target, _seq, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(self._grant(loop.time(), target, priority))
+                break
+        self._arm(loop)
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for *_rest, future in self._waiters if not future.done())
+
+    def close(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for *_rest, future in self._waiters:
+            future.cancel()
+        self._waiters.clear()
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "granted": self.granted,
+            "waiting": self.waiting,
+            "slip": {_PRIORITY_NAMES[priority]: hist.as_dict() for priority, hist in self.slip.items()},
+        }
@@ -1,155 +1,199 @@
 from __future__ import annotations
-from homeassistant.components.sensor import SensorEntity
+from typing import Any, Callable, Optional
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from .attributes import (
+    REMAINING_UNRECORDED_ATTRIBUTES,
+    LAST_COOK_UNRECORDED_ATTRIBUTES,
+    history_attributes,
+    last_cook_value,
+    meal_attributes,
+    status_attributes,
+)
 from .const import DOMAIN
-from .coordinator import TovalaCoordinator
+from .coordinator import TovalaCoordinator, TovalaHistoryCoordinator
+from .entity import TovalaEntity
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, add_entities: AddEntitiesCallback):
-    coord: TovalaCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-    add_entities([
-        TovalaRemainingTimeSensor(coord),
-        TovalaLastCookSensor(coord)
-    ])
-
-class TovalaRemainingTimeSensor(CoordinatorEntity[TovalaCoordinator], SensorEntity):
-    _attr_name = "Tovala Time Remaining"
+    data = hass.data[DOMAIN][entry.entry_id]
+    coord: TovalaCoordinator = data["coordinator"]
+    history: TovalaHistoryCoordinator = data["history_coordinator"]
+    entities = []
+    for oven_id in data["ovens"]:
+        entities.append(TovalaRemainingTimeSensor(coord, oven_id))
+        entities.append(TovalaLastCookSensor(history, oven_id))
+    entities.append(TovalaMealCacheHitRateSensor(coord, entry.entry_id))
+    entities.extend(
+        TovalaMetricSensor(coord, entry.entry_id, *metric) for metric in METRIC_SENSORS
+    )
+    add_entities(entities)
+
+class TovalaRemainingTimeSensor(TovalaEntity[TovalaCoordinator], SensorEntity):
     _attr_icon = "mdi:timer-outline"
     _attr_native_unit_of_measurement = "s"
+    _unrecorded_attributes = REMAINING_UNRECORDED_ATTRIBUTES
 
-    def __init__(self, coordinator: TovalaCoordinator):
-        super().__init__(coordinator)
-        self._attr_unique_id = f"tovala_{coordinator.oven_id}_remaining"
+    def __init__(self, coordinator: TovalaCoordinator, oven_id: str):
+        super().__init__(coordinator, oven_id, "remaining", "Time Remaining")
+        # Attribute payloads are rebuilt only when their source object changes
+        self._status_source = None
+        self._meal_source = None
+        self._meal_attrs: dict = {}
+        self._attrs: dict = {}
 
     @property
     def native_value(self):
-        if not self.coordinator.data:
-            return 0
-        return int(self.coordinator.data.get("remaining") or self.coordinator.data.get("time_remaining") or 0)
-
-    @property
-    def available(self) -> bool:
-        return self.coordinator.last_update_success
+        return self.coordinator.remaining(self.oven_id)
 
     @property
     def extra_state_attributes(self):
         """Return additional state attributes."""
-        if not self.coordinator.data:
-            return {}
-
-        attrs = {}
-
-        # Cooking state
-        state = self.coordinator.data.get("state")
-        if state:
-            attrs["cooking_state"] = state
-
-        # Barcode
-        barcode = self.coordinator.data.get("barcode")
-        if barcode:
-            attrs["barcode"] = barcode
-
-        # Meal details (if available)
-        meal = self.coordinator.data.get("meal")
-        if meal:
-            attrs["meal_id"] = meal.get("id")
-            attrs["meal_title"] = meal.get("title")
-            attrs["meal_subtitle"] = meal.get("subtitle", "")
-
-            # Get first image URL if available
-            images = meal.get("images", [])
-            if images and len(images) > 0:
-                # Construct full URL from CDN path
-                image_url = images[0].get("url", "")
-                if image_url.startswith("//"):
-                    image_url = f"https:{image_url}"
-                attrs["meal_image"] = image_url
-
-            # Ingredients
-            ingredients = meal.get("ingredients")
-            if ingredients:
-                attrs["meal_ingredients"] = ingredients
-
-        # End time (if cooking)
-        estimated_end_time = self.coordinator.data.get("estimated_end_time")
-        if estimated_end_time:
-            attrs["estimated_end_time"] = estimated_end_time
-
-        return attrs
-
-
-class TovalaLastCookSensor(CoordinatorEntity[TovalaCoordinator], SensorEntity):
-    _attr_name = "Tovala Last Cook"
+        status = self.oven_data
+        meal = self.coordinator.meal(self.oven_id)
+        if meal is not self._meal_source:
+            self._meal_source = meal
+            self._meal_attrs = meal_attributes(meal)
+            self._status_source = None  # rebuild with the new meal
+        if status is not self._status_source:
+            self._status_source = status
+            self._attrs = status_attributes(status, self._meal_attrs)
+        stale = self._stale_attributes()
+        return {**self._attrs, **stale} if stale else self._attrs
+
+    def _state_snapshot(self) -> tuple:
+        return (self.available, self.native_value, self.extra_state_attributes)
+
+
+class TovalaLastCookSensor(TovalaEntity[TovalaHistoryCoordinator], SensorEntity):
     _attr_icon = "mdi:history"
-
-    def __init__(self, coordinator: TovalaCoordinator):
-        super().__init__(coordinator)
-        self._attr_unique_id = f"tovala_{coordinator.oven_id}_last_cook"
-        self._history = []
-
-    async def async_update(self):
-        """Fetch cooking history."""
-        await super().async_update()
-        # Fetch history less frequently (only when coordinator updates)
-        if self.coordinator.last_update_success:
-            try:
-                history = await self.coordinator.client.cooking_history(
-                    self.coordinator.oven_id,
-                    limit=10
-                )
-                self._history = history
-            except Exception as e:
-                pass  # History is optional, don't fail
+    _unrecorded_attributes = LAST_COOK_UNRECORDED_ATTRIBUTES
+
+    def __init__(self, coordinator: TovalaHistoryCoordinator, oven_id: str):
+        super().__init__(coordinator, oven_id, "last_cook", "Last Cook")
+        self._version: Optional[int] = None
+        self._value = last_cook_value([])
+        self._attrs: dict = {}
+
+    def _refresh_cache(self) -> None:
+        """Rebuild value and attributes once per history version."""
+        version = self.coordinator.versions.get(self.oven_id)
+        if version != self._version:
+            history = self.oven_data
+            self._version = version
+            self._value = last_cook_value(history)
+            self._attrs = history_attributes(history)
 
     @property
     def native_value(self):
         """Return the last cook barcode or meal name."""
-        if not self._history:
-            return "No history"
+        self._refresh_cache()
+        return self._value
+
+    @property
+    def extra_state_attributes(self):
+        """Return cooking history as attributes."""
+        self._refresh_cache()
+        stale = self._stale_attributes()
+        return {**self._attrs, **stale} if stale else self._attrs
+
+    def _state_snapshot(self) -> tuple:
+        return (self.available, self.native_value, self.extra_state_attributes)
 
-        last = self._history[0]
-        barcode = last.get("barcode", "Unknown")
 
-        # If there's a meal_id, try to show something more meaningful
-        meal_id = last.get("meal_id")
-        if meal_id:
-            return f"Meal #{meal_id}"
+class TovalaMealCacheHitRateSensor(CoordinatorEntity[TovalaCoordinator], SensorEntity):
+    """Share of meal lookups served from the local meal cache."""
+    _attr_name = "Tovala Meal Cache Hit Rate"
+    _attr_icon = "mdi:database-check"
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
 
-        return barcode
+    def __init__(self, coordinator: TovalaCoordinator, entry_id: str):
+        super().__init__(coordinator)
+        self._attr_unique_id = f"tovala_{entry_id}_meal_cache_hit_rate"
 
     @property
-    def available(self) -> bool:
-        return self.coordinator.last_update_success
+    def native_value(self):
+        hit_rate = self.coordinator.meal_cache.hit_rate
+        return None if hit_rate is None else round(hit_rate * 100, 1)
 
     @property
     def extra_state_attributes(self):
-        """Return cooking history as attributes."""
-        if not self._history:
-            return {}
-
-        attrs = {}
-
-        # Last cook details
-        if self._history:
-            last = self._history[0]
-            attrs["last_cook_barcode"] = last.get("barcode", "")
-            attrs["last_cook_meal_id"] = last.get("meal_id")
-            attrs["last_cook_start_time"] = last.get("start_time", "")
-            attrs["last_cook_end_time"] = last.get("end_time", "")
-            attrs["last_cook_status"] = last.get("status", "")
-
-        # Recent history (up to 10 most recent)
-        attrs["recent_history"] = [
-            {
-                "barcode": cook.get("barcode", ""),
-                "meal_id": cook.get("meal_id"),
-                "start_time": cook.get("start_time", ""),
-                "end_time": cook.get("end_time", ""),
-                "status": cook.get("status", "")
-            }
-            for cook in self._history[:10]
-        ]
-
-        return attrs
\ No newline at end of file
+        cache = self.coordinator.meal_cache
+        return {"hits": cache.hits, "misses": cache.misses, "cached_meals": len(cache)}
+
+
+def _status_p95(coord: TovalaCoordinator) -> Optional[float]:
+    stats = coord.client.endpoint_stats.get("status")
+    return stats.latency.percentile(95) if stats else None
+
+
+def _poll_slip_p95(coord: TovalaCoordinator) -> Optional[float]:
+    return coord.poll_slip.percentile(95)
+
+
+def _token_age(coord: TovalaCoordinator) -> Optional[float]:
+    age = coord.client.token_age
+    return None if age is None else round(age / 60)
+
+
+# key, name, icon, unit, state class, value
+METRIC_SENSORS = (
+    ("api_requests", "API Requests", "mdi:api", None, SensorStateClass.TOTAL_INCREASING,
+     lambda coord: int(coord.client.metrics["requests"])),
+    ("api_errors", "API Errors", "mdi:alert-circle-outline", None, SensorStateClass.TOTAL_INCREASING,
+     lambda coord: int(coord.client.metrics["errors"])),
+    ("status_latency_p95", "Status Latency p95", "mdi:timer-sand", UnitOfTime.MILLISECONDS,
+     SensorStateClass.MEASUREMENT, _status_p95),
+    ("poll_interval", "Poll Interval", "mdi:update", UnitOfTime.SECONDS, SensorStateClass.MEASUREMENT,
+     lambda coord: coord.effective_interval and round(coord.effective_interval, 1)),
+    ("token_age", "Token Age", "mdi:key-chain", UnitOfTime.MINUTES, SensorStateClass.MEASUREMENT, _token_age),
+    ("poll_slip_p95", "Poll Slip p95", "mdi:timer-alert-outline", UnitOfTime.MILLISECONDS,
+     SensorStateClass.MEASUREMENT, _poll_slip_p95),
+)
+
+
+class TovalaMetricSensor(CoordinatorEntity[TovalaCoordinator], SensorEntity):
+    """Client/coordinator instrumentation; disabled until the user enables it."""
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: TovalaCoordinator,
+        entry_id: str,
+        key: str,
+        name: str,
+        icon: str,
+        unit: Optional[str],
+        state_class: SensorStateClass,
+        value_fn: Callable[[TovalaCoordinator], Any],
+    ):
+        super().__init__(coordinator)
+        self._attr_unique_id = f"tovala_{entry_id}_{key}"
+        self._attr_name = f"Tovala {name}"
+        self._attr_icon = icon
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+        self._value_fn = value_fn
+
+    @property
+    def should_poll(self) -> bool:
+        """Poll (a no-op read) so values refresh while the coordinator has nothing new.
+
+        CoordinatorEntity always returns False here, and with
+        always_update=False an idle oven rarely notifies listeners.
+        """
+        return True
+
+    @property
+    def native_value(self):
+        return self._value_fn(self.coordinator)
+
+    async def async_update(self) -> None:
+        """Values are read live from the client; nothing to fetch."""
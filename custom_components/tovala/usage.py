@@ -0,0 +1,96 @@
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, Dict, Iterable, List, Optional
+
+from .const import MIN_SCAN_INTERVAL
+from .models import HistoryEntry, parse_time
+
+SLOTS = 7 * 24  # hour of the week, Monday 00:00 first
+USAGE_MIN_HISTORY = 10  # cooks needed before the profile changes anything
+USAGE_MIN_COOKS = 2  # cooks an hour-of-week needs to count as a likely window
+USAGE_ACTIVE_SHARE = 0.02  # ... and its share of all cooks
+
+
+class UsageProfile:
+    """When an oven gets used: cook starts per hour of the week, in local time.
+
+    Built from cooking history and updated incrementally: only entries that
+    started after the high-water mark are counted, so each history refresh
+    costs O(new entries). Hours holding enough of the oven's cooks are
+    "likely windows"; until the profile has USAGE_MIN_HISTORY cooks every
+    hour is treated as likely and polling is unchanged.
+    """
+
+    def __init__(self, state: Optional[Dict[str, Any]] = None, tz: tzinfo = timezone.utc):
+        state = state or {}
+        self.tz = tz
+        counts = state.get("counts") or []
+        self.counts: List[int] = [int(count) for count in counts] if len(counts) == SLOTS else [0] * SLOTS
+        self.total = sum(self.counts)
+        self.high_water: Optional[datetime] = parse_time(state.get("high_water"))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "counts": list(self.counts),
+            "high_water": self.high_water.isoformat() if self.high_water else None,
+        }
+
+    def _slot(self, when: datetime) -> int:
+        local = when.astimezone(self.tz)
+        return local.weekday() * 24 + local.hour
+
+    def add(self, entries: Iterable[HistoryEntry]) -> int:
+        """Count cooks newer than the high-water mark. Returns how many were added."""
+        added = 0
+        newest = self.high_water
+        for entry in entries:
+            start = entry.start_time
+            if start is None or (self.high_water is not None and start <= self.high_water):
+                continue
+            self.counts[self._slot(start)] += 1
+            added += 1
+            if newest is None or start > newest:
+                newest = start
+        self.high_water = newest
+        self.total += added
+        return added
+
+    @property
+    def ready(self) -> bool:
+        return self.total >= USAGE_MIN_HISTORY
+
+    def likely(self, when: datetime) -> bool:
+        """Whether a cook is likely to start in the hour containing when."""
+        if not self.ready:
+            return True
+        count = self.counts[self._slot(when)]
+        return count >= USAGE_MIN_COOKS and count >= self.total * USAGE_ACTIVE_SHARE
+
+    def next_window(self, now: datetime) -> Optional[datetime]:
+        """Start of the next likely window after the current hour (None if there is none)."""
+        if not self.ready:
+            return None
+        hour = now.astimezone(self.tz).replace(minute=0, second=0, microsecond=0)
+        for offset in range(1, SLOTS + 1):
+            # Step in UTC so DST changes never skip or repeat an hour
+            start = (hour.astimezone(timezone.utc) + timedelta(hours=offset)).astimezone(self.tz)
+            if self.likely(start):
+                return start
+        return None
+
+    def idle_interval(
+        self, now: datetime, interval: float, active_interval: float, quiet_interval: float
+    ) -> float:
+        """Adjust an idle oven's poll interval: at most active_interval inside likely
+        windows, stretched to quiet_interval outside them, but waking up when the next
+        window opens. Unchanged while the profile is still learning."""
+        if not self.ready:
+            return interval
+        if self.likely(now):
+            return min(interval, active_interval)
+        stretched = max(interval, quiet_interval)
+        window = self.next_window(now)
+        if window is not None:
+            until = (window - now).total_seconds()
+            stretched = min(stretched, max(interval, until, MIN_SCAN_INTERVAL))
+        return stretched
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+
+from .attributes import MEAL_IMAGE_LOCAL_URL
+from .image_cache import CONTENT_TYPE, MealImageCache
+
+# Meal photos never change for a given meal ID; "private" keeps shared
+# proxies from caching a response that needed auth
+CACHE_CONTROL = "private, max-age=2592000, immutable"
+
+
+class TovalaMealImageView(HomeAssistantView):
+    """Serve cached meal images with long-lived cache headers.
+
+    Only images already in the local cache are served, and like every other
+    Home Assistant API the view requires auth: a bearer token or a signed
+    path. The image entity is the way to show the photo on a dashboard.
+    """
+
+    url = MEAL_IMAGE_LOCAL_URL
+    name = "api:tovala:meal_image"
+    requires_auth = True
+
+    def __init__(self, cache: MealImageCache):
+        self._cache = cache
+
+    async def get(self, request: web.Request, meal_id: str) -> web.Response:
+        body = await self._cache.async_get(meal_id)
+        if body is None:
+            return web.Response(status=404)
+        return web.Response(body=body, content_type=CONTENT_TYPE, headers={"Cache-Control": CACHE_CONTROL})
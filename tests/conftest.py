@@ -0,0 +1,56 @@
+"""Tests cover the integration's Home Assistant-free modules.
+
+The package is registered as a bare ``tovala`` namespace, the same way the
+offline benchmarks load it, so Home Assistant does not need to be installed.
+"""
+from __future__ import annotations
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator
+import sys
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks import _loader  # noqa: E402,F401  registers the "tovala" package
+from aiohttp import ClientSession  # noqa: E402
+from tovala.api import TovalaClient  # noqa: E402
+from tovala.policy import TokenBucket  # noqa: E402
+
+
+@pytest.fixture
+def tovala_client():
+    """Open a TovalaClient against local servers: ``async with tovala_client(server) as client``.
+
+    Each base is a URL or a server with start()/stop() (FakeTovala or a
+    stub), which is started first and stopped afterwards. The client-side
+    rate limit is lifted; keyword arguments go to TovalaClient.
+    """
+    @asynccontextmanager
+    async def connect(*bases: Any, **kwargs: Any) -> AsyncIterator[TovalaClient]:
+        started = []
+        try:
+            urls = []
+            for base in bases:
+                if isinstance(base, str):
+                    urls.append(base)
+                else:
+                    urls.append(await base.start())
+                    started.append(base)
+            async with ClientSession() as session:
+                client = TovalaClient(
+                    session, email="test@example.invalid", password="x",
+                    api_bases=urls, rate_limiter=TokenBucket(1e9, 1e9), **kwargs,
+                )
+                try:
+                    yield client
+                finally:
+                    client.close()
+        finally:
+            for server in started:
+                await server.stop()
+
+    return connect
@@ -0,0 +1,132 @@
+"""Per-account sharing: the registry and status request coalescing."""
+from __future__ import annotations
+import asyncio
+
+from benchmarks.fake_tovala import FakeTovala
+from tovala.accounts import AccountRegistry, account_key
+
+
+class StubClient:
+    def __init__(self):
+        self.closed = False
+        self.listener = None
+
+    def set_auth_listener(self, listener):
+        self.listener = listener
+
+    def close(self):
+        self.closed = True
+
+
+def test_entries_on_one_account_share_client_and_pollers():
+    registry = AccountRegistry()
+    key = account_key(" Cook@Example.invalid ")
+    first = registry.acquire(key, "a", StubClient)
+    second = registry.acquire(key, "b", StubClient)
+    assert first is second
+
+    async def run():
+        assert await registry.async_reserve_pollers(key) is None
+        registry.set_pollers(key, "pollers")
+        assert await registry.async_reserve_pollers(key) == "pollers"
+
+    asyncio.run(run())
+
+
+def _setup(registry: AccountRegistry, entry_id: str, built: list, fail: bool = False):
+    """The pollers part of async_setup_entry, with an await where it loads storage."""
+    async def setup():
+        registry.acquire("k", entry_id, StubClient)
+        await asyncio.sleep(0)  # auth store
+        pollers = await registry.async_reserve_pollers("k")
+        if pollers is not None:
+            return pollers
+        try:
+            await asyncio.sleep(0.01)  # coordinators restore their stores
+            if fail:
+                raise RuntimeError("setup failed")
+            pollers = f"pollers of {entry_id}"
+            built.append(pollers)
+        except BaseException:
+            registry.set_pollers("k", None)
+            raise
+        registry.set_pollers("k", pollers)
+        return pollers
+
+    return setup()
+
+
+def test_concurrent_setups_build_pollers_once():
+    async def run():
+        registry = AccountRegistry()
+        built: list = []
+        results = await asyncio.gather(*(_setup(registry, entry_id, built) for entry_id in "abc"))
+        assert built == ["pollers of a"]
+        assert results == ["pollers of a"] * 3
+
+    asyncio.run(run())
+
+
+def test_failed_build_hands_over_to_a_waiting_entry():
+    async def run():
+        registry = AccountRegistry()
+        built: list = []
+        results = await asyncio.gather(
+            _setup(registry, "a", built, fail=True), _setup(registry, "b", built),
+            return_exceptions=True,
+        )
+        assert isinstance(results[0], RuntimeError)
+        assert results[1] == "pollers of b"
+        assert built == ["pollers of b"]
+
+    asyncio.run(run())
+
+
+def test_each_oven_is_claimed_by_one_entry():
+    registry = AccountRegistry()
+    registry.acquire("k", "a", StubClient)
+    registry.acquire("k", "b", StubClient)
+    assert registry.claim_ovens("k", "a", ["o1", "o2"]) == ["o1", "o2"]
+    assert registry.claim_ovens("k", "b", ["o1", "o2", "o3"]) == ["o3"]
+    # Claiming again (e.g. after a platform reload) keeps the entry's own ovens
+    assert registry.claim_ovens("k", "a", ["o1", "o2"]) == ["o1", "o2"]
+
+    assert registry.release("k", "a") is False
+    assert registry.owned_ovens("k", "a") == []
+    assert registry.claim_ovens("k", "b", ["o1", "o2", "o3"]) == ["o1", "o2", "o3"]
+
+
+def test_last_release_closes_the_client():
+    registry = AccountRegistry()
+    client = registry.acquire("k", "a", StubClient)
+    registry.acquire("k", "b", StubClient)
+    assert registry.release("k", "a") is False
+    assert not client.closed
+    assert registry.release("k", "b") is True
+    assert client.closed
+    assert registry.get("k") is None
+    assert registry.entry_ids("k") == []
+
+
+def test_adopt_leaves_an_existing_account_alone():
+    registry = AccountRegistry()
+    flow_client = StubClient()
+    assert registry.adopt("k", flow_client) is True
+    assert registry.acquire("k", "a", StubClient) is flow_client
+    assert registry.adopt("k", StubClient()) is False
+    assert registry.get("k") is flow_client
+
+
+def test_status_requests_are_shared_only_while_in_flight(tovala_client):
+    async def run():
+        server = FakeTovala(latency=0.05)
+        async with tovala_client(server) as client:
+            await client.login()
+            oven_id = server.oven_ids[0]
+            await asyncio.gather(*(client.oven_status(oven_id) for _ in range(5)))
+            assert server.requests["status"] == 1
+            # A finished answer is not reused: the next poll asks again
+            await client.oven_status(oven_id)
+            assert server.requests["status"] == 2
+
+    asyncio.run(run())
@@ -0,0 +1,162 @@
+"""Login racing and health-ranked base selection against local stub servers."""
+from __future__ import annotations
+from typing import Optional
+import asyncio
+import socket
+import time
+
+from aiohttp import web
+import pytest
+
+from benchmarks.fake_tovala import FakeTovala
+from tovala import api
+from tovala.api import TovalaApiError, TovalaAuthError, TovalaCircuitOpenError
+from tovala.breaker import CLOSED, OPEN, CircuitBreaker
+
+
+class StatusStub:
+    """Answers every login with one fixed HTTP status and counts the attempts."""
+
+    def __init__(self, status: int):
+        self.status = status
+        self.logins = 0
+        self._runner = None
+        self.url: Optional[str] = None
+
+    async def _login(self, request: web.Request) -> web.Response:
+        self.logins += 1
+        return web.json_response({"error": "nope"}, status=self.status)
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_post("/v0/getToken", self._login)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{self._runner.addresses[0][1]}"
+        return self.url
+
+    async def stop(self) -> None:
+        await self._runner.cleanup()
+
+
+def _dead_base() -> str:
+    """A local URL nothing listens on: connections are refused at once."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+@pytest.fixture(autouse=True)
+def _short_hedge(monkeypatch):
+    monkeypatch.setattr(api, "LOGIN_HEDGE_DELAY", 0.2)
+
+
+def test_slow_preferred_base_loses_the_race(tovala_client):
+    async def run():
+        slow, fast = FakeTovala(latency=2.0), FakeTovala()
+        async with tovala_client(slow, fast) as client:
+            started = time.monotonic()
+            await client.login()
+            assert time.monotonic() - started < 1.0
+            assert client.base_url == fast.url
+            assert fast.requests["login"] == 1
+
+            # Later logins and GETs go to the faster host first
+            client.invalidate_token()
+            await client.oven_status(fast.oven_ids[0])
+            assert fast.requests["login"] == 2
+            assert slow.requests["login"] == 1
+            assert fast.requests["status"] == 1
+
+    asyncio.run(run())
+
+
+def test_dead_base_fails_over_without_waiting_for_the_hedge(tovala_client):
+    async def run():
+        server = FakeTovala()
+        async with tovala_client(_dead_base(), server) as client:
+            started = time.monotonic()
+            await client.login()
+            assert time.monotonic() - started < api.LOGIN_HEDGE_DELAY
+            assert client.base_url == server.url
+
+    asyncio.run(run())
+
+
+def test_server_error_starts_the_next_base(tovala_client):
+    async def run():
+        broken, server = StatusStub(503), FakeTovala()
+        async with tovala_client(broken, server) as client:
+            await client.login()
+            assert client.base_url == server.url
+            assert broken.logins == 1
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize(("status", "error"), [
+    (401, TovalaAuthError),
+    (403, TovalaAuthError),
+    (429, TovalaApiError),
+])
+def test_refused_login_is_not_sent_to_other_bases(tovala_client, status, error):
+    async def run():
+        refusing, server = StatusStub(status), FakeTovala()
+        async with tovala_client(refusing, server) as client:
+            with pytest.raises(error):
+                await client.login()
+            # Still nothing once the hedge delay would have started it
+            await asyncio.sleep(api.LOGIN_HEDGE_DELAY * 2)
+            assert refusing.logins == 1
+            assert server.requests["login"] == 0
+
+    asyncio.run(run())
+
+
+def test_failed_logins_open_the_breaker(tovala_client):
+    async def run():
+        breaker = CircuitBreaker(failure_threshold=2)
+        async with tovala_client(_dead_base(), breaker=breaker) as client:
+            for _ in range(2):
+                with pytest.raises(TovalaApiError):
+                    await client.login()
+            assert breaker.state == OPEN
+            requests = client.metrics["requests"]
+            with pytest.raises(TovalaCircuitOpenError):
+                await client.login()
+            assert client.metrics["requests"] == requests
+
+    asyncio.run(run())
+
+
+def test_refused_login_leaves_the_breaker_closed(tovala_client):
+    async def run():
+        breaker = CircuitBreaker(failure_threshold=1)
+        async with tovala_client(StatusStub(401), breaker=breaker) as client:
+            with pytest.raises(TovalaAuthError):
+                await client.login()
+            assert breaker.state == CLOSED
+
+    asyncio.run(run())
+
+
+def test_probe_request_can_log_in_again(tovala_client):
+    async def run():
+        server = FakeTovala()
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=lambda: now[0])
+        async with tovala_client(server, breaker=breaker) as client:
+            await client.login()
+            breaker.record_failure()
+            assert breaker.state == OPEN
+            now[0] += 31
+            # The probe needs a new token: its own login must not be refused
+            client.invalidate_token()
+            await client.oven_status(server.oven_ids[0])
+            assert breaker.state == CLOSED
+            assert server.requests["login"] == 2
+
+    asyncio.run(run())
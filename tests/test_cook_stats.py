@@ -0,0 +1,78 @@
+"""Hourly cook statistics: the sums written to the recorder never go backward."""
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from tovala.cook_stats import CookStatsAccumulator
+from tovala.models import HistoryEntry
+
+T0 = datetime(2025, 11, 7, 18, 0, tzinfo=timezone.utc)
+
+
+def _cook(minute: int, length: Optional[int] = 15, meal: bool = True) -> HistoryEntry:
+    start = T0 + timedelta(minutes=minute)
+    end = start + timedelta(minutes=length) if length is not None else None
+    return HistoryEntry("133A254|463|5E34BF80" if meal else "manual-bake", "463" if meal else None, start, end)
+
+
+def _newest_first(*entries: HistoryEntry) -> List[HistoryEntry]:
+    return sorted(entries, key=lambda entry: entry.start_time, reverse=True)
+
+
+def test_cooks_in_one_hour_share_a_row_and_a_new_hour_starts_another():
+    acc = CookStatsAccumulator()
+    rows = acc.add(_newest_first(_cook(5), _cook(30, 10, meal=False)))
+    assert rows["cooks"] == [{"start": T0, "state": 2, "sum": 2}]
+    assert rows["cook_minutes"][0]["state"] == 25
+    assert rows["meal_cooks"][0]["sum"] == 1
+    assert rows["manual_cooks"][0]["sum"] == 1
+
+    # A later cook in the same hour rewrites that hour's row
+    rows = acc.add(_newest_first(_cook(45), _cook(30, 10, meal=False), _cook(5)))
+    assert rows["cooks"] == [{"start": T0, "state": 3, "sum": 3}]
+
+    # Two cooks in later hours: the hours roll over and the sum keeps counting
+    rows = acc.add(_newest_first(_cook(130), _cook(70), _cook(45)))
+    assert rows["cooks"] == [
+        {"start": T0 + timedelta(hours=1), "state": 1, "sum": 4},
+        {"start": T0 + timedelta(hours=2), "state": 1, "sum": 5},
+    ]
+
+
+def test_unfinished_cook_is_deferred_until_it_ends():
+    acc = CookStatsAccumulator()
+    rows = acc.add(_newest_first(_cook(70, length=None), _cook(5)))
+    assert rows["cooks"] == [{"start": T0, "state": 1, "sum": 1}]
+    assert acc.high_water == T0 + timedelta(minutes=5)
+
+    # Still running: nothing to write
+    assert acc.add(_newest_first(_cook(70, length=None), _cook(5)))["cooks"] == []
+
+    rows = acc.add(_newest_first(_cook(70, length=20), _cook(5)))
+    assert rows["cooks"] == [{"start": T0 + timedelta(hours=1), "state": 1, "sum": 2}]
+    assert rows["cook_minutes"][0]["state"] == 20
+
+
+def test_cooks_after_an_unfinished_one_wait_for_it():
+    acc = CookStatsAccumulator()
+    # The 70-minute cook is missing its end time; the later one must not
+    # move the high-water mark past it
+    rows = acc.add(_newest_first(_cook(90), _cook(70, length=None)))
+    assert rows["cooks"] == []
+    rows = acc.add(_newest_first(_cook(90), _cook(70, length=10)))
+    assert [row["sum"] for row in rows["cooks"]] == [2]
+
+
+def test_high_water_mark_survives_save_and_restore():
+    acc = CookStatsAccumulator()
+    acc.add(_newest_first(_cook(5), _cook(30)))
+    restored = CookStatsAccumulator(acc.as_dict())
+    assert restored.high_water == acc.high_water
+
+    # Entries seen before the restart are not counted again
+    assert restored.add(_newest_first(_cook(30), _cook(5)))["cooks"] == []
+    # The restored hour keeps its value and the sum carries on from there
+    rows = restored.add(_newest_first(_cook(50), _cook(30), _cook(5)))
+    assert rows["cooks"] == [{"start": T0, "state": 3, "sum": 3}]
+    rows = restored.add(_newest_first(_cook(65)))
+    assert rows["cooks"] == [{"start": T0 + timedelta(hours=1), "state": 1, "sum": 4}]
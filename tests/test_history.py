@@ -0,0 +1,67 @@
+"""Paged history reads against servers that honour, ignore or reject paging."""
+from __future__ import annotations
+from contextlib import aclosing
+import asyncio
+
+import pytest
+
+from benchmarks.fake_tovala import FakeTovala
+from tovala.api import TovalaApiError, TovalaClient
+
+
+async def _read(client: TovalaClient, oven_id: str, limit=None):
+    async with aclosing(client.iter_cooking_history(oven_id, limit=limit)) as entries:
+        return [entry async for entry in entries]
+
+
+def _run(tovala_client, server: FakeTovala, check):
+    async def run():
+        async with tovala_client(server) as client:
+            await client.login()
+            await check(client, server)
+
+    asyncio.run(run())
+
+
+def test_paged_reads_stop_early(tovala_client):
+    async def check(client, server):
+        entries = await _read(client, server.oven_ids[0], limit=10)
+        assert len(entries) == 10
+        assert server.requests["history"] == 1
+        # 100 + 200 covers all 250
+        assert len(await _read(client, server.oven_ids[0])) == 250
+        assert server.requests["history"] == 3
+
+    _run(tovala_client, FakeTovala(history_size=250), check)
+
+
+def test_rejected_paging_is_retried_without_it(tovala_client):
+    async def check(client, server):
+        entries = await _read(client, server.oven_ids[0])
+        assert len(entries) == 250
+        assert server.requests["history"] == 2
+        # Later reads go straight to the unpaged form
+        assert len(await _read(client, server.oven_ids[0], limit=5)) == 5
+        assert server.requests["history"] == 3
+
+    _run(tovala_client, FakeTovala(history_size=250, reject_paging=True), check)
+
+
+def test_ignored_paging_matches_the_paged_result(tovala_client):
+    async def check(client, server):
+        paged = await _read(client, server.oven_ids[0])
+        server.paging = False
+        client._history_paging = True
+        assert [entry.start_time for entry in await _read(client, server.oven_ids[0])] == [
+            entry.start_time for entry in paged
+        ]
+
+    _run(tovala_client, FakeTovala(history_size=250), check)
+
+
+def test_unknown_oven_still_fails(tovala_client):
+    async def check(client, server):
+        with pytest.raises(TovalaApiError):
+            await _read(client, "no-such-oven")
+
+    _run(tovala_client, FakeTovala(), check)
@@ -0,0 +1,21 @@
+"""Meal image cache: only plain ASCII meal IDs reach the file system."""
+from __future__ import annotations
+import asyncio
+
+import pytest
+
+from tovala.image_cache import MealImageCache
+
+
+@pytest.mark.parametrize("meal_id", ["²", "١٢", "12a", "../12", "", "-1"])
+def test_odd_meal_ids_are_not_found(tmp_path, meal_id):
+    cache = MealImageCache(None, str(tmp_path))
+    assert asyncio.run(cache.async_get(meal_id)) is None
+    assert asyncio.run(cache.async_fetch(meal_id, "http://127.0.0.1:9/x.jpg")) is None
+
+
+def test_cached_image_is_read_back(tmp_path):
+    cache = MealImageCache(None, str(tmp_path))
+    (tmp_path / "42.jpg").write_bytes(b"jpeg")
+    assert asyncio.run(cache.async_get("42")) == b"jpeg"
+    assert asyncio.run(cache.async_get("042")) == b"jpeg"
@@ -0,0 +1,70 @@
+"""Single-flight login and background renewal against the fake Tovala API."""
+from __future__ import annotations
+import asyncio
+
+from benchmarks.fake_tovala import FakeTovala
+from tovala import api
+
+
+def test_concurrent_logins_share_one_request(tovala_client):
+    async def run():
+        server = FakeTovala()
+        async with tovala_client(server) as client:
+            await asyncio.gather(*(client.login() for _ in range(20)))
+            assert server.requests["login"] == 1
+            assert client.logins == 1
+            assert client.authenticated
+
+    asyncio.run(run())
+
+
+def test_concurrent_requests_without_a_token_log_in_once(tovala_client):
+    async def run():
+        server = FakeTovala(ovens=1)
+        async with tovala_client(server) as client:
+            await client.login()
+            oven_id = server.oven_ids[0]
+            client.invalidate_token()
+            await asyncio.gather(
+                *(client.oven_status(oven_id) for _ in range(5)),
+                *(client.meal_details(str(meal_id)) for meal_id in range(5)),
+                client.cooking_history(oven_id),
+            )
+            assert server.requests["login"] == 2
+
+    asyncio.run(run())
+
+
+def test_cancelled_caller_does_not_abort_the_shared_login(tovala_client):
+    async def run():
+        server = FakeTovala(latency=0.2)
+        async with tovala_client(server) as client:
+            first = asyncio.ensure_future(client.login())
+            second = asyncio.ensure_future(client.login())
+            await asyncio.sleep(0.05)
+            first.cancel()
+            await second
+            assert client.authenticated
+            assert server.requests["login"] == 1
+
+    asyncio.run(run())
+
+
+def test_token_is_renewed_in_the_background(monkeypatch, tovala_client):
+    # Renew the first one-hour token within a second of getting it
+    monkeypatch.setattr(api, "TOKEN_RENEW_BEFORE", 3600 - 1)
+
+    async def run():
+        server = FakeTovala(token_ttl=3600)
+        async with tovala_client(server) as client:
+            await client.login()
+            assert server.requests["login"] == 1
+            server.token_ttl = 7200  # the renewed token is not due again for an hour
+            await asyncio.sleep(1.3)
+            assert server.requests["login"] == 2
+            assert client.logins == 2
+            # The renewed token serves requests without another login
+            await client.oven_status(server.oven_ids[0])
+            assert server.requests["login"] == 2
+
+    asyncio.run(run())
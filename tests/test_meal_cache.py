@@ -0,0 +1,201 @@
+"""Meal cache (LRU, TTL, persistence) and the background meal warmer."""
+from __future__ import annotations
+from typing import Any, Callable, Optional
+import asyncio
+
+import pytest
+
+from tovala import meal_cache
+from tovala.meal_cache import MealCache, MealWarmer
+from tovala.models import Meal
+
+
+class FakeStore:
+    """In-memory stand-in for a Home Assistant Store."""
+
+    def __init__(self, data: Any = None):
+        self.data = data
+        self.saves = 0
+        self._pending: Optional[Callable[[], Any]] = None
+
+    async def async_load(self) -> Any:
+        return self.data
+
+    def async_delay_save(self, data_func: Callable[[], Any], delay: float) -> None:
+        self.saves += 1
+        self._pending = data_func
+
+    def flush(self) -> None:
+        self.data = self._pending()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(meal_cache.time, "time", lambda: now[0])
+    return now
+
+
+def _meal(meal_id: int) -> Meal:
+    return Meal.from_api({"id": meal_id, "title": f"Meal {meal_id}", "calories": 500})
+
+
+def test_least_recently_used_meal_is_evicted(clock):
+    cache = MealCache(max_size=2)
+    cache.put("1", _meal(1))
+    cache.put("2", _meal(2))
+    assert cache.get("1") is not None  # 2 is now the least recently used
+    cache.put("3", _meal(3))
+    assert "2" not in cache
+    assert "1" in cache and "3" in cache
+    assert len(cache) == 2
+
+
+def test_meals_expire_after_the_ttl(clock):
+    cache = MealCache(ttl=60)
+    cache.put("1", _meal(1))
+    clock[0] += 59
+    assert cache.get("1") is not None
+    clock[0] += 1
+    assert "1" not in cache
+    assert cache.get("1") is None
+    assert len(cache) == 0  # the expired entry is dropped on lookup
+
+
+def test_hit_rate_counts_lookups(clock):
+    cache = MealCache()
+    assert cache.hit_rate is None
+    cache.put("1", _meal(1))
+    cache.get("1")
+    cache.get("1")
+    cache.get("2")
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert cache.hit_rate == pytest.approx(2 / 3)
+
+
+def test_saved_meals_load_back(clock):
+    store = FakeStore()
+    cache = MealCache(store, ttl=3600)
+    cache.put("1", _meal(1))
+    clock[0] += 1800
+    cache.put("2", _meal(2))
+    assert store.saves == 2
+    store.flush()
+
+    # An hour after the first meal was fetched only the second one is fresh
+    clock[0] += 1800
+    restored = MealCache(FakeStore(store.data), ttl=3600)
+    asyncio.run(restored.async_load())
+    assert "1" not in restored
+    meal = restored.get("2")
+    assert meal.as_dict() == _meal(2).as_dict()
+
+
+def test_load_keeps_the_newest_meals_that_fit(clock):
+    store = FakeStore()
+    cache = MealCache(store)
+    for meal_id in range(5):
+        cache.put(str(meal_id), _meal(meal_id))
+    store.flush()
+    restored = MealCache(FakeStore(store.data), max_size=2)
+    asyncio.run(restored.async_load())
+    assert len(restored) == 2
+    assert "3" in restored and "4" in restored
+
+
+class FakeFetch:
+    """Meal fetcher that counts calls and in-flight requests; gate holds them."""
+
+    def __init__(self, fail: bool = False):
+        self.calls: list = []
+        self.running = 0
+        self.peak = 0
+        self.fail = fail
+        self.gate = asyncio.Event()
+
+    async def __call__(self, meal_id: str) -> Optional[Meal]:
+        self.calls.append(meal_id)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await self.gate.wait()
+        finally:
+            self.running -= 1
+        if self.fail:
+            raise RuntimeError("meal endpoint down")
+        return _meal(int(meal_id))
+
+
+def test_requests_for_one_meal_share_a_fetch():
+    async def run():
+        fetch = FakeFetch()
+        warmer = MealWarmer(MealCache(), fetch)
+        first, second = warmer.request("7"), warmer.request(7)
+        assert first is second
+        await asyncio.sleep(0)
+        fetch.gate.set()
+        meal = await first
+        assert meal.id == 7
+        assert fetch.calls == ["7"]
+        # Cached now: resolved at once without another fetch
+        again = warmer.request("7")
+        assert again.done() and again.result().id == 7
+        assert fetch.calls == ["7"]
+
+    asyncio.run(run())
+
+
+def test_at_most_workers_fetches_run_at_once():
+    async def run():
+        fetch = FakeFetch()
+        warmer = MealWarmer(MealCache(), fetch, workers=2)
+        warming = asyncio.ensure_future(warmer.async_warm(str(meal_id) for meal_id in range(6)))
+        await asyncio.sleep(0.01)
+        assert fetch.running == 2
+        assert warmer.queued == 4
+        fetch.gate.set()
+        assert await warming == 6
+        assert fetch.peak == 2
+        assert warmer.fetched == 6
+
+    asyncio.run(run())
+
+
+def test_failed_fetch_still_resolves_the_future():
+    async def run():
+        fetch = FakeFetch(fail=True)
+        cache = MealCache()
+        warmer = MealWarmer(cache, fetch)
+        results = []
+        future = warmer.request("7")
+        future.add_done_callback(lambda done: results.append(done.result()))
+        fetch.gate.set()
+        await asyncio.sleep(0.01)
+        assert results == [None]
+        assert warmer.failed == 1
+        assert "7" not in cache
+        # Nothing is left pending: the next request fetches again
+        warmer.request("7")
+        await asyncio.sleep(0.01)
+        assert fetch.calls == ["7", "7"]
+
+    asyncio.run(run())
+
+
+def test_close_cancels_workers_and_waiting_callers():
+    async def run():
+        fetch = FakeFetch()
+        warmer = MealWarmer(MealCache(), fetch, workers=1)
+        futures = [warmer.request(str(meal_id)) for meal_id in range(3)]
+        await asyncio.sleep(0)
+        assert fetch.running == 1
+        warmer.close()
+        await asyncio.sleep(0)
+        assert all(future.cancelled() for future in futures)
+        assert fetch.running == 0
+        assert warmer.queued == 0
+        fetch.gate.set()
+        await asyncio.sleep(0.01)
+        assert fetch.calls == ["0"]
+
+    asyncio.run(run())
@@ -0,0 +1,54 @@
+"""Status and meal parsing keep the fields the integration does not use."""
+from __future__ import annotations
+
+from tovala.models import Meal, OvenStatus
+
+RESPONSE = {
+    "state": "cooking",
+    "barcode": "133A254|463|5E34BF80",
+    "estimated_start_time": "2025-11-07T01:30:00Z",
+    "estimated_end_time": "2025-11-07T01:43:48Z",
+    "remote_control_enabled": True,
+    "heating_element": "broil",
+    "temperature": 425,
+}
+
+
+def test_unknown_status_fields_round_trip():
+    status = OvenStatus.from_api(RESPONSE)
+    assert status.meal_id == "463"
+    assert status.extra == {"heating_element": "broil", "temperature": 425}
+    assert status.as_dict() == RESPONSE
+    # Persisted state is read back through from_api
+    assert OvenStatus.from_api(status.as_dict()).as_dict() == RESPONSE
+
+
+def test_known_fields_win_over_extra():
+    status = OvenStatus(state="idle", extra={"state": "cooking", "door": "open"})
+    assert status.as_dict() == {"state": "idle", "door": "open"}
+
+
+MEAL = {
+    "id": 463,
+    "title": "Chicken Tikka",
+    "subtitle": "with basmati rice",
+    "images": [{"url": "//cdn.example.invalid/463.jpg"}, {"url": "//cdn.example.invalid/463b.jpg"}],
+    "ingredients": "chicken, rice",
+    "calories": 540,
+    "allergens": ["milk"],
+}
+
+
+def test_unknown_meal_fields_round_trip():
+    meal = Meal.from_api(MEAL)
+    assert meal.image_url == "https://cdn.example.invalid/463.jpg"
+    assert meal.as_dict() == MEAL
+    # The meal cache stores as_dict() and reads it back through from_api
+    restored = Meal.from_api(meal.as_dict())
+    assert restored.as_dict() == MEAL
+    assert restored.image_url == meal.image_url
+
+
+def test_meal_built_without_raw_images_still_lists_its_image():
+    meal = Meal(463, "Chicken Tikka", image_url="https://cdn.example.invalid/463.jpg")
+    assert meal.as_dict()["images"] == [{"url": "https://cdn.example.invalid/463.jpg"}]
@@ -0,0 +1,101 @@
+"""PollSchedule driven against a scripted fake client on a virtual clock."""
+from __future__ import annotations
+from typing import List, Optional, Tuple
+
+from tovala.const import DEFAULT_SCAN_INTERVAL, FINISH_WAKEUP_MARGIN, MIN_SCAN_INTERVAL
+from tovala.schedule import PollSchedule
+
+DAY = 86400
+
+
+class FakeClient:
+    """Answers status polls from scripted (start, end) cooks and counts them."""
+
+    def __init__(self, cooks: List[Tuple[float, float]] = ()):
+        self.cooks = list(cooks)
+        self.requests = 0
+
+    def oven_status(self, now: float) -> Tuple[str, int]:
+        self.requests += 1
+        for start, end in self.cooks:
+            if start <= now < end:
+                return "cooking", max(0, int(end - now))
+        return "idle", 0
+
+
+def _run(client: FakeClient, schedule: Optional[PollSchedule], until: float) -> List[Tuple[float, str]]:
+    """Poll like the coordinator does; a schedule of None is the old fixed 10 s cadence."""
+    polls = []
+    now = 0.0
+    last_state: Optional[str] = None
+    last_interval = 0.0
+    while now < until:
+        state, remaining = client.oven_status(now)
+        polls.append((now, state))
+        if schedule is None:
+            interval = DEFAULT_SCAN_INTERVAL
+        else:
+            interval = schedule.next_interval(state, remaining, last_state, last_interval)
+        last_state, last_interval = state, interval
+        now += interval
+    return polls
+
+
+def _finish_seen(polls: List[Tuple[float, str]], end: float) -> float:
+    """Seconds between a cook's end and the first poll that saw the oven idle again."""
+    return next(when for when, state in polls if when >= end and state == "idle") - end
+
+
+def test_idle_oven_polls_an_order_of_magnitude_less():
+    fixed, adaptive = FakeClient(), FakeClient()
+    _run(fixed, None, 3 * DAY)
+    _run(adaptive, PollSchedule(), 3 * DAY)
+    assert fixed.requests == 3 * DAY // DEFAULT_SCAN_INTERVAL
+    assert adaptive.requests * 10 <= fixed.requests
+
+
+def test_idle_backoff_stops_at_max_idle_interval():
+    schedule = PollSchedule(idle_interval=30, max_idle_interval=120)
+    intervals = []
+    last_state, last_interval = None, 0.0
+    for _ in range(6):
+        last_interval = schedule.next_interval("idle", 0, last_state, last_interval)
+        last_state = "idle"
+        intervals.append(last_interval)
+    assert intervals == [30, 60, 120, 120, 120, 120]
+
+
+def test_finish_is_seen_sooner_than_with_fixed_polling():
+    # Ends 7.5 s into a 10 s fixed-poll gap
+    cook = (1000.0, 1000.0 + 20 * 60 + 7.5)
+    fixed, adaptive = FakeClient([cook]), FakeClient([cook])
+    fixed_delay = _finish_seen(_run(fixed, None, 2 * 3600), cook[1])
+    adaptive_delay = _finish_seen(_run(adaptive, PollSchedule(), 2 * 3600), cook[1])
+    assert adaptive_delay <= FINISH_WAKEUP_MARGIN + 1
+    assert adaptive_delay < fixed_delay
+    assert adaptive.requests < fixed.requests
+
+
+def test_cooking_polls_at_the_cooking_cadence():
+    cook = (0.0, 600.0)
+    client = FakeClient([cook])
+    polls = _run(client, PollSchedule(cooking_interval=5), 600)
+    cooking = [when for when, state in polls if state == "cooking"]
+    gaps = {round(b - a) for a, b in zip(cooking, cooking[1:])}
+    assert gaps == {5}
+
+
+def test_intervals_are_configurable_and_clamped():
+    schedule = PollSchedule(cooking_interval=0, idle_interval=60, max_idle_interval=10)
+    assert schedule.cooking_interval == MIN_SCAN_INTERVAL
+    # The backoff ceiling never sits below the first idle interval
+    assert schedule.max_idle_interval == 60
+
+    slow, fast = FakeClient(), FakeClient()
+    _run(slow, PollSchedule(idle_interval=60, max_idle_interval=600), DAY)
+    _run(fast, PollSchedule(idle_interval=30, max_idle_interval=120), DAY)
+    assert slow.requests < fast.requests / 4
+
+
+def test_unknown_state_keeps_the_default_cadence():
+    assert PollSchedule().next_interval("preheating", 0, "idle", 120) == DEFAULT_SCAN_INTERVAL
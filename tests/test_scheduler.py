@@ -0,0 +1,85 @@
+"""Domain-wide poll pacing: slot spacing, priority order and close()."""
+from __future__ import annotations
+import asyncio
+
+import pytest
+
+from tovala.scheduler import PRIORITY_COOKING, PRIORITY_DEFAULT, PRIORITY_IDLE, PollScheduler
+
+
+def test_slots_are_spaced_by_the_budget():
+    async def run():
+        scheduler = PollScheduler(requests_per_minute=600)  # one slot per 0.1 s
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        granted = []
+
+        async def poll():
+            await scheduler.acquire(start)
+            granted.append(loop.time() - start)
+
+        await asyncio.gather(*(poll() for _ in range(4)))
+        assert granted[0] < 0.05
+        for earlier, later in zip(granted, granted[1:]):
+            assert later - earlier >= 0.1 - 0.01
+        assert scheduler.granted == 4
+        # Every grant records how late it was against its target
+        assert scheduler.slip[PRIORITY_DEFAULT].count == 4
+
+    asyncio.run(run())
+
+
+def test_waiting_polls_go_by_priority_then_target():
+    async def run():
+        scheduler = PollScheduler(requests_per_minute=600)
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        await scheduler.acquire(now)  # takes the free slot: the rest must queue
+        order = []
+
+        async def poll(name, target, priority):
+            await scheduler.acquire(target, priority)
+            order.append(name)
+
+        await asyncio.gather(
+            poll("idle", now, PRIORITY_IDLE),
+            poll("other late", now + 1, PRIORITY_DEFAULT),
+            poll("other early", now, PRIORITY_DEFAULT),
+            poll("cooking", now + 2, PRIORITY_COOKING),
+        )
+        assert order == ["cooking", "other early", "other late", "idle"]
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_gives_its_turn_away():
+    async def run():
+        scheduler = PollScheduler(requests_per_minute=600)
+        now = asyncio.get_running_loop().time()
+        await scheduler.acquire(now)
+        first = asyncio.ensure_future(scheduler.acquire(now, PRIORITY_COOKING))
+        second = asyncio.ensure_future(scheduler.acquire(now, PRIORITY_IDLE))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.wait_for(second, 0.5)
+        assert scheduler.granted == 2
+
+    asyncio.run(run())
+
+
+def test_close_cancels_waiting_polls():
+    async def run():
+        scheduler = PollScheduler(requests_per_minute=60)
+        now = asyncio.get_running_loop().time()
+        await scheduler.acquire(now)
+        waiters = [asyncio.ensure_future(scheduler.acquire(now)) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert scheduler.waiting == 3
+        scheduler.close()
+        for waiter in waiters:
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        assert scheduler.waiting == 0
+        assert scheduler.granted == 1
+
+    asyncio.run(run())